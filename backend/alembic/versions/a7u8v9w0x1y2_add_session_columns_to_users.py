@@ -0,0 +1,27 @@
+"""add session columns to users (durable single-session and revocation records)
+
+Revision ID: a7u8v9w0x1y2
+Revises: z6t7u8v9w0x1
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'a7u8v9w0x1y2'
+down_revision = 'z6t7u8v9w0x1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('users', sa.Column('session_jti', sa.String(64), nullable=True))
+    op.add_column('users', sa.Column('session_expires_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('users', sa.Column('tokens_revoked_before', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade():
+    op.drop_column('users', 'tokens_revoked_before')
+    op.drop_column('users', 'session_expires_at')
+    op.drop_column('users', 'session_jti')
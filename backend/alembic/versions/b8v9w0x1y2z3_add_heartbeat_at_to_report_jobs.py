@@ -0,0 +1,28 @@
+"""add heartbeat_at to report_jobs (stale job detection)
+
+Revision ID: b8v9w0x1y2z3
+Revises: a7u8v9w0x1y2
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'b8v9w0x1y2z3'
+down_revision = 'a7u8v9w0x1y2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('report_jobs', sa.Column('heartbeat_at', sa.DateTime(timezone=True), nullable=True))
+    # Jobs left unfinished by earlier versions can never complete
+    op.execute(
+        "UPDATE report_jobs SET status = 'failed', error = 'Interrupted by an upgrade', finished_at = now() "
+        "WHERE status IN ('queued', 'running')"
+    )
+
+
+def downgrade():
+    op.drop_column('report_jobs', 'heartbeat_at')
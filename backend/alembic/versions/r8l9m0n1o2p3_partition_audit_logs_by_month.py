@@ -0,0 +1,112 @@
+"""partition audit_logs by month on created_at
+
+Revision ID: r8l9m0n1o2p3
+Revises: q7k8l9m0n1o2
+Create Date: 2026-10-18
+
+"""
+from datetime import date
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'r8l9m0n1o2p3'
+down_revision = 'q7k8l9m0n1o2'
+branch_labels = None
+depends_on = None
+
+MONTHS_AHEAD = 3
+
+
+def _add_months(month: date, n: int) -> date:
+    idx = month.year * 12 + (month.month - 1) + n
+    return date(idx // 12, idx % 12 + 1, 1)
+
+
+def upgrade():
+    conn = op.get_bind()
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # Partitioned tables need the partition key in the primary key
+    op.execute("""
+        CREATE TABLE audit_logs_partitioned (
+            id SERIAL NOT NULL,
+            user_id INTEGER REFERENCES users(id) ON DELETE SET NULL,
+            user_email VARCHAR(255) NOT NULL,
+            user_role VARCHAR(30) NOT NULL,
+            action VARCHAR(60) NOT NULL,
+            target_name VARCHAR(255),
+            details TEXT,
+            created_at TIMESTAMP WITH TIME ZONE NOT NULL,
+            PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+    """)
+
+    # One partition per month from the oldest existing row up to a few months ahead
+    oldest = conn.execute(sa.text("SELECT MIN(created_at) FROM audit_logs")).scalar()
+    this_month = date.today().replace(day=1)
+    month = oldest.date().replace(day=1) if oldest else this_month
+    last = _add_months(this_month, MONTHS_AHEAD)
+    while month <= last:
+        end = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE audit_logs_y{month.year:04d}m{month.month:02d} PARTITION OF audit_logs_partitioned "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{end.isoformat()}')"
+        )
+        month = end
+    op.execute("CREATE TABLE audit_logs_default PARTITION OF audit_logs_partitioned DEFAULT")
+
+    op.execute("""
+        INSERT INTO audit_logs_partitioned
+            (id, user_id, user_email, user_role, action, target_name, details, created_at)
+        SELECT id, user_id, user_email, user_role, action, target_name, details, COALESCE(created_at, NOW())
+        FROM audit_logs
+    """)
+    op.execute("DROP TABLE audit_logs")
+    op.execute("ALTER TABLE audit_logs_partitioned RENAME TO audit_logs")
+    op.execute("ALTER SEQUENCE audit_logs_partitioned_id_seq RENAME TO audit_logs_id_seq")
+    op.execute("SELECT setval('audit_logs_id_seq', COALESCE((SELECT MAX(id) FROM audit_logs), 0) + 1, false)")
+
+    op.create_index('ix_audit_logs_user_id', 'audit_logs', ['user_id'])
+    op.create_index('ix_audit_logs_created_at', 'audit_logs', ['created_at'])
+    op.create_index('ix_audit_logs_action_created_at', 'audit_logs', ['action', 'created_at'])
+    op.create_index('ix_audit_logs_user_role_created_at', 'audit_logs', ['user_role', 'created_at'])
+    op.create_index(
+        'ix_audit_logs_user_email_trgm', 'audit_logs', ['user_email'],
+        postgresql_using='gin', postgresql_ops={'user_email': 'gin_trgm_ops'},
+    )
+    op.create_index(
+        'ix_audit_logs_target_name_trgm', 'audit_logs', ['target_name'],
+        postgresql_using='gin', postgresql_ops={'target_name': 'gin_trgm_ops'},
+    )
+
+
+def downgrade():
+    op.create_table(
+        'audit_logs_plain',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id', ondelete='SET NULL'), nullable=True),
+        sa.Column('user_email', sa.String(length=255), nullable=False),
+        sa.Column('user_role', sa.String(length=30), nullable=False),
+        sa.Column('action', sa.String(length=60), nullable=False),
+        sa.Column('target_name', sa.String(length=255), nullable=True),
+        sa.Column('details', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.execute("""
+        INSERT INTO audit_logs_plain
+            (id, user_id, user_email, user_role, action, target_name, details, created_at)
+        SELECT id, user_id, user_email, user_role, action, target_name, details, created_at
+        FROM audit_logs
+    """)
+    # Dropping the parent drops every attached partition with it
+    op.execute("DROP TABLE audit_logs CASCADE")
+    op.execute("ALTER TABLE audit_logs_plain RENAME TO audit_logs")
+    op.execute("CREATE SEQUENCE audit_logs_id_seq OWNED BY audit_logs.id")
+    op.execute("ALTER TABLE audit_logs ALTER COLUMN id SET DEFAULT nextval('audit_logs_id_seq')")
+    op.execute("SELECT setval('audit_logs_id_seq', COALESCE((SELECT MAX(id) FROM audit_logs), 0) + 1, false)")
+    op.create_index('ix_audit_logs_id', 'audit_logs', ['id'])
+    op.create_index('ix_audit_logs_user_id', 'audit_logs', ['user_id'])
+    op.create_index('ix_audit_logs_created_at', 'audit_logs', ['created_at'])
@@ -0,0 +1,23 @@
+"""drop active_token from users (sessions live in the session store)
+
+Revision ID: t0n1o2p3q4r5
+Revises: s9m0n1o2p3q4
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 't0n1o2p3q4r5'
+down_revision = 's9m0n1o2p3q4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.drop_column('users', 'active_token')
+
+
+def downgrade():
+    op.add_column('users', sa.Column('active_token', sa.String(512), nullable=True))
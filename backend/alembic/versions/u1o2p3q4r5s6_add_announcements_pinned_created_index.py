@@ -0,0 +1,25 @@
+"""add (is_pinned, created_at) index to announcements
+
+Revision ID: u1o2p3q4r5s6
+Revises: t0n1o2p3q4r5
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'u1o2p3q4r5s6'
+down_revision = 't0n1o2p3q4r5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        'ix_announcements_is_pinned_created_at', 'announcements', ['is_pinned', 'created_at']
+    )
+
+
+def downgrade():
+    op.drop_index('ix_announcements_is_pinned_created_at', table_name='announcements')
@@ -0,0 +1,43 @@
+"""add report_jobs table
+
+Revision ID: v2p3q4r5s6t7
+Revises: u1o2p3q4r5s6
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'v2p3q4r5s6t7'
+down_revision = 'u1o2p3q4r5s6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'report_jobs',
+        sa.Column('id', sa.String(length=32), nullable=False),
+        sa.Column('kind', sa.String(length=50), nullable=False),
+        sa.Column('params', sa.JSON(), nullable=False),
+        sa.Column('dedup_key', sa.String(length=64), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('filename', sa.String(length=255), nullable=False),
+        sa.Column('file_path', sa.String(length=500), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('requested_by', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['requested_by'], ['users.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_report_jobs_dedup_key', 'report_jobs', ['dedup_key'])
+    op.create_index('ix_report_jobs_created_at', 'report_jobs', ['created_at'])
+
+
+def downgrade():
+    op.drop_index('ix_report_jobs_created_at', table_name='report_jobs')
+    op.drop_index('ix_report_jobs_dedup_key', table_name='report_jobs')
+    op.drop_table('report_jobs')
@@ -0,0 +1,24 @@
+"""add updated_at to school_settings
+
+Revision ID: w3q4r5s6t7u8
+Revises: v2p3q4r5s6t7
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'w3q4r5s6t7u8'
+down_revision = 'v2p3q4r5s6t7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('school_settings', sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True))
+    op.execute("UPDATE school_settings SET updated_at = CURRENT_TIMESTAMP")
+
+
+def downgrade():
+    op.drop_column('school_settings', 'updated_at')
@@ -0,0 +1,61 @@
+"""add enrollment_rollups table
+
+Revision ID: x4r5s6t7u8v9
+Revises: w3q4r5s6t7u8
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'x4r5s6t7u8v9'
+down_revision = 'w3q4r5s6t7u8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'enrollment_rollups',
+        sa.Column('school_year', sa.String(length=20), nullable=False),
+        sa.Column('semester', sa.String(length=20), nullable=False),
+        sa.Column('strand', sa.String(length=50), nullable=False),
+        sa.Column('grade_level', sa.String(length=20), nullable=False),
+        sa.Column('sex', sa.String(length=10), nullable=False),
+        sa.Column('enrollment_type', sa.String(length=20), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('payment_status', sa.String(length=30), nullable=False),
+        sa.Column('student_count', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint(
+            'school_year', 'semester', 'strand', 'grade_level',
+            'sex', 'enrollment_type', 'status', 'payment_status',
+        ),
+    )
+    op.execute(
+        """
+        INSERT INTO enrollment_rollups (
+            school_year, semester, strand, grade_level,
+            sex, enrollment_type, status, payment_status,
+            student_count, updated_at
+        )
+        SELECT
+            COALESCE(school_year, ''),
+            COALESCE(semester, ''),
+            COALESCE(strand, ''),
+            COALESCE(grade_level_to_enroll, ''),
+            COALESCE(CAST(sex AS VARCHAR), ''),
+            COALESCE(CAST(enrollment_type AS VARCHAR), ''),
+            COALESCE(CAST(status AS VARCHAR), ''),
+            COALESCE(payment_status, ''),
+            COUNT(*),
+            CURRENT_TIMESTAMP
+        FROM students
+        GROUP BY 1, 2, 3, 4, 5, 6, 7, 8
+        """
+    )
+
+
+def downgrade():
+    op.drop_table('enrollment_rollups')
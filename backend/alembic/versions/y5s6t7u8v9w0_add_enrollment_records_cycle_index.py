@@ -0,0 +1,25 @@
+"""add (school_year, semester) index to enrollment_records
+
+Revision ID: y5s6t7u8v9w0
+Revises: x4r5s6t7u8v9
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'y5s6t7u8v9w0'
+down_revision = 'x4r5s6t7u8v9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        'ix_enrollment_records_school_year_semester', 'enrollment_records', ['school_year', 'semester']
+    )
+
+
+def downgrade():
+    op.drop_index('ix_enrollment_records_school_year_semester', table_name='enrollment_records')
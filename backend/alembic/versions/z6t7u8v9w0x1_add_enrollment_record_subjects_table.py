@@ -0,0 +1,55 @@
+"""add enrollment_record_subjects table
+
+Revision ID: z6t7u8v9w0x1
+Revises: y5s6t7u8v9w0
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'z6t7u8v9w0x1'
+down_revision = 'y5s6t7u8v9w0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'enrollment_record_subjects',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('enrollment_record_id', sa.Integer(), nullable=False),
+        sa.Column('subject_code', sa.String(length=20), nullable=True),
+        sa.Column('subject_name', sa.String(length=200), nullable=True),
+        sa.Column('schedule', sa.String(length=100), nullable=True),
+        sa.ForeignKeyConstraint(['enrollment_record_id'], ['enrollment_records.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+
+    # Backfill from the JSON snapshots in one statement, keeping their order
+    op.execute(
+        """
+        INSERT INTO enrollment_record_subjects (enrollment_record_id, subject_code, subject_name, schedule)
+        SELECT r.id, s.value ->> 'subject_code', s.value ->> 'subject_name', s.value ->> 'schedule'
+        FROM enrollment_records r
+        CROSS JOIN LATERAL json_array_elements(
+            CASE WHEN json_typeof(r.subjects_snapshot) = 'array' THEN r.subjects_snapshot ELSE '[]'::json END
+        ) WITH ORDINALITY AS s(value, position)
+        ORDER BY r.id, s.position
+        """
+    )
+
+    op.create_index(
+        'ix_enrollment_record_subjects_enrollment_record_id', 'enrollment_record_subjects', ['enrollment_record_id']
+    )
+    op.create_index(
+        'ix_enrollment_record_subjects_code_record', 'enrollment_record_subjects',
+        ['subject_code', 'enrollment_record_id'],
+    )
+
+
+def downgrade():
+    op.drop_index('ix_enrollment_record_subjects_code_record', table_name='enrollment_record_subjects')
+    op.drop_index('ix_enrollment_record_subjects_enrollment_record_id', table_name='enrollment_record_subjects')
+    op.drop_table('enrollment_record_subjects')
@@ -1,21 +1,66 @@
 """FastAPI dependencies for authentication and role-based access control."""
 
+from functools import lru_cache
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app.auth.jwt_handler import decode_access_token
+from app.auth.session_store import session_store
 from app.models.user import User, UserRole
 
 security = HTTPBearer()
 
 
-def get_current_user(
+class Principal:
+    """The authenticated caller, built from verified token claims.
+
+    `id`, `role` and (for tokens that carry it) `email` need no database access.
+    Any other attribute — or `.user` — loads the full User row once, on first use.
+    """
+
+    def __init__(self, id: int, role: UserRole, email: str | None, jti: str | None, db: Session):
+        self.id = id
+        self.role = role
+        self.jti = jti
+        self._email = email
+        self._db = db
+        self._user: User | None = None
+
+    @property
+    def user(self) -> User:
+        if self._user is None:
+            user = self._db.get(User, self.id)
+            if user is None:
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="User not found",
+                )
+            self._user = user
+        return self._user
+
+    @property
+    def email(self) -> str:
+        return self._email or self.user.email
+
+    def __getattr__(self, name: str):
+        # Only reached for attributes not defined above, e.g. is_active, created_at
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.user, name)
+
+
+def get_current_principal(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db),
-) -> User:
-    """Extract and validate the current user from the JWT token."""
+) -> Principal:
+    """Validate the JWT and return the caller's identity without loading the User row.
+
+    The session check reads the user's session columns and `is_active` in one
+    primary-key lookup, so deactivated and deleted accounts are refused here.
+    """
     payload = decode_access_token(credentials.credentials)
     if payload is None:
         raise HTTPException(
@@ -23,38 +68,57 @@ def get_current_user(
             detail="Invalid or expired token",
         )
     user_id: int | None = payload.get("user_id")
-    if user_id is None:
+    try:
+        role = UserRole(payload.get("role"))
+    except ValueError:
+        role = None
+    if user_id is None or role is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token payload",
         )
-    user = db.query(User).filter(User.id == user_id).first()
-    if user is None:
+    single_session = role in (UserRole.ADMIN, UserRole.REGISTRAR)
+    record = session_store.get_record(db, user_id)
+    if record is None or not session_store.is_token_valid(record, payload, single_session):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found",
+            detail="Session expired. Please log in again.",
         )
+    if not record.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="User account is deactivated",
+        )
+    return Principal(user_id, role, payload.get("email"), payload.get("jti"), db)
+
+
+def get_current_user(principal: Principal = Depends(get_current_principal)) -> User:
+    """Extract and validate the current user from the JWT token, loading the full row."""
+    user = principal.user
     if not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="User account is deactivated",
         )
-    if user.role in (UserRole.ADMIN, UserRole.REGISTRAR):
-        if user.active_token != credentials.credentials:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Session expired. Please log in again.",
-            )
     return user
 
 
-def require_role(*roles: UserRole):
-    """Dependency factory that restricts access to specific roles."""
-    def role_checker(current_user: User = Depends(get_current_user)) -> User:
-        if current_user.role not in roles:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail=f"Access denied. Required role(s): {', '.join(r.value for r in roles)}",
-            )
-        return current_user
+@lru_cache(maxsize=None)
+def _role_checker(roles: tuple[UserRole, ...]):
+    allowed = frozenset(roles)
+    detail = f"Access denied. Required role(s): {', '.join(r.value for r in roles)}"
+
+    def role_checker(principal: Principal = Depends(get_current_principal)) -> Principal:
+        if principal.role not in allowed:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=detail)
+        return principal
     return role_checker
+
+
+def require_role(*roles: UserRole | str):
+    """Dependency factory that restricts access to specific roles.
+
+    Checkers are shared per role set, and the role comes from token claims;
+    deleted, deactivated and revoked accounts are refused by get_current_principal.
+    """
+    return _role_checker(tuple(UserRole(r) for r in roles))
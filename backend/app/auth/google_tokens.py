@@ -0,0 +1,92 @@
+"""Google ID token verification against locally cached signing keys.
+
+Google's JWKS is fetched through one shared requests.Session and kept until the
+Cache-Control max-age it was served with expires, so a login only touches the
+network when the keys are stale or Google has rotated to a key we haven't seen.
+"""
+
+import logging
+import re
+import threading
+import time
+
+import requests
+from jose import JWTError, jwk, jwt
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+GOOGLE_ISSUERS = ("accounts.google.com", "https://accounts.google.com")
+DEFAULT_MAX_AGE = 300  # seconds, when the response carries no usable Cache-Control
+MIN_REFRESH_INTERVAL = 30  # seconds between forced refreshes for unknown key ids
+
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+
+class GoogleCertCache:
+    """Thread-safe cache of Google's signing keys, keyed by kid."""
+
+    def __init__(self, certs_url: str):
+        self.certs_url = certs_url
+        self._session = requests.Session()
+        self._lock = threading.Lock()
+        self._keys: dict = {}
+        self._expires_at = 0.0
+        self._fetched_at = 0.0
+        self.fetches = 0
+
+    def _refresh(self) -> None:
+        resp = self._session.get(self.certs_url, timeout=5)
+        resp.raise_for_status()
+        match = _MAX_AGE_RE.search(resp.headers.get("Cache-Control", ""))
+        max_age = int(match.group(1)) if match else DEFAULT_MAX_AGE
+        self._keys = {k["kid"]: jwk.construct(k) for k in resp.json()["keys"]}
+        self._fetched_at = time.monotonic()
+        self._expires_at = self._fetched_at + max_age
+        self.fetches += 1
+
+    def get_key(self, kid: str):
+        """Return the verification key for `kid`, fetching the JWKS only when needed."""
+        now = time.monotonic()
+        if now < self._expires_at and kid in self._keys:
+            return self._keys[kid]
+        with self._lock:
+            now = time.monotonic()
+            stale = now >= self._expires_at
+            rotated = kid not in self._keys and now - self._fetched_at >= MIN_REFRESH_INTERVAL
+            if stale or rotated:
+                try:
+                    self._refresh()
+                except (requests.RequestException, KeyError, ValueError):
+                    # Keep serving the previous keys if Google is briefly unreachable
+                    logger.warning("Could not refresh Google signing keys", exc_info=True)
+            return self._keys.get(kid)
+
+
+cert_cache = GoogleCertCache(settings.GOOGLE_CERTS_URL)
+
+
+def verify_google_id_token(token: str, audience: str) -> dict:
+    """Verify a Google ID token's signature, audience, issuer and expiry.
+
+    Returns the token claims. Raises ValueError if the token is not valid.
+    """
+    try:
+        kid = jwt.get_unverified_header(token).get("kid")
+    except JWTError as exc:
+        raise ValueError(str(exc)) from exc
+    key = cert_cache.get_key(kid) if kid else None
+    if key is None:
+        raise ValueError("Unknown signing key")
+    try:
+        return jwt.decode(
+            token,
+            key,
+            algorithms=["RS256"],
+            audience=audience,
+            issuer=GOOGLE_ISSUERS,
+            options={"verify_at_hash": False, "leeway": 10},
+        )
+    except JWTError as exc:
+        raise ValueError(str(exc)) from exc
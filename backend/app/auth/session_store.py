@@ -0,0 +1,163 @@
+"""Session store — single-session enforcement and token revocation.
+
+Access tokens carry a `jti` (token id) and a fractional `iat`. The records
+live on the users row, so they survive restarts and every worker sees them:
+
+- `session_jti` / `session_expires_at`: the active session of an admin or
+  registrar account (one session at a time)
+- `tokens_revoked_before`: tokens issued earlier are rejected
+
+Checking a token costs one primary-key lookup of those columns (plus
+`is_active`, so deactivated accounts are refused on every request). Set
+SESSION_CACHE_URI=redis://host:6379/0 to cache the lookup in Redis for
+SESSION_CACHE_SECONDS; writes drop the cached entry once their transaction
+commits, so a change can be missed for at most that long by a request that
+read the row just before the commit. Changes made outside the store (such as
+is_active edited directly) show once the cached entry expires.
+
+Two goals of moving sessions out of users.active_token are deliberately not
+met, in exchange for records that survive restarts and are shared by every
+worker without extra infrastructure:
+
+- without Redis, every authenticated request still reads the users row (the
+  narrow column lookup above, not the full row); with it, each user's row is
+  read at most once per SESSION_CACHE_SECONDS;
+- admin/registrar login, logout and revocation still UPDATE the users row
+  (a 32-character jti and timestamps instead of the whole JWT).
+
+Write methods change the row in the caller's transaction; the caller commits.
+"""
+
+import json
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.user import User
+
+_PENDING_KEY = "session_store_forget"
+
+
+@dataclass(frozen=True)
+class SessionRecord:
+    is_active: bool
+    jti: str | None
+    expires_at: float | None
+    revoked_before: float | None
+
+
+def _timestamp(value: datetime | None) -> float | None:
+    if value is None:
+        return None
+    if value.tzinfo is None:  # SQLite hands back naive UTC datetimes
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+class RedisSessionCache:
+    def __init__(self, uri: str, ttl: int):
+        import redis
+
+        self._redis = redis.Redis.from_url(uri, decode_responses=True)
+        self._ttl = ttl
+
+    def load(self, user_id: int) -> SessionRecord | None:
+        raw = self._redis.get(f"srs:session:{user_id}")
+        return SessionRecord(*json.loads(raw)) if raw else None
+
+    def store(self, user_id: int, record: SessionRecord) -> None:
+        value = json.dumps([record.is_active, record.jti, record.expires_at, record.revoked_before])
+        self._redis.set(f"srs:session:{user_id}", value, ex=self._ttl)
+
+    def forget(self, user_ids: set[int]) -> None:
+        self._redis.delete(*(f"srs:session:{user_id}" for user_id in user_ids))
+
+
+class SessionStore:
+    """Session operations used by login, logout, account changes and token checks."""
+
+    def __init__(self, cache: RedisSessionCache | None = None):
+        self._cache = cache
+        self._ttl = timedelta(hours=settings.ACCESS_TOKEN_EXPIRE_HOURS)
+
+    def get_record(self, db: Session, user_id: int) -> SessionRecord | None:
+        """The user's session columns and active flag, or None if the user no longer exists."""
+        if self._cache is not None:
+            record = self._cache.load(user_id)
+            if record is not None:
+                return record
+        row = (
+            db.query(User.is_active, User.session_jti, User.session_expires_at, User.tokens_revoked_before)
+            .filter(User.id == user_id)
+            .first()
+        )
+        if row is None:
+            return None
+        record = SessionRecord(
+            row.is_active, row.session_jti, _timestamp(row.session_expires_at), _timestamp(row.tokens_revoked_before)
+        )
+        if self._cache is not None:
+            self._cache.store(user_id, record)
+        return record
+
+    def _update(self, db: Session, user_id: int, values: dict) -> None:
+        db.query(User).filter(User.id == user_id).update(values, synchronize_session=False)
+        db.info.setdefault(_PENDING_KEY, set()).add(user_id)
+
+    def get_active_session(self, db: Session, user_id: int) -> str | None:
+        record = self.get_record(db, user_id)
+        if record is None or record.jti is None:
+            return None
+        if record.expires_at is not None and record.expires_at <= datetime.now(timezone.utc).timestamp():
+            return None
+        return record.jti
+
+    def set_active_session(self, db: Session, user_id: int, jti: str) -> None:
+        """Make `jti` the user's only valid session, ending any previous one."""
+        expires_at = datetime.now(timezone.utc) + self._ttl
+        self._update(db, user_id, {User.session_jti: jti, User.session_expires_at: expires_at})
+
+    def revoke_user_tokens(self, db: Session, user_id: int) -> None:
+        """Reject every token issued to this user up to now, and end their active session."""
+        self._update(db, user_id, {
+            User.tokens_revoked_before: datetime.now(timezone.utc),
+            User.session_jti: None,
+            User.session_expires_at: None,
+        })
+
+    def is_token_valid(self, record: SessionRecord, payload: dict, single_session: bool) -> bool:
+        if record.revoked_before is not None and float(payload.get("iat", 0)) <= record.revoked_before:
+            return False
+        # Only the token that started the active session is valid, so a token
+        # issued without starting one (or after logout) is refused
+        if single_session and (record.jti is None or record.jti != payload.get("jti")):
+            return False
+        return True
+
+    def forget_pending(self, session: Session) -> None:
+        user_ids = session.info.pop(_PENDING_KEY, None)
+        if user_ids and self._cache is not None:
+            self._cache.forget(user_ids)
+
+
+def _create_session_store(uri: str) -> SessionStore:
+    if uri.startswith(("redis://", "rediss://")):
+        return SessionStore(RedisSessionCache(uri, settings.SESSION_CACHE_SECONDS))
+    return SessionStore()
+
+
+session_store = _create_session_store(settings.SESSION_CACHE_URI)
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _forget_committed(session) -> None:
+    session_store.forget_pending(session)
+
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _discard_pending(session) -> None:
+    session.info.pop(_PENDING_KEY, None)
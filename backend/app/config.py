@@ -1,6 +1,7 @@
 """Application configuration loaded from environment variables."""
 
 import os
+import tempfile
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -26,7 +27,29 @@ class Settings:
         "CORS_ORIGINS", "http://localhost:3000,http://localhost:5173,http://localhost:5174"
     ).split(",")
     GOOGLE_CLIENT_ID: str = os.getenv("GOOGLE_CLIENT_ID", "").strip()
+    GOOGLE_CERTS_URL: str = os.getenv("GOOGLE_CERTS_URL", "https://www.googleapis.com/oauth2/v3/certs")
     TURNSTILE_SECRET_KEY: str = os.getenv("TURNSTILE_SECRET_KEY", "").strip()
+    TURNSTILE_VERIFY_URL: str = os.getenv(
+        "TURNSTILE_VERIFY_URL", "https://challenges.cloudflare.com/turnstile/v0/siteverify"
+    )
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", "12"))
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+    SESSION_CACHE_URI: str = os.getenv("SESSION_CACHE_URI", "")
+    SESSION_CACHE_SECONDS: int = int(os.getenv("SESSION_CACHE_SECONDS", "10"))
+    RATE_LIMIT_STORAGE_URI: str = os.getenv("RATE_LIMIT_STORAGE_URI", "memory://")
+    REPORT_WORKERS: int = int(os.getenv("REPORT_WORKERS", "2"))
+    REPORT_DIR: str = os.getenv("REPORT_DIR", os.path.join(tempfile.gettempdir(), "srs-reports"))
+    REPORT_JOB_DEDUP_SECONDS: int = int(os.getenv("REPORT_JOB_DEDUP_SECONDS", "300"))
+    REPORT_JOB_RETENTION_HOURS: int = int(os.getenv("REPORT_JOB_RETENTION_HOURS", "24"))
+    REPORT_JOB_STALE_SECONDS: int = int(os.getenv("REPORT_JOB_STALE_SECONDS", "120"))
+    REPORT_JOB_STREAM_SECONDS: int = int(os.getenv("REPORT_JOB_STREAM_SECONDS", "300"))
+    PUBLIC_CACHE_TTL_SECONDS: float = float(os.getenv("PUBLIC_CACHE_TTL_SECONDS", "30"))
+    AUDIT_LOG_ASYNC: bool = os.getenv("AUDIT_LOG_ASYNC", "true").lower() == "true"
+    AUDIT_LOG_QUEUE_SIZE: int = int(os.getenv("AUDIT_LOG_QUEUE_SIZE", "10000"))
+    AUDIT_LOG_BATCH_SIZE: int = int(os.getenv("AUDIT_LOG_BATCH_SIZE", "200"))
+    AUDIT_LOG_FLUSH_INTERVAL: float = float(os.getenv("AUDIT_LOG_FLUSH_INTERVAL", "1.0"))
+    AUDIT_LOG_PARTITION_MONTHS_AHEAD: int = int(os.getenv("AUDIT_LOG_PARTITION_MONTHS_AHEAD", "3"))
+    AUDIT_LOG_PARTITION_CHECK_HOURS: float = float(os.getenv("AUDIT_LOG_PARTITION_CHECK_HOURS", "6"))
 
 
 settings = Settings()
@@ -1,26 +1,68 @@
 """FastAPI application entry point."""
 
+import asyncio
+import logging
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
+from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 
 from app.config import settings
+from app.database import engine
+from app.auth.jwt_handler import shutdown_hash_pool
 from app.routers import auth, student, admin, registrar, utils, notification
+from app.utils.audit_log import audit_sink
+from app.utils.audit_partitions import ensure_audit_partitions
+from app.utils.rate_limit import limiter
+from app.utils.report_jobs import reap_stale_jobs, shutdown_report_pools
+from app.utils.turnstile import turnstile_verifier
+
+logger = logging.getLogger(__name__)
+
+
+async def maintain_audit_partitions():
+    """Keep upcoming monthly audit_logs partitions in place so rows never land in DEFAULT.
+
+    Runs at startup and then every AUDIT_LOG_PARTITION_CHECK_HOURS, so a
+    long-running process still creates next month's partition in time.
+    """
+    while True:
+        try:
+            await run_in_threadpool(ensure_audit_partitions, engine, settings.AUDIT_LOG_PARTITION_MONTHS_AHEAD)
+        except Exception:
+            logger.exception("Could not ensure audit log partitions")
+        await asyncio.sleep(settings.AUDIT_LOG_PARTITION_CHECK_HOURS * 3600)
+
+
+async def maintain_report_jobs():
+    """Fail report jobs left unfinished by a process that died or shut down, at startup and then periodically."""
+    while True:
+        try:
+            await run_in_threadpool(reap_stale_jobs)
+        except Exception:
+            logger.exception("Could not reap stale report jobs")
+        await asyncio.sleep(settings.REPORT_JOB_STALE_SECONDS / 2)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    partitions_task = asyncio.create_task(maintain_audit_partitions())
+    report_jobs_task = asyncio.create_task(maintain_report_jobs())
+    if settings.AUDIT_LOG_ASYNC:
+        audit_sink.start()
     yield
+    partitions_task.cancel()
+    report_jobs_task.cancel()
+    audit_sink.stop()
+    shutdown_hash_pool()
+    shutdown_report_pools()
+    await turnstile_verifier.aclose()
 
 
-# Rate limiter instance (shared across routers)
-limiter = Limiter(key_func=get_remote_address)
-
 app = FastAPI(
     title="School Registration System API",
     description="Backend API for student registration, enrollment, and management.",
@@ -5,8 +5,12 @@ from app.models.student_subject import StudentSubject
 from app.models.notification import Notification
 from app.models.academic_calendar import AcademicCalendar
 from app.models.enrollment_record import EnrollmentRecord
+from app.models.enrollment_record_subject import EnrollmentRecordSubject
 from app.models.audit_log import AuditLog
 from app.models.announcement import Announcement
 from app.models.school_settings import SchoolSettings
+from app.models.rate_limit import RateLimitCounter
+from app.models.report_job import ReportJob
+from app.models.enrollment_rollup import EnrollmentRollup
 
-__all__ = ["User", "Student", "Subject", "StudentSubject", "Notification", "AcademicCalendar", "EnrollmentRecord", "AuditLog", "Announcement", "SchoolSettings"]
+__all__ = ["User", "Student", "Subject", "StudentSubject", "Notification", "AcademicCalendar", "EnrollmentRecord", "EnrollmentRecordSubject", "AuditLog", "Announcement", "SchoolSettings", "RateLimitCounter", "ReportJob", "EnrollmentRollup"]
@@ -3,7 +3,7 @@
 from datetime import datetime, timezone, date
 from typing import Optional
 
-from sqlalchemy import String, Text, DateTime, Date, Boolean
+from sqlalchemy import String, Text, DateTime, Date, Boolean, Index
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.database import Base
@@ -11,6 +11,10 @@ from app.database import Base
 
 class Announcement(Base):
     __tablename__ = "announcements"
+    __table_args__ = (
+        # Serves the pinned-first, newest-first feed ordering
+        Index("ix_announcements_is_pinned_created_at", "is_pinned", "created_at"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     title: Mapped[str] = mapped_column(String(200), nullable=False)
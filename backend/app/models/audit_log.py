@@ -1,8 +1,12 @@
-"""AuditLog model — records all state-changing actions for accountability."""
+"""AuditLog model — records all state-changing actions for accountability.
+
+On PostgreSQL the table is range-partitioned by month on created_at (see
+app/utils/audit_partitions.py), so created_at is part of the primary key.
+"""
 
 from datetime import datetime, timezone
 
-from sqlalchemy import String, Text, DateTime, ForeignKey, Integer
+from sqlalchemy import String, Text, DateTime, ForeignKey, Index, Integer
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.database import Base
@@ -10,8 +14,21 @@ from app.database import Base
 
 class AuditLog(Base):
     __tablename__ = "audit_logs"
+    __table_args__ = (
+        Index("ix_audit_logs_action_created_at", "action", "created_at"),
+        Index("ix_audit_logs_user_role_created_at", "user_role", "created_at"),
+        Index(
+            "ix_audit_logs_user_email_trgm", "user_email",
+            postgresql_using="gin", postgresql_ops={"user_email": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_audit_logs_target_name_trgm", "target_name",
+            postgresql_using="gin", postgresql_ops={"target_name": "gin_trgm_ops"},
+        ),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
-    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     user_id: Mapped[int | None] = mapped_column(
         Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True, index=True
     )
@@ -22,6 +39,7 @@ class AuditLog(Base):
     details: Mapped[str | None] = mapped_column(Text, nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
+        primary_key=True,
         default=lambda: datetime.now(timezone.utc),
         index=True,
     )
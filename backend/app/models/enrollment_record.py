@@ -2,7 +2,7 @@
 
 from datetime import datetime, timezone
 
-from sqlalchemy import Integer, String, DateTime, ForeignKey, JSON
+from sqlalchemy import Integer, String, DateTime, ForeignKey, Index, JSON
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -10,6 +10,10 @@ from app.database import Base
 
 class EnrollmentRecord(Base):
     __tablename__ = "enrollment_records"
+    __table_args__ = (
+        # Per-cycle history and trend queries
+        Index("ix_enrollment_records_school_year_semester", "school_year", "semester"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     student_id: Mapped[int] = mapped_column(
@@ -24,7 +28,8 @@ class EnrollmentRecord(Base):
     enrollment_type: Mapped[str | None] = mapped_column(String(30))
     student_number: Mapped[str | None] = mapped_column(String(20))
 
-    # JSON snapshot of subjects: [{subject_code, subject_name, schedule}]
+    # JSON snapshot of subjects: [{subject_code, subject_name, schedule}],
+    # also stored row by row in `subjects` for querying
     subjects_snapshot: Mapped[list | None] = mapped_column(JSON, default=list)
 
     # When this archive was created
@@ -34,3 +39,7 @@ class EnrollmentRecord(Base):
 
     # Relationship back to student
     student: Mapped["Student"] = relationship("Student", back_populates="enrollment_records")
+    # Written in bulk by app.utils.enrollment_history.set_record_subjects
+    subjects: Mapped[list["EnrollmentRecordSubject"]] = relationship(
+        "EnrollmentRecordSubject", viewonly=True, order_by="EnrollmentRecordSubject.id"
+    )
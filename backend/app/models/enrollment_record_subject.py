@@ -0,0 +1,26 @@
+"""EnrollmentRecordSubject model — one subject of an archived enrollment cycle.
+
+Rows mirror EnrollmentRecord.subjects_snapshot so that per-subject history can
+be queried with indexes instead of reading every JSON snapshot.
+"""
+
+from sqlalchemy import ForeignKey, Index, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class EnrollmentRecordSubject(Base):
+    __tablename__ = "enrollment_record_subjects"
+    __table_args__ = (
+        # Per-subject history: which records (and so cycles) included a subject
+        Index("ix_enrollment_record_subjects_code_record", "subject_code", "enrollment_record_id"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    enrollment_record_id: Mapped[int] = mapped_column(
+        ForeignKey("enrollment_records.id", ondelete="CASCADE"), index=True
+    )
+    subject_code: Mapped[str | None] = mapped_column(String(20))
+    subject_name: Mapped[str | None] = mapped_column(String(200))
+    schedule: Mapped[str | None] = mapped_column(String(100))
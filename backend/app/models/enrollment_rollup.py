@@ -0,0 +1,31 @@
+"""EnrollmentRollup model — student counts per enrollment cycle and category.
+
+One row per distinct combination of the key columns, kept in step with the
+students table by app.utils.enrollment_rollups. Missing values are stored as
+'' so they can be part of the primary key; enum columns hold the enum name,
+as the students table does.
+"""
+
+from datetime import datetime, timezone
+
+from sqlalchemy import DateTime, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class EnrollmentRollup(Base):
+    __tablename__ = "enrollment_rollups"
+
+    school_year: Mapped[str] = mapped_column(String(20), primary_key=True, default="")
+    semester: Mapped[str] = mapped_column(String(20), primary_key=True, default="")
+    strand: Mapped[str] = mapped_column(String(50), primary_key=True, default="")
+    grade_level: Mapped[str] = mapped_column(String(20), primary_key=True, default="")
+    sex: Mapped[str] = mapped_column(String(10), primary_key=True, default="")
+    enrollment_type: Mapped[str] = mapped_column(String(20), primary_key=True, default="")
+    status: Mapped[str] = mapped_column(String(20), primary_key=True, default="")
+    payment_status: Mapped[str] = mapped_column(String(30), primary_key=True, default="")
+    student_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+    )
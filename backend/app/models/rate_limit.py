@@ -0,0 +1,15 @@
+"""RateLimitCounter model — shared rate limit counters for the "database://" limiter storage."""
+
+from sqlalchemy import Float, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class RateLimitCounter(Base):
+    __tablename__ = "rate_limit_counters"
+
+    key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # Unix timestamp (seconds), matching the limits library's own storages
+    expires_at: Mapped[float] = mapped_column(Float, nullable=False, index=True)
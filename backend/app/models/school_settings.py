@@ -1,6 +1,8 @@
 """SchoolSettings model — singleton row (id=1) for school name and logo."""
 
-from sqlalchemy import String, Text
+from datetime import datetime, timezone
+
+from sqlalchemy import DateTime, String, Text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.database import Base
@@ -12,3 +14,10 @@ class SchoolSettings(Base):
     id: Mapped[int] = mapped_column(primary_key=True, default=1)
     school_name: Mapped[str] = mapped_column(String(200), nullable=False, default="")
     school_logo_url: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # Bumped on every change; part of the cached report version stamp
+    updated_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+        nullable=True,
+    )
@@ -39,21 +39,23 @@ class Student(Base):
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), unique=True)
     student_number: Mapped[str | None] = mapped_column(String(20), unique=True, nullable=True, index=True)
+    # Columns marked active_history are enrollment rollup keys (see
+    # app.utils.enrollment_rollups): their old value is loaded on change.
     status: Mapped[StudentStatus] = mapped_column(
-        Enum(StudentStatus), default=StudentStatus.PENDING, nullable=False
+        Enum(StudentStatus), default=StudentStatus.PENDING, nullable=False, active_history=True
     )
 
     # A. Grade Level and School Information
-    school_year: Mapped[str | None] = mapped_column(String(20))
-    semester: Mapped[str | None] = mapped_column(String(20))
+    school_year: Mapped[str | None] = mapped_column(String(20), active_history=True)
+    semester: Mapped[str | None] = mapped_column(String(20), active_history=True)
     lrn: Mapped[str | None] = mapped_column(String(20))
     is_returning_student: Mapped[bool | None] = mapped_column(Boolean)
-    grade_level_to_enroll: Mapped[str | None] = mapped_column(String(20))
+    grade_level_to_enroll: Mapped[str | None] = mapped_column(String(20), active_history=True)
     last_grade_level_completed: Mapped[str | None] = mapped_column(String(20))
     last_school_year_completed: Mapped[str | None] = mapped_column(String(20))
     last_school_attended: Mapped[str | None] = mapped_column(String(255))
     school_type: Mapped[SchoolType | None] = mapped_column(Enum(SchoolType))
-    strand: Mapped[str | None] = mapped_column(String(50))
+    strand: Mapped[str | None] = mapped_column(String(50), active_history=True)
     school_to_enroll_in: Mapped[str | None] = mapped_column(String(255))
     school_address: Mapped[str | None] = mapped_column(String(500))
 
@@ -67,7 +69,7 @@ class Student(Base):
     suffix: Mapped[str | None] = mapped_column(String(20))
     birthday: Mapped[date | None] = mapped_column(Date)
     age: Mapped[int | None] = mapped_column(Integer)
-    sex: Mapped[Sex | None] = mapped_column(Enum(Sex))
+    sex: Mapped[Sex | None] = mapped_column(Enum(Sex), active_history=True)
     mother_tongue: Mapped[str | None] = mapped_column(String(50))
     religion: Mapped[str | None] = mapped_column(String(50))
 
@@ -87,7 +89,7 @@ class Student(Base):
     guardian_contact: Mapped[str | None] = mapped_column(String(20))
 
     # Enrollment Info (filled by admin on approval)
-    enrollment_type: Mapped[EnrollmentType | None] = mapped_column(Enum(EnrollmentType))
+    enrollment_type: Mapped[EnrollmentType | None] = mapped_column(Enum(EnrollmentType), active_history=True)
     enrollment_date: Mapped[date | None] = mapped_column(Date)
     place_of_birth: Mapped[str | None] = mapped_column(String(255))
     nationality: Mapped[str | None] = mapped_column(String(100))
@@ -112,7 +114,9 @@ class Student(Base):
 
     # Payment
     payment_receipt_path: Mapped[str | None] = mapped_column(String(500))
-    payment_status: Mapped[str] = mapped_column(String(30), default="unpaid", server_default="unpaid")
+    payment_status: Mapped[str] = mapped_column(
+        String(30), default="unpaid", server_default="unpaid", active_history=True
+    )
     payment_verified_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
 
     # Timestamps
@@ -24,7 +24,10 @@ class User(Base):
     google_id: Mapped[str] = mapped_column(String(255), unique=True, nullable=True, index=True)
     role: Mapped[UserRole] = mapped_column(Enum(UserRole), default=UserRole.STUDENT, nullable=False)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
-    active_token: Mapped[str] = mapped_column(String(512), nullable=True, default=None)
+    # Session records, see app/auth/session_store.py
+    session_jti: Mapped[str] = mapped_column(String(64), nullable=True, default=None)
+    session_expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=True, default=None)
+    tokens_revoked_before: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=True, default=None)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
     )
@@ -1,42 +1,58 @@
 """Admin endpoints — student management, approvals, dashboard, account management."""
 
+import asyncio
+import csv
 import io
+import json
 import os
 import re
 import zipfile
-from datetime import date, datetime, timezone
+from datetime import date, datetime, timedelta, timezone
 from io import BytesIO
 from typing import Optional
 
 import requests as http_requests
 from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, UploadFile, status
-from slowapi import Limiter
-from slowapi.util import get_remote_address
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import FileResponse, Response, StreamingResponse
 from pydantic import BaseModel
-from sqlalchemy import func
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
+from starlette.background import BackgroundTask
 
-from app.database import get_db
+from app.database import SessionLocal, get_db
+from app.utils.rate_limit import limiter
 from app.config import settings
-from app.auth.dependencies import require_role
-from app.auth.jwt_handler import hash_password
+from app.auth.dependencies import Principal, require_role
+from app.auth.jwt_handler import hash_password_async
+from app.auth.session_store import session_store
 from app.models.user import User, UserRole
-from app.models.student import Student, StudentStatus, EnrollmentType
+from app.models.student import Student, StudentStatus, EnrollmentType, Sex
 from app.models.academic_calendar import AcademicCalendar
-from app.schemas.student import StudentResponse, StudentListResponse, EnrollmentApproval, EnrollmentRecordResponse
+from app.schemas.student import StudentResponse, StudentListView, EnrollmentApproval, EnrollmentRecordResponse
 from app.schemas.user import AccountCreate, AccountListResponse, UserResponse, PasswordReset
-from app.schemas.common import MessageResponse, DashboardStats
+from app.schemas.common import MessageResponse, DashboardStats, EnrollmentTrends, SubjectTrend
 from app.models.notification import NotificationType
 from app.utils.notifications import create_notification
-from app.utils.audit_log import create_audit_log
-from app.utils.report_pdf import build_enrollment_report
+from app.utils.audit_log import audit_sink, create_audit_log
+from app.utils.metrics import latency_snapshot
+from app.utils.enrollment_report import collect_enrollment_report, enrollment_report_filename
+from app.utils.enrollment_rollups import rollup_counts
+from app.utils.enrollment_trends import enrollment_trends, subject_trend
+from app.utils.report_cache import cached_report, enrollment_report_cache_key, report_etag
+from app.utils.report_export import EXPORT_FORMATS, iter_export, write_xlsx
+from app.utils.report_jobs import render_enrollment_report, start_job, submit_enrollment_report
+from app.utils.serializers import student_list_response, student_page, student_to_response
 from app.models.audit_log import AuditLog
 from app.models.student_subject import StudentSubject
 from app.models.announcement import Announcement
 from app.utils.cloudinary_utils import delete_student_files, clear_student_file_fields, download_cloudinary_file, delete_cloudinary_file
+from app.utils.cache import RenderedJSON, SnapshotCache, midnight_timestamp
+from app.utils.enrollment_status import enrollment_status_cache
+from app.utils.http_cache import CACHE_PRIVATE_REVALIDATE, CACHE_PUBLIC_SHORT, cached_json_response, etag_matches
 from app.utils.file_upload import _upload_to_cloudinary, _validate_file, _read_and_check_size, ALLOWED_PHOTO_TYPES
 from app.models.school_settings import SchoolSettings
+from app.models.report_job import JOB_FAILED, JOB_SUCCEEDED, ReportJob
 
 
 # ── Academic Calendar Schemas ────────────────────────────────────────
@@ -88,6 +104,9 @@ class AuditLogResponse(BaseModel):
         from_attributes = True
 
 
+AUDIT_LOG_RESPONSE_COLUMNS = tuple(getattr(AuditLog, name) for name in AuditLogResponse.model_fields)
+
+
 class AuditLogListResponse(BaseModel):
     logs: list[AuditLogResponse]
     total: int
@@ -96,27 +115,19 @@ class AuditLogListResponse(BaseModel):
 
 
 router = APIRouter(prefix="/api/admin", tags=["Admin"])
-limiter = Limiter(key_func=get_remote_address)
-
 
-def _student_to_response(student: Student) -> StudentResponse:
-    data = {c.name: getattr(student, c.name) for c in student.__table__.columns}
-    data["email"] = student.user.email if student.user else None
-    if data.get("documents_path") is None:
-        data["documents_path"] = []
-    return StudentResponse(**data)
 
-
-@router.get("/students", response_model=StudentListResponse)
+@router.get("/students", response_model=StudentListView)
 def list_students(
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
+    view: str = Query("full", pattern="^(full|summary)$"),
     status_filter: str | None = Query(None, alias="status"),
     grade_level: str | None = None,
     strand: str | None = None,
     semester: str | None = None,
     search: str | None = None,
-    _admin: User = Depends(require_role(UserRole.ADMIN)),
+    _admin: Principal = Depends(require_role(UserRole.ADMIN)),
     db: Session = Depends(get_db),
 ):
     """List all students with pagination and optional filters."""
@@ -145,34 +156,25 @@ def list_students(
         )
 
     total = query.count()
-    students = query.order_by(Student.created_at.desc()).offset((page - 1) * per_page).limit(per_page).all()
+    students = student_page(query, view, (Student.created_at.desc(),), page, per_page)
 
-    return StudentListResponse(
-        students=[_student_to_response(s) for s in students],
-        total=total,
-        page=page,
-        per_page=per_page,
-    )
+    return student_list_response(students, view, total, page, per_page)
 
 
-@router.get("/students/pending", response_model=StudentListResponse)
+@router.get("/students/pending", response_model=StudentListView)
 def list_pending_students(
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
-    _admin: User = Depends(require_role(UserRole.ADMIN)),
+    view: str = Query("full", pattern="^(full|summary)$"),
+    _admin: Principal = Depends(require_role(UserRole.ADMIN)),
     db: Session = Depends(get_db),
 ):
     """List all students with pending status."""
     query = db.query(Student).filter(Student.status == StudentStatus.PENDING)
     total = query.count()
-    students = query.order_by(Student.created_at.desc()).offset((page - 1) * per_page).limit(per_page).all()
+    students = student_page(query, view, (Student.created_at.desc(),), page, per_page)
 
-    return StudentListResponse(
-        students=[_student_to_response(s) for s in students],
-        total=total,
-        page=page,
-        per_page=per_page,
-    )
+    return student_list_response(students, view, total, page, per_page)
 
 
 @router.get("/students/{student_id}/download-files")
@@ -180,7 +182,7 @@ def list_pending_students(
 def download_student_files(
     request: Request,
     student_id: int,
-    _admin: User = Depends(require_role(UserRole.ADMIN)),
+    _admin: Principal = Depends(require_role(UserRole.ADMIN)),
     db: Session = Depends(get_db),
 ):
     """Download all uploaded files for a student as a ZIP archive."""
@@ -228,7 +230,7 @@ def proxy_student_file(
     request: Request,
     student_id: int,
     url: str = Query(...),
-    _admin: User = Depends(require_role(UserRole.ADMIN)),
+    _admin: Principal = Depends(require_role(UserRole.ADMIN)),
     db: Session = Depends(get_db),
 ):
     """Proxy a student file from Cloudinary with inline Content-Disposition for browser viewing."""
@@ -265,7 +267,7 @@ def proxy_student_file(
 def approve_student(
     student_id: int,
     enrollment_data: EnrollmentApproval | None = None,
-    _admin: User = Depends(require_role(UserRole.ADMIN)),
+    _admin: Principal = Depends(require_role(UserRole.ADMIN)),
     db: Session = Depends(get_db),
 ):
     """Approve a pending student registration with enrollment form data."""
@@ -323,7 +325,7 @@ class DenyStudentRequest(BaseModel):
 def deny_student(
     student_id: int,
     body: DenyStudentRequest | None = None,
-    _admin: User = Depends(require_role(UserRole.ADMIN)),
+    _admin: Principal = Depends(require_role(UserRole.ADMIN)),
     db: Session = Depends(get_db),
 ):
     """Deny a pending student registration with an optional reason."""
@@ -367,20 +369,20 @@ def deny_student(
 @router.get("/students/{student_id}", response_model=StudentResponse)
 def get_student(
     student_id: int,
-    _admin: User = Depends(require_role(UserRole.ADMIN)),
+    _admin: Principal = Depends(require_role(UserRole.ADMIN)),
     db: Session = Depends(get_db),
 ):
     """Get a specific student's complete form data."""
     student = db.query(Student).filter(Student.id == student_id).first()
     if not student:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Student not found")
-    return _student_to_response(student)
+    return student_to_response(student)
 
 
 @router.delete("/students/{student_id}", response_model=MessageResponse)
 def delete_student(
     student_id: int,
-    _admin: User = Depends(require_role(UserRole.ADMIN)),
+    _admin: Principal = Depends(require_role(UserRole.ADMIN)),
     db: Session = Depends(get_db),
 ):
     """Delete a student record and their associated user account."""
@@ -406,52 +408,26 @@ def delete_student(
 
 @router.get("/dashboard/stats", response_model=DashboardStats)
 def get_dashboard_stats(
-    _admin: User = Depends(require_role(UserRole.ADMIN)),
+    _admin: Principal = Depends(require_role(UserRole.ADMIN)),
     db: Session = Depends(get_db),
 ):
-    """Dashboard statistics: totals, breakdown by grade level and strand."""
-    total = db.query(func.count(Student.id)).scalar() or 0
-    pending = db.query(func.count(Student.id)).filter(Student.status == StudentStatus.PENDING).scalar() or 0
-    approved = db.query(func.count(Student.id)).filter(Student.status == StudentStatus.APPROVED).scalar() or 0
-    denied = db.query(func.count(Student.id)).filter(Student.status == StudentStatus.DENIED).scalar() or 0
-
-    # Breakdown by grade level
-    grade_rows = (
-        db.query(Student.grade_level_to_enroll, func.count(Student.id))
-        .filter(Student.grade_level_to_enroll.isnot(None))
-        .group_by(Student.grade_level_to_enroll)
-        .all()
-    )
-    by_grade = {grade: count for grade, count in grade_rows}
-
-    # Breakdown by strand
-    strand_rows = (
-        db.query(Student.strand, func.count(Student.id))
-        .filter(Student.strand.isnot(None))
-        .group_by(Student.strand)
-        .all()
-    )
-    by_strand = {strand: count for strand, count in strand_rows}
-
-    # Breakdown by sex
-    sex_rows = (
-        db.query(Student.sex, func.count(Student.id))
-        .filter(Student.sex.isnot(None))
-        .group_by(Student.sex)
-        .all()
-    )
-    by_sex = {sex.value if hasattr(sex, "value") else sex: count for sex, count in sex_rows}
-
-    # Breakdown by enrollment type
-    enrollment_type_rows = (
-        db.query(Student.enrollment_type, func.count(Student.id))
-        .filter(Student.enrollment_type.isnot(None))
-        .group_by(Student.enrollment_type)
-        .all()
-    )
+    """Dashboard statistics: totals, breakdown by grade level and strand.
+
+    Read from the enrollment rollups, so this stays a few hundred rows
+    however many students there are.
+    """
+    by_status = rollup_counts(db, "status")
+    total = sum(by_status.values())
+    pending = by_status.get(StudentStatus.PENDING.name, 0)
+    approved = by_status.get(StudentStatus.APPROVED.name, 0)
+    denied = by_status.get(StudentStatus.DENIED.name, 0)
+
+    by_grade = rollup_counts(db, "grade_level")
+    by_strand = rollup_counts(db, "strand")
+    by_sex = {Sex[name].value: count for name, count in rollup_counts(db, "sex").items()}
     by_enrollment_type = {
-        (et.value if hasattr(et, "value") else et).replace("_", " ").title(): count
-        for et, count in enrollment_type_rows
+        EnrollmentType[name].value.replace("_", " ").title(): count
+        for name, count in rollup_counts(db, "enrollment_type").items()
     }
 
     return DashboardStats(
@@ -466,10 +442,31 @@ def get_dashboard_stats(
     )
 
 
+@router.get("/reports/enrollment/trends", response_model=EnrollmentTrends)
+def get_enrollment_trends(
+    request: Request,
+    _admin: Principal = Depends(require_role(UserRole.ADMIN)),
+    db: Session = Depends(get_db),
+):
+    """Enrolled students per school year and semester, by strand, grade level and subject."""
+    trends = EnrollmentTrends(cycles=enrollment_trends(db))
+    return cached_json_response(request, trends, CACHE_PRIVATE_REVALIDATE)
+
+
+@router.get("/reports/enrollment/trends/subjects/{subject_code}", response_model=SubjectTrend)
+def get_subject_trend(
+    subject_code: str,
+    _admin: Principal = Depends(require_role(UserRole.ADMIN)),
+    db: Session = Depends(get_db),
+):
+    """How many students took a subject in each school year and semester."""
+    return SubjectTrend(subject_code=subject_code, cycles=subject_trend(db, subject_code))
+
+
 @router.get("/students/{student_id}/enrollment-history", response_model=list[EnrollmentRecordResponse])
 def get_student_enrollment_history(
     student_id: int,
-    _admin: User = Depends(require_role(UserRole.ADMIN)),
+    _admin: Principal = Depends(require_role(UserRole.ADMIN)),
     db: Session = Depends(get_db),
 ):
     """Get enrollment history for a specific student, newest first."""
@@ -482,7 +479,7 @@ def get_student_enrollment_history(
 @router.get("/students/{student_id}/documents")
 def get_student_documents(
     student_id: int,
-    _admin: User = Depends(require_role(UserRole.ADMIN)),
+    _admin: Principal = Depends(require_role(UserRole.ADMIN)),
     db: Session = Depends(get_db),
 ):
     """Get the list of document paths for a student. Use individual paths to download."""
@@ -510,7 +507,7 @@ def list_accounts(
     per_page: int = Query(20, ge=1, le=100),
     role: str | None = None,
     search: str | None = None,
-    _admin: User = Depends(require_role(UserRole.ADMIN)),
+    _admin: Principal = Depends(require_role(UserRole.ADMIN)),
     db: Session = Depends(get_db),
 ):
     """List all user accounts with pagination and optional role filter."""
@@ -562,23 +559,14 @@ def list_accounts(
     )
 
 
-@router.post("/accounts", response_model=MessageResponse, status_code=status.HTTP_201_CREATED)
-def create_account(
-    data: AccountCreate,
-    _admin: User = Depends(require_role(UserRole.ADMIN)),
-    db: Session = Depends(get_db),
-):
-    """Create a new student or registrar account."""
-    existing = db.query(User).filter(User.email == data.email).first()
-    if existing:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Email already registered",
-        )
+def _email_registered(db: Session, email: str) -> bool:
+    return db.query(User.id).filter(User.email == email).first() is not None
 
+
+def _insert_account(db: Session, admin: Principal, data: AccountCreate, password_hash: str) -> None:
     user = User(
         email=data.email,
-        password_hash=hash_password(data.password),
+        password_hash=password_hash,
         role=UserRole(data.role),
     )
     db.add(user)
@@ -591,33 +579,62 @@ def create_account(
         )
         db.add(student)
 
-    create_audit_log(db, _admin, "ACCOUNT_CREATED", target_name=f"{data.email} ({data.role})")
+    create_audit_log(db, admin, "ACCOUNT_CREATED", target_name=f"{data.email} ({data.role})")
     db.commit()
+
+
+# Async only to await the bcrypt pool; the Session is used through run_in_threadpool.
+@router.post("/accounts", response_model=MessageResponse, status_code=status.HTTP_201_CREATED)
+async def create_account(
+    data: AccountCreate,
+    _admin: Principal = Depends(require_role(UserRole.ADMIN)),
+    db: Session = Depends(get_db),
+):
+    """Create a new student or registrar account."""
+    if await run_in_threadpool(_email_registered, db, data.email):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered",
+        )
+
+    password_hash = await hash_password_async(data.password)
+    await run_in_threadpool(_insert_account, db, _admin, data, password_hash)
     return MessageResponse(message=f"{data.role.capitalize()} account created successfully")
 
 
+def _find_user_email(db: Session, user_id: int) -> str | None:
+    row = db.query(User.email).filter(User.id == user_id).first()
+    return row.email if row else None
+
+
+def _set_password(db: Session, admin: Principal, user_id: int, email: str, password_hash: str) -> None:
+    db.query(User).filter(User.id == user_id).update({User.password_hash: password_hash}, synchronize_session=False)
+    create_audit_log(db, admin, "PASSWORD_RESET", target_name=email)
+    session_store.revoke_user_tokens(db, user_id)
+    db.commit()
+
+
 @router.put("/accounts/{user_id}/reset-password", response_model=MessageResponse)
-def reset_password(
+async def reset_password(
     user_id: int,
     data: PasswordReset,
-    _admin: User = Depends(require_role(UserRole.ADMIN)),
+    _admin: Principal = Depends(require_role(UserRole.ADMIN)),
     db: Session = Depends(get_db),
 ):
     """Reset a user's password."""
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
+    email = await run_in_threadpool(_find_user_email, db, user_id)
+    if email is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
-    user.password_hash = hash_password(data.new_password)
-    create_audit_log(db, _admin, "PASSWORD_RESET", target_name=user.email)
-    db.commit()
-    return MessageResponse(message=f"Password reset successfully for {user.email}")
+    password_hash = await hash_password_async(data.new_password)
+    await run_in_threadpool(_set_password, db, _admin, user_id, email, password_hash)
+    return MessageResponse(message=f"Password reset successfully for {email}")
 
 
 @router.delete("/accounts/{user_id}", response_model=MessageResponse)
 def delete_account(
     user_id: int,
-    admin: User = Depends(require_role(UserRole.ADMIN)),
+    admin: Principal = Depends(require_role(UserRole.ADMIN)),
     db: Session = Depends(get_db),
 ):
     """Delete a user account. Admin cannot delete their own account."""
@@ -637,6 +654,7 @@ def delete_account(
         db.delete(student)
 
     create_audit_log(db, admin, "ACCOUNT_DELETED", target_name=f"{user.email} ({user.role.value})")
+    session_store.revoke_user_tokens(db, user_id)
     db.delete(user)
     db.commit()
     return MessageResponse(message="Account deleted successfully")
@@ -647,7 +665,7 @@ def delete_account(
 
 @router.get("/academic-calendar", response_model=AcademicCalendarResponse)
 def get_academic_calendar(
-    _admin: User = Depends(require_role(UserRole.ADMIN)),
+    _admin: Principal = Depends(require_role(UserRole.ADMIN)),
     db: Session = Depends(get_db),
 ):
     """Get the current academic calendar settings."""
@@ -669,7 +687,7 @@ def get_academic_calendar(
 @router.put("/academic-calendar", response_model=AcademicCalendarResponse)
 def upsert_academic_calendar(
     data: AcademicCalendarUpdate,
-    _admin: User = Depends(require_role(UserRole.ADMIN)),
+    _admin: Principal = Depends(require_role(UserRole.ADMIN)),
     db: Session = Depends(get_db),
 ):
     """Create or update the academic calendar. Only one record is kept."""
@@ -695,6 +713,7 @@ def upsert_academic_calendar(
         db.add(calendar)
     create_audit_log(db, _admin, "CALENDAR_UPDATED", target_name=f"{data.school_year} {data.semester}")
     db.commit()
+    enrollment_status_cache.invalidate()
     db.refresh(calendar)
     return calendar
 
@@ -702,23 +721,15 @@ def upsert_academic_calendar(
 # ── Audit Logs ───────────────────────────────────────────────────────
 
 
-@router.get("/audit-logs", response_model=AuditLogListResponse)
-def list_audit_logs(
-    page: int = Query(1, ge=1),
-    per_page: int = Query(20, ge=1, le=100),
-    action: str | None = None,
-    role: str | None = None,
-    search: str | None = None,
-    date_from: str | None = None,
-    date_to: str | None = None,
-    _admin: User = Depends(require_role(UserRole.ADMIN)),
-    db: Session = Depends(get_db),
+def _filter_audit_logs(
+    query,
+    action: str | None,
+    role: str | None,
+    search: str | None,
+    date_from: str | None,
+    date_to: str | None,
 ):
-    """List audit logs with optional filters and pagination."""
-    from sqlalchemy import or_
-
-    query = db.query(AuditLog)
-
+    """Apply the audit log list/export filters to a query over AuditLog."""
     if action:
         query = query.filter(AuditLog.action == action.upper())
     if role:
@@ -730,7 +741,6 @@ def list_audit_logs(
         )
     if date_from:
         try:
-            from datetime import date as date_type
             df = datetime.fromisoformat(date_from)
             query = query.filter(AuditLog.created_at >= df)
         except ValueError:
@@ -739,18 +749,120 @@ def list_audit_logs(
         try:
             dt = datetime.fromisoformat(date_to)
             # include the full end day
-            from datetime import timedelta
             dt = dt.replace(hour=23, minute=59, second=59)
             query = query.filter(AuditLog.created_at <= dt)
         except ValueError:
             pass
+    return query
 
-    total = query.count()
-    logs = query.order_by(AuditLog.created_at.desc()).offset((page - 1) * per_page).limit(per_page).all()
 
+@router.get("/audit-logs", response_model=AuditLogListResponse)
+def list_audit_logs(
+    page: int = Query(1, ge=1),
+    per_page: int = Query(20, ge=1, le=100),
+    action: str | None = None,
+    role: str | None = None,
+    search: str | None = None,
+    date_from: str | None = None,
+    date_to: str | None = None,
+    _admin: Principal = Depends(require_role(UserRole.ADMIN)),
+    db: Session = Depends(get_db),
+):
+    """List audit logs with optional filters and pagination."""
+    query = _filter_audit_logs(db.query(AuditLog), action, role, search, date_from, date_to)
+
+    total = query.count()
+    rows = (
+        query.with_entities(*AUDIT_LOG_RESPONSE_COLUMNS)
+        .order_by(AuditLog.created_at.desc()).offset((page - 1) * per_page).limit(per_page).all()
+    )
+    # Plain column rows validate straight into the schema; no ORM instances to build
+    logs = [AuditLogResponse.model_validate(row._mapping) for row in rows]
     return AuditLogListResponse(logs=logs, total=total, page=page, per_page=per_page)
 
 
+AUDIT_EXPORT_COLUMNS = ["id", "created_at", "user_id", "user_email", "user_role", "action", "target_name", "details"]
+AUDIT_EXPORT_BATCH = 2000
+
+
+def _iter_audit_export(fmt: str, action, role, search, date_from, date_to):
+    """Yield CSV or NDJSON chunks for matching audit logs using a server-side cursor.
+
+    Uses its own session so the stream outlives the request-scoped one.
+    """
+    db = SessionLocal()
+    try:
+        query = _filter_audit_logs(
+            db.query(*(getattr(AuditLog, c) for c in AUDIT_EXPORT_COLUMNS)),
+            action, role, search, date_from, date_to,
+        )
+        rows = (
+            query.order_by(AuditLog.created_at.desc())
+            .execution_options(stream_results=True)
+            .yield_per(AUDIT_EXPORT_BATCH)
+        )
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        if fmt == "csv":
+            writer.writerow(AUDIT_EXPORT_COLUMNS)
+        for i, row in enumerate(rows, start=1):
+            values = [v.isoformat() if isinstance(v, datetime) else v for v in row]
+            if fmt == "csv":
+                writer.writerow(values)
+            else:
+                buf.write(json.dumps(dict(zip(AUDIT_EXPORT_COLUMNS, values))))
+                buf.write("\n")
+            if i % AUDIT_EXPORT_BATCH == 0:
+                yield buf.getvalue()
+                buf.seek(0)
+                buf.truncate()
+        yield buf.getvalue()
+    finally:
+        db.close()
+
+
+@router.get("/audit-logs/export")
+@limiter.limit("5/minute")
+def export_audit_logs(
+    request: Request,
+    fmt: str = Query("csv", alias="format", pattern="^(csv|ndjson)$"),
+    action: str | None = None,
+    role: str | None = None,
+    search: str | None = None,
+    date_from: str | None = None,
+    date_to: str | None = None,
+    _admin: Principal = Depends(require_role(UserRole.ADMIN)),
+    db: Session = Depends(get_db),
+):
+    """Stream every audit log matching the list filters as CSV or NDJSON in one response."""
+    filters = ", ".join(
+        f"{k}: {v}" for k, v in
+        (("action", action), ("role", role), ("search", search), ("from", date_from), ("to", date_to))
+        if v
+    )
+    create_audit_log(db, _admin, "AUDIT_LOGS_EXPORTED", details=f"{fmt}; {filters or 'no filters'}", durable=True)
+    db.commit()
+
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
+    media_type = "text/csv" if fmt == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        _iter_audit_export(fmt, action, role, search, date_from, date_to),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="audit_logs_{stamp}.{fmt}"'},
+    )
+
+
+# ── Metrics ───────────────────────────────────────────────────────────
+
+
+@router.get("/metrics")
+def get_metrics(
+    _admin: Principal = Depends(require_role(UserRole.ADMIN)),
+):
+    """In-process runtime metrics for this worker (audit log queue, endpoint latency)."""
+    return {"audit_log": audit_sink.stats(), "latency": latency_snapshot()}
+
+
 # ── School Settings ───────────────────────────────────────────────────
 
 
@@ -766,16 +878,18 @@ def _get_or_create_settings(db: Session) -> SchoolSettings:
 
 @router.get("/school-settings", response_model=SchoolSettingsResponse)
 def get_school_settings(
-    _admin: User = Depends(require_role(UserRole.ADMIN)),
+    request: Request,
+    _admin: Principal = Depends(require_role(UserRole.ADMIN)),
     db: Session = Depends(get_db),
 ):
-    return _get_or_create_settings(db)
+    row = SchoolSettingsResponse.model_validate(_get_or_create_settings(db))
+    return cached_json_response(request, row, CACHE_PRIVATE_REVALIDATE)
 
 
 @router.put("/school-settings", response_model=SchoolSettingsResponse)
 def update_school_settings(
     payload: SchoolSettingsUpdate,
-    _admin: User = Depends(require_role(UserRole.ADMIN)),
+    _admin: Principal = Depends(require_role(UserRole.ADMIN)),
     db: Session = Depends(get_db),
 ):
     row = _get_or_create_settings(db)
@@ -788,7 +902,7 @@ def update_school_settings(
 @router.post("/school-settings/logo", response_model=SchoolSettingsResponse)
 async def upload_school_logo(
     logo: UploadFile = File(...),
-    _admin: User = Depends(require_role(UserRole.ADMIN)),
+    _admin: Principal = Depends(require_role(UserRole.ADMIN)),
     db: Session = Depends(get_db),
 ):
     _validate_file(logo, ALLOWED_PHOTO_TYPES)
@@ -805,7 +919,7 @@ async def upload_school_logo(
 
 @router.delete("/school-settings/logo", response_model=SchoolSettingsResponse)
 def delete_school_logo(
-    _admin: User = Depends(require_role(UserRole.ADMIN)),
+    _admin: Principal = Depends(require_role(UserRole.ADMIN)),
     db: Session = Depends(get_db),
 ):
     row = _get_or_create_settings(db)
@@ -822,126 +936,186 @@ def delete_school_logo(
 
 @router.get("/reports/enrollment")
 def generate_enrollment_report(
+    request: Request,
     school_year: str | None = Query(None),
     semester: str | None = Query(None),
-    _admin: User = Depends(require_role(UserRole.ADMIN)),
+    _admin: Principal = Depends(require_role(UserRole.ADMIN)),
     db: Session = Depends(get_db),
 ):
-    """Generate and stream a PDF enrollment report. Filters are optional."""
-    base_q = db.query(Student)
-    if school_year:
-        base_q = base_q.filter(Student.school_year == school_year)
-    if semester:
-        base_q = base_q.filter(Student.semester == semester)
-
-    total_count    = base_q.count()
-    pending_count  = base_q.filter(Student.status == StudentStatus.PENDING).count()
-    approved_count = base_q.filter(Student.status == StudentStatus.APPROVED).count()
-    denied_count   = base_q.filter(Student.status == StudentStatus.DENIED).count()
-
-    # Breakdown by strand
-    strand_rows = (
-        base_q.with_entities(Student.strand, func.count(Student.id))
-        .filter(Student.strand.isnot(None))
-        .group_by(Student.strand)
-        .all()
-    )
-    by_strand = {strand: count for strand, count in strand_rows}
-
-    # Breakdown by grade level
-    grade_rows = (
-        base_q.with_entities(Student.grade_level_to_enroll, func.count(Student.id))
-        .filter(Student.grade_level_to_enroll.isnot(None))
-        .group_by(Student.grade_level_to_enroll)
-        .all()
-    )
-    by_grade = {grade: count for grade, count in grade_rows}
-
-    # Breakdown by enrollment type
-    et_rows = (
-        base_q.with_entities(Student.enrollment_type, func.count(Student.id))
-        .filter(Student.enrollment_type.isnot(None))
-        .group_by(Student.enrollment_type)
-        .all()
+    """Generate and stream a PDF enrollment report. Filters are optional.
+
+    Renders within the request unless the data is unchanged since the last
+    render; large schools should use the report job endpoints below instead.
+    """
+    key = enrollment_report_cache_key(db, school_year, semester)
+    headers = {"ETag": report_etag(key), "Cache-Control": CACHE_PRIVATE_REVALIDATE}
+    if etag_matches(request, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+
+    path = cached_report(key)
+    if path is None:
+        report_kwargs = collect_enrollment_report(db, school_year, semester)
+        path = render_enrollment_report(key, report_kwargs)
+
+    create_audit_log(
+        db, _admin, "REPORT_GENERATED",
+        details=f"SY: {school_year or 'all'}, Sem: {semester or 'all'}",
     )
-    by_enrollment_type = {
-        (et.value if hasattr(et, "value") else str(et)).replace("_", " ").title(): count
-        for et, count in et_rows
-    }
+    db.commit()
 
-    # Sex breakdown
-    sex_rows = (
-        base_q.with_entities(Student.sex, func.count(Student.id))
-        .filter(Student.sex.isnot(None))
-        .group_by(Student.sex)
-        .all()
+    return FileResponse(
+        path,
+        media_type="application/pdf",
+        filename=enrollment_report_filename(school_year, semester),
+        headers=headers,
     )
-    by_sex = {(s.value if hasattr(s, "value") else str(s)).title(): cnt for s, cnt in sex_rows}
-
-    # Payment status breakdown
-    pay_rows = (
-        base_q.with_entities(Student.payment_status, func.count(Student.id))
-        .filter(Student.payment_status.isnot(None))
-        .group_by(Student.payment_status)
-        .all()
+
+
+@router.get("/reports/enrollment/export")
+@limiter.limit("10/minute")
+def export_enrollment_report(
+    request: Request,
+    fmt: str = Query("csv", alias="format", pattern="^(csv|xlsx|parquet|arrow)$"),
+    dataset: str = Query("roster", pattern="^(roster|summary)$"),
+    school_year: str | None = Query(None),
+    semester: str | None = Query(None),
+    _admin: Principal = Depends(require_role(UserRole.ADMIN)),
+    db: Session = Depends(get_db),
+):
+    """Export the enrollment report's data for analysis. Filters are optional.
+
+    `dataset` picks the enrolled roster or the summary counts; an xlsx export
+    holds both as separate sheets.
+    """
+    create_audit_log(
+        db, _admin, "REPORT_EXPORTED",
+        details=f"{fmt}; SY: {school_year or 'all'}, Sem: {semester or 'all'}", durable=True,
     )
-    by_payment = {(p.value if hasattr(p, "value") else str(p)).replace("_", " ").title(): cnt
-                  for p, cnt in pay_rows}
-
-    # Fully enrolled = payment verified AND at least one subject assigned
-    enrolled_q = (
-        db.query(Student)
-        .filter(Student.payment_status == "verified")
-        .filter(
-            db.query(StudentSubject)
-            .filter(StudentSubject.student_id == Student.id)
-            .exists()
+    db.commit()
+
+    media_type, ext = EXPORT_FORMATS[fmt]
+    stem = enrollment_report_filename(school_year, semester).removesuffix(".pdf")
+    if fmt == "xlsx":
+        path = write_xlsx(db, school_year, semester)
+        return FileResponse(
+            path, media_type=media_type, filename=f"{stem}.{ext}", background=BackgroundTask(os.remove, path)
         )
-    )
-    if school_year:
-        enrolled_q = enrolled_q.filter(Student.school_year == school_year)
-    if semester:
-        enrolled_q = enrolled_q.filter(Student.semester == semester)
-
-    enrolled_students = enrolled_q.order_by(Student.last_name, Student.first_name).all()
-
-    school_cfg = _get_or_create_settings(db)
-
-    pdf_bytes = build_enrollment_report(
-        students=enrolled_students,
-        school_year=school_year,
-        semester=semester,
-        school_name=school_cfg.school_name or "",
-        total_count=total_count,
-        pending_count=pending_count,
-        approved_count=approved_count,
-        denied_count=denied_count,
-        enrolled_count=len(enrolled_students),
-        by_strand=by_strand,
-        by_grade_level=by_grade,
-        by_enrollment_type=by_enrollment_type,
-        by_sex=by_sex,
-        by_payment=by_payment,
+    return StreamingResponse(
+        iter_export(fmt, dataset, school_year, semester),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{stem}_{dataset}.{ext}"'},
     )
 
-    parts = ["enrollment_report"]
-    if school_year:
-        parts.append(school_year.replace("-", "_"))
-    if semester:
-        parts.append(semester.lower().replace(" ", "_"))
-    filename = "_".join(parts) + ".pdf"
 
+class ReportJobResponse(BaseModel):
+    id: str
+    kind: str
+    status: str
+    params: dict
+    filename: str
+    error: Optional[str]
+    created_at: datetime
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
+
+    class Config:
+        from_attributes = True
+
+
+def _get_report_job_or_404(job_id: str, db: Session) -> ReportJob:
+    job = db.get(ReportJob, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Report job not found")
+    return job
+
+
+@router.post("/reports/enrollment/jobs", response_model=ReportJobResponse, status_code=202)
+def submit_enrollment_report_job(
+    school_year: str | None = Query(None),
+    semester: str | None = Query(None),
+    _admin: Principal = Depends(require_role(UserRole.ADMIN)),
+    db: Session = Depends(get_db),
+):
+    """Queue an enrollment report for background rendering and return the job.
+
+    An identical request made shortly after an earlier one returns that job.
+    """
+    job, created = submit_enrollment_report(db, school_year, semester, _admin.id)
     create_audit_log(
         db, _admin, "REPORT_GENERATED",
         details=f"SY: {school_year or 'all'}, Sem: {semester or 'all'}",
     )
     db.commit()
+    if created:
+        start_job(job.id)
+    return job
 
-    return StreamingResponse(
-        BytesIO(pdf_bytes),
-        media_type="application/pdf",
-        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
-    )
+
+@router.get("/reports/jobs/{job_id}", response_model=ReportJobResponse)
+def get_report_job(
+    job_id: str,
+    _admin: Principal = Depends(require_role(UserRole.ADMIN)),
+    db: Session = Depends(get_db),
+):
+    return _get_report_job_or_404(job_id, db)
+
+
+@router.get("/reports/jobs/{job_id}/events")
+async def stream_report_job(
+    job_id: str,
+    _admin: Principal = Depends(require_role(UserRole.ADMIN)),
+):
+    """Server-sent events: one `data:` message per status change, ending when the job finishes.
+
+    The stream also closes after REPORT_JOB_STREAM_SECONDS; the client can
+    reconnect or fall back to polling the job.
+    """
+
+    def snapshot() -> ReportJobResponse | None:
+        with SessionLocal() as db:
+            job = db.get(ReportJob, job_id)
+            return ReportJobResponse.model_validate(job) if job else None
+
+    job = await run_in_threadpool(snapshot)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Report job not found")
+
+    async def events():
+        deadline = asyncio.get_running_loop().time() + settings.REPORT_JOB_STREAM_SECONDS
+        current, last_sent = job, None
+        while True:
+            if current != last_sent:
+                yield f"data: {current.model_dump_json()}\n\n"
+                last_sent = current
+            if current.status in (JOB_SUCCEEDED, JOB_FAILED):
+                return
+            if asyncio.get_running_loop().time() >= deadline:
+                yield "event: timeout\ndata: {}\n\n"
+                return
+            await asyncio.sleep(1)
+            current = await run_in_threadpool(snapshot) or current
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+
+@router.get("/reports/jobs/{job_id}/download")
+def download_report_job(
+    job_id: str,
+    request: Request,
+    _admin: Principal = Depends(require_role(UserRole.ADMIN)),
+    db: Session = Depends(get_db),
+):
+    job = _get_report_job_or_404(job_id, db)
+    if job.status != JOB_SUCCEEDED:
+        raise HTTPException(status_code=409, detail=f"Report is not ready (status: {job.status})")
+    if not job.file_path or not os.path.exists(job.file_path):
+        raise HTTPException(status_code=410, detail="Report file has expired. Please generate it again.")
+    # Cached reports are named by their cache key
+    key = os.path.splitext(os.path.basename(job.file_path))[0]
+    headers = {"ETag": report_etag(key), "Cache-Control": CACHE_PRIVATE_REVALIDATE}
+    if etag_matches(request, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    return FileResponse(job.file_path, media_type="application/pdf", filename=job.filename, headers=headers)
 
 
 # ── Announcements ─────────────────────────────────────────────────────────────
@@ -965,28 +1139,50 @@ class AnnouncementResponse(BaseModel):
         from_attributes = True
 
 
+def _load_announcements() -> tuple[tuple[list[AnnouncementResponse], dict], float | None]:
+    today = date.today()
+    db = SessionLocal()
+    try:
+        rows = (
+            db.query(Announcement)
+            .filter(
+                (Announcement.expires_at == None) | (Announcement.expires_at >= today)
+            )
+            .order_by(Announcement.is_pinned.desc(), Announcement.created_at.desc())
+            .all()
+        )
+        items = [AnnouncementResponse.model_validate(a) for a in rows]
+    finally:
+        db.close()
+    # Rebuild as soon as the first of these announcements expires
+    expiries = [a.expires_at for a in items if a.expires_at is not None]
+    valid_until = midnight_timestamp(min(expiries) + timedelta(days=1)) if expiries else None
+    # The dict collects rendered bodies per `limit` as they are requested
+    return (items, {}), valid_until
+
+
+# Invalidated by create_announcement and delete_announcement
+announcements_cache = SnapshotCache(_load_announcements)
+
+
 @router.get("/announcements", response_model=list[AnnouncementResponse])
 def list_announcements(
-    db: Session = Depends(get_db),
+    request: Request,
+    limit: int | None = Query(None, ge=1, le=50),
 ):
     """Public — returns all non-expired announcements (pinned first, then newest)."""
-    today = date.today()
-    items = (
-        db.query(Announcement)
-        .filter(
-            (Announcement.expires_at == None) | (Announcement.expires_at >= today)
-        )
-        .order_by(Announcement.is_pinned.desc(), Announcement.created_at.desc())
-        .all()
-    )
-    return items
+    items, rendered = announcements_cache.get()
+    feed = rendered.get(limit)
+    if feed is None:
+        feed = rendered[limit] = RenderedJSON.of(items[:limit])
+    return cached_json_response(request, feed.body, CACHE_PUBLIC_SHORT, feed.etag)
 
 
 @router.post("/announcements", response_model=AnnouncementResponse, status_code=201)
 def create_announcement(
     body: AnnouncementCreate,
     db: Session = Depends(get_db),
-    _admin: User = Depends(require_role("admin")),
+    _admin: Principal = Depends(require_role("admin")),
 ):
     ann = Announcement(
         title=body.title,
@@ -998,6 +1194,7 @@ def create_announcement(
     db.flush()
     create_audit_log(db, _admin, "ANNOUNCEMENT_POSTED", details=body.title)
     db.commit()
+    announcements_cache.invalidate()
     db.refresh(ann)
     return ann
 
@@ -1006,7 +1203,7 @@ def create_announcement(
 def delete_announcement(
     ann_id: int,
     db: Session = Depends(get_db),
-    _admin: User = Depends(require_role("admin")),
+    _admin: Principal = Depends(require_role("admin")),
 ):
     ann = db.query(Announcement).filter(Announcement.id == ann_id).first()
     if not ann:
@@ -1014,4 +1211,5 @@ def delete_announcement(
     create_audit_log(db, _admin, "ANNOUNCEMENT_DELETED", details=ann.title)
     db.delete(ann)
     db.commit()
+    announcements_cache.invalidate()
     return {"message": "Announcement deleted"}
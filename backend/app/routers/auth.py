@@ -1,79 +1,101 @@
 """Authentication endpoints: register, login, current user."""
 
+import uuid
+
 from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from slowapi import Limiter
-from slowapi.util import get_remote_address
 from pydantic import BaseModel
-from google.oauth2 import id_token
-from google.auth.transport import requests as google_requests
-import requests as http_requests
 
 from app.database import get_db
-from app.auth.jwt_handler import hash_password, verify_password, create_access_token
-from app.auth.dependencies import get_current_user
+from app.utils.rate_limit import limiter
+from app.auth.jwt_handler import (
+    create_access_token,
+    hash_password_async,
+    password_needs_rehash,
+    verify_password_async,
+)
+from app.auth.dependencies import Principal, get_current_principal, get_current_user
+from app.auth.google_tokens import verify_google_id_token
+from app.auth.session_store import session_store
 from app.models.user import User, UserRole
 from app.models.student import Student, StudentStatus
 from app.schemas.user import UserRegister, UserLogin, TokenResponse, UserResponse
 from app.config import settings
+from app.utils.metrics import timed
+from app.utils.turnstile import turnstile_verifier
 
 
-def verify_turnstile(token: str) -> bool:
-    """Verify a Cloudflare Turnstile token. Returns True if valid."""
-    if not settings.TURNSTILE_SECRET_KEY:
-        return True  # Skip verification if not configured
-    try:
-        resp = http_requests.post(
-            "https://challenges.cloudflare.com/turnstile/v0/siteverify",
-            data={"secret": settings.TURNSTILE_SECRET_KEY, "response": token},
-            timeout=5,
-        )
-        return resp.json().get("success", False)
-    except Exception:
-        return False
-
 router = APIRouter(prefix="/api/auth", tags=["Authentication"])
-limiter = Limiter(key_func=get_remote_address)
 
 
+def _email_registered(db: Session, email: str) -> bool:
+    return db.query(User.id).filter(User.email == email).first() is not None
+
+
+def _create_student_account(db: Session, email: str, password_hash: str) -> TokenResponse:
+    user = User(email=email, password_hash=password_hash, role=UserRole.STUDENT)
+    db.add(user)
+    db.flush()  # Get user.id before creating student
+
+    student = Student(
+        user_id=user.id,
+        status=StudentStatus.PENDING,
+    )
+    db.add(student)
+    token = create_access_token({"user_id": user.id, "role": user.role.value, "email": user.email})
+    db.commit()
+    return TokenResponse(access_token=token, role=UserRole.STUDENT.value)
+
+
+# register and login are async so they can await the bcrypt pool and Turnstile;
+# every database call in them goes through run_in_threadpool to keep the
+# blocking Session off the event loop.
 @router.post("/register", response_model=TokenResponse, status_code=status.HTTP_201_CREATED)
 @limiter.limit("5/minute")
-def register(request: Request, data: UserRegister, db: Session = Depends(get_db)):
+@timed("auth.register")
+async def register(request: Request, data: UserRegister, db: Session = Depends(get_db)):
     """Register a new student account. Creates user + pending student record."""
-    if not verify_turnstile(data.captcha_token):
+    client_ip = request.client.host if request.client else None
+    if not await turnstile_verifier.verify(data.captcha_token, client_ip):
         raise HTTPException(status_code=400, detail="Captcha verification failed. Please try again.")
-    existing = db.query(User).filter(User.email == data.email).first()
-    if existing:
+    if await run_in_threadpool(_email_registered, db, data.email):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered",
         )
 
-    user = User(
-        email=data.email,
-        password_hash=hash_password(data.password),
-        role=UserRole.STUDENT,
-    )
-    db.add(user)
-    db.flush()  # Get user.id before creating student
+    password_hash = await hash_password_async(data.password)
+    return await run_in_threadpool(_create_student_account, db, data.email, password_hash)
 
-    student = Student(
-        user_id=user.id,
-        status=StudentStatus.PENDING,
-    )
-    db.add(student)
+
+def _find_user(db: Session, email: str) -> User | None:
+    return db.query(User).filter(User.email == email).first()
+
+
+def _save_password_hash(db: Session, user: User, password_hash: str) -> None:
+    user.password_hash = password_hash
     db.commit()
 
-    token = create_access_token({"user_id": user.id, "role": user.role.value})
-    return TokenResponse(access_token=token, role=user.role.value)
+
+def _start_session(db: Session, user_id: int, token_id: str, force: bool) -> None:
+    if session_store.get_active_session(db, user_id) and not force:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="active_session",
+        )
+    # Replaces any previous session, so the old token stops working
+    session_store.set_active_session(db, user_id, token_id)
+    db.commit()
 
 
 @router.post("/login", response_model=TokenResponse)
 @limiter.limit("5/minute")
-def login(request: Request, data: UserLogin, db: Session = Depends(get_db)):
+@timed("auth.login")
+async def login(request: Request, data: UserLogin, db: Session = Depends(get_db)):
     """Login for all user roles. Returns a JWT access token."""
-    user = db.query(User).filter(User.email == data.email).first()
-    if not user or not user.password_hash or not verify_password(data.password, user.password_hash):
+    user = await run_in_threadpool(_find_user, db, data.email)
+    if not user or not user.password_hash or not await verify_password_async(data.password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password",
@@ -83,32 +105,33 @@ def login(request: Request, data: UserLogin, db: Session = Depends(get_db)):
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Account is deactivated",
         )
+    # Read before any commit below expires the instance
+    user_id, role, email = user.id, user.role, user.email
 
-    if user.role in (UserRole.ADMIN, UserRole.REGISTRAR):
-        if user.active_token and not data.force:
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail="active_session",
-            )
+    # BCRYPT_ROUNDS changed since this hash was made — upgrade it while we have the password
+    if password_needs_rehash(user.password_hash):
+        await run_in_threadpool(_save_password_hash, db, user, await hash_password_async(data.password))
 
-    token = create_access_token({"user_id": user.id, "role": user.role.value})
-    if user.role in (UserRole.ADMIN, UserRole.REGISTRAR):
-        user.active_token = token
-        db.commit()
-    return TokenResponse(access_token=token, role=user.role.value)
+    token_id = uuid.uuid4().hex
+    if role in (UserRole.ADMIN, UserRole.REGISTRAR):
+        await run_in_threadpool(_start_session, db, user_id, token_id, data.force)
+
+    token = create_access_token({"user_id": user_id, "role": role.value, "email": email, "jti": token_id})
+    return TokenResponse(access_token=token, role=role.value)
 
 
 @router.post("/logout")
-def logout(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+def logout(current_user: Principal = Depends(get_current_principal), db: Session = Depends(get_db)):
     """Invalidate the current session token."""
     if current_user.role in (UserRole.ADMIN, UserRole.REGISTRAR):
-        current_user.active_token = None
+        session_store.revoke_user_tokens(db, current_user.id)
         db.commit()
     return {"detail": "Logged out successfully"}
 
 
 class GoogleAuthRequest(BaseModel):
     credential: str  # Google ID token
+    force: bool = False  # Replace an active admin/registrar session, as in login
 
 
 @router.post("/google", response_model=TokenResponse)
@@ -118,11 +141,7 @@ def google_auth(data: GoogleAuthRequest, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail="Google OAuth is not configured")
 
     try:
-        id_info = id_token.verify_oauth2_token(
-            data.credential,
-            google_requests.Request(),
-            settings.GOOGLE_CLIENT_ID,
-        )
+        id_info = verify_google_id_token(data.credential, settings.GOOGLE_CLIENT_ID)
     except ValueError:
         raise HTTPException(status_code=401, detail="Invalid Google token")
 
@@ -154,7 +173,11 @@ def google_auth(data: GoogleAuthRequest, db: Session = Depends(get_db)):
         raise HTTPException(status_code=403, detail="Account is deactivated")
 
     db.commit()
-    token = create_access_token({"user_id": user.id, "role": user.role.value})
+    token_id = uuid.uuid4().hex
+    if user.role in (UserRole.ADMIN, UserRole.REGISTRAR):
+        _start_session(db, user.id, token_id, data.force)
+
+    token = create_access_token({"user_id": user.id, "role": user.role.value, "email": user.email, "jti": token_id})
     return TokenResponse(access_token=token, role=user.role.value)
 
 
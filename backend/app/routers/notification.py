@@ -5,8 +5,7 @@ from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from app.database import get_db
-from app.auth.dependencies import get_current_user
-from app.models.user import User
+from app.auth.dependencies import Principal, get_current_principal
 from app.models.notification import Notification
 from app.schemas.notification import (
     NotificationListResponse,
@@ -19,7 +18,7 @@ router = APIRouter(prefix="/api/notifications", tags=["Notifications"])
 
 @router.get("", response_model=NotificationListResponse)
 def list_notifications(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db),
 ):
     """List recent notifications for the current user with unread count."""
@@ -44,7 +43,7 @@ def list_notifications(
 
 @router.get("/unread-count", response_model=UnreadCountResponse)
 def get_unread_count(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db),
 ):
     """Lightweight endpoint for polling the unread notification count."""
@@ -59,7 +58,7 @@ def get_unread_count(
 
 @router.put("/read-all")
 def mark_all_read(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db),
 ):
     """Mark all notifications as read for the current user."""
@@ -73,7 +72,7 @@ def mark_all_read(
 @router.put("/{notification_id}/read")
 def mark_one_read(
     notification_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db),
 ):
     """Mark a single notification as read."""
@@ -7,21 +7,20 @@ import os
 from datetime import datetime, timezone
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
-from slowapi import Limiter
-from slowapi.util import get_remote_address
-from fastapi.responses import Response, StreamingResponse
+from fastapi.responses import FileResponse, Response, StreamingResponse
 from pydantic import BaseModel
-from sqlalchemy import func
-from sqlalchemy.orm import Session
+from sqlalchemy import func, insert
+from sqlalchemy.orm import Session, joinedload
 
 from app.config import settings
 from app.database import get_db
-from app.auth.dependencies import require_role
+from app.utils.rate_limit import limiter
+from app.auth.dependencies import Principal, require_role
 from app.models.user import User, UserRole
 from app.models.student import Student, StudentStatus
 from app.models.subject import Subject
 from app.models.student_subject import StudentSubject
-from app.schemas.student import StudentResponse, StudentListResponse, TransfereeCreditUpdate, EnrollmentRecordResponse
+from app.schemas.student import StudentResponse, StudentListView, TransfereeCreditUpdate, EnrollmentRecordResponse
 from app.schemas.subject import (
     SubjectCreate, SubjectUpdate, SubjectResponse, SubjectListResponse,
     AssignSubject, UnassignSubject, BulkAssignSubjects,
@@ -31,10 +30,16 @@ from app.models.notification import NotificationType
 from app.utils.notifications import create_notification
 from app.models.enrollment_record import EnrollmentRecord
 from app.utils.audit_log import create_audit_log
+from app.utils.enrollment_history import set_record_subjects, subjects_snapshot
+from app.utils.http_cache import CACHE_PRIVATE_REVALIDATE, etag_matches
+from app.utils.printables import (
+    class_list_query, prepare_class_list, prepare_enrollment_forms, render_class_list, render_enrollment_forms,
+)
+from app.utils.report_cache import report_etag
+from app.utils.serializers import student_list_response, student_page, student_to_response, with_student_email
 from app.utils.cloudinary_utils import delete_cloudinary_file, delete_student_files, clear_student_file_fields, download_cloudinary_file
 
 router = APIRouter(prefix="/api/registrar", tags=["Registrar"])
-limiter = Limiter(key_func=get_remote_address)
 
 
 def _generate_school_id(db: Session) -> str:
@@ -57,12 +62,10 @@ def _generate_school_id(db: Session) -> str:
     return f"DBTC-{next_seq}-{year_suffix}"
 
 
-def _student_to_response(student: Student) -> StudentResponse:
-    data = {c.name: getattr(student, c.name) for c in student.__table__.columns}
-    data["email"] = student.user.email if student.user else None
-    if data.get("documents_path") is None:
-        data["documents_path"] = []
-    return StudentResponse(**data)
+# Subject columns selected by list_subjects; enrolled_count is added per query
+SUBJECT_RESPONSE_COLUMNS = tuple(
+    getattr(Subject, name) for name in SubjectResponse.model_fields if name != "enrolled_count"
+)
 
 
 def _subject_to_response(subject: Subject, db: Session) -> SubjectResponse:
@@ -88,20 +91,25 @@ def _upsert_enrollment_record(student: Student, db: Session) -> None:
     """Create or update the enrollment record snapshot for a fully-enrolled student.
 
     Called after any subject assignment so that history is visible immediately
-    without waiting for the student to start re-enrolling.
+    without waiting for the student to start re-enrolling. Flushes pending
+    assignments, then reads them with their subjects in one query; the caller
+    commits.
     """
-    if student.payment_status != "verified" or not student.subjects:
+    if student.payment_status != "verified":
         return
 
-    snapshot = [
-        {
-            "subject_code": e.subject.subject_code,
-            "subject_name": e.subject.subject_name,
-            "schedule": e.subject.schedule,
-        }
-        for e in student.subjects
-        if e.subject
-    ]
+    db.flush()
+    enrollments = (
+        db.query(StudentSubject)
+        .options(joinedload(StudentSubject.subject))
+        .filter(StudentSubject.student_id == student.id)
+        .order_by(StudentSubject.id)
+        .all()
+    )
+    if not enrollments:
+        return
+
+    snapshot = subjects_snapshot(enrollments)
 
     # Find an existing record for this school_year + semester (current cycle)
     existing = db.query(EnrollmentRecord).filter(
@@ -110,10 +118,8 @@ def _upsert_enrollment_record(student: Student, db: Session) -> None:
         EnrollmentRecord.semester == student.semester,
     ).first()
 
-    if existing:
-        existing.subjects_snapshot = snapshot
-    else:
-        db.add(EnrollmentRecord(
+    if existing is None:
+        existing = EnrollmentRecord(
             student_id=student.id,
             school_year=student.school_year,
             semester=student.semester,
@@ -121,8 +127,9 @@ def _upsert_enrollment_record(student: Student, db: Session) -> None:
             strand=student.strand,
             enrollment_type=student.enrollment_type.value if student.enrollment_type else None,
             student_number=student.student_number,
-            subjects_snapshot=snapshot,
-        ))
+        )
+        db.add(existing)
+    set_record_subjects(db, existing, snapshot)
 
 
 # --- Class List ---
@@ -132,35 +139,70 @@ def get_class_list(
     strand: str,
     grade_level: str,
     semester: str | None = None,
-    _registrar: User = Depends(require_role(UserRole.REGISTRAR)),
+    _registrar: Principal = Depends(require_role(UserRole.REGISTRAR)),
     db: Session = Depends(get_db),
 ):
     """Return all officially enrolled students for a strand/grade, sorted A-Z by last name."""
-    query = db.query(Student).filter(
-        Student.status == StudentStatus.APPROVED,
-        Student.payment_status == "verified",
-        Student.strand == strand,
-        Student.grade_level_to_enroll == grade_level,
-    )
-    if semester:
-        query = query.filter(Student.semester == semester)
-    students = query.order_by(Student.last_name, Student.first_name).all()
-    return [_student_to_response(s) for s in students]
+    students = class_list_query(db, strand, grade_level, semester).options(with_student_email).all()
+    return [student_to_response(s) for s in students]
+
+
+def _pdf_file(request: Request, key: str, render, filename: str) -> Response:
+    headers = {"ETag": report_etag(key), "Cache-Control": CACHE_PRIVATE_REVALIDATE}
+    if etag_matches(request, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    return FileResponse(render(), media_type="application/pdf", filename=filename, headers=headers)
+
+
+@router.get("/class-list/pdf")
+def get_class_list_pdf(
+    request: Request,
+    strand: str,
+    grade_level: str,
+    semester: str | None = None,
+    _registrar: Principal = Depends(require_role(UserRole.REGISTRAR)),
+    db: Session = Depends(get_db),
+):
+    """The class list as a print-ready A4 PDF."""
+    key, kwargs = prepare_class_list(db, strand, grade_level, semester)
+    filename = re.sub(r"[^A-Za-z0-9]+", "_", f"class_list {strand} {grade_level} {semester or ''}").strip("_")
+    return _pdf_file(request, key, lambda: render_class_list(key, kwargs), f"{filename}.pdf")
+
+
+@router.get("/enrollment-forms/pdf")
+def get_enrollment_forms_pdf(
+    request: Request,
+    school_year: str | None = None,
+    semester: str | None = None,
+    grade_level: str | None = None,
+    strand: str | None = None,
+    _registrar: Principal = Depends(require_role(UserRole.REGISTRAR)),
+    db: Session = Depends(get_db),
+):
+    """Enrollment slips of every fully enrolled student matching the filters, one per page."""
+    batch = prepare_enrollment_forms(db, school_year, semester, grade_level, strand)
+    if not batch.forms:
+        raise HTTPException(status_code=404, detail="No fully enrolled students match these filters")
+    filename = re.sub(
+        r"[^A-Za-z0-9]+", "_", " ".join(filter(None, ["enrollment_forms", school_year, semester, grade_level, strand]))
+    ).strip("_")
+    return _pdf_file(request, batch.key, lambda: render_enrollment_forms(batch), f"{filename}.pdf")
 
 
 # --- Approved Students ---
 
-@router.get("/students/approved", response_model=StudentListResponse)
+@router.get("/students/approved", response_model=StudentListView)
 def list_approved_students(
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
+    view: str = Query("full", pattern="^(full|summary)$"),
     grade_level: str | None = None,
     strand: str | None = None,
     semester: str | None = None,
     payment_status: str | None = None,
     enrollment_type: str | None = None,
     search: str | None = None,
-    _registrar: User = Depends(require_role(UserRole.REGISTRAR)),
+    _registrar: Principal = Depends(require_role(UserRole.REGISTRAR)),
     db: Session = Depends(get_db),
 ):
     """List approved students with optional grade/strand/semester/payment_status/enrollment_type filters."""
@@ -188,21 +230,17 @@ def list_approved_students(
         )
 
     total = query.count()
-    students = query.order_by(Student.created_at.desc()).offset((page - 1) * per_page).limit(per_page).all()
+    students = student_page(query, view, (Student.created_at.desc(),), page, per_page)
 
-    return StudentListResponse(
-        students=[_student_to_response(s) for s in students],
-        total=total,
-        page=page,
-        per_page=per_page,
-    )
+    return student_list_response(students, view, total, page, per_page)
 
 
-@router.get("/students/pending-payments", response_model=StudentListResponse)
+@router.get("/students/pending-payments", response_model=StudentListView)
 def list_pending_payments(
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
-    _registrar: User = Depends(require_role(UserRole.REGISTRAR)),
+    view: str = Query("full", pattern="^(full|summary)$"),
+    _registrar: Principal = Depends(require_role(UserRole.REGISTRAR)),
     db: Session = Depends(get_db),
 ):
     """List approved students whose payment receipt is pending verification."""
@@ -211,19 +249,14 @@ def list_pending_payments(
         Student.payment_status == "pending_verification",
     )
     total = query.count()
-    students = query.order_by(Student.updated_at.desc()).offset((page - 1) * per_page).limit(per_page).all()
-    return StudentListResponse(
-        students=[_student_to_response(s) for s in students],
-        total=total,
-        page=page,
-        per_page=per_page,
-    )
+    students = student_page(query, view, (Student.updated_at.desc(),), page, per_page)
+    return student_list_response(students, view, total, page, per_page)
 
 
 @router.put("/students/{student_id}/verify-payment", response_model=MessageResponse)
 def verify_payment(
     student_id: int,
-    _registrar: User = Depends(require_role(UserRole.REGISTRAR)),
+    _registrar: Principal = Depends(require_role(UserRole.REGISTRAR)),
     db: Session = Depends(get_db),
 ):
     """Verify a student's payment receipt."""
@@ -272,7 +305,7 @@ class RejectPaymentRequest(BaseModel):
 def reject_payment(
     student_id: int,
     body: RejectPaymentRequest | None = None,
-    _registrar: User = Depends(require_role(UserRole.REGISTRAR)),
+    _registrar: Principal = Depends(require_role(UserRole.REGISTRAR)),
     db: Session = Depends(get_db),
 ):
     """Reject a student's payment receipt and reset to unpaid, with an optional reason."""
@@ -317,20 +350,20 @@ def reject_payment(
 @router.get("/students/{student_id}/complete-info", response_model=StudentResponse)
 def get_student_complete_info(
     student_id: int,
-    _registrar: User = Depends(require_role(UserRole.REGISTRAR)),
+    _registrar: Principal = Depends(require_role(UserRole.REGISTRAR)),
     db: Session = Depends(get_db),
 ):
     """View complete student registration form data."""
     student = db.query(Student).filter(Student.id == student_id).first()
     if not student:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Student not found")
-    return _student_to_response(student)
+    return student_to_response(student)
 
 
 @router.get("/students/{student_id}/enrollment-history", response_model=list[EnrollmentRecordResponse])
 def get_student_enrollment_history(
     student_id: int,
-    _registrar: User = Depends(require_role(UserRole.REGISTRAR)),
+    _registrar: Principal = Depends(require_role(UserRole.REGISTRAR)),
     db: Session = Depends(get_db),
 ):
     """Get enrollment history for a specific student, newest first."""
@@ -347,7 +380,7 @@ def get_student_enrollment_history(
 def download_student_files(
     request: Request,
     student_id: int,
-    _registrar: User = Depends(require_role(UserRole.REGISTRAR)),
+    _registrar: Principal = Depends(require_role(UserRole.REGISTRAR)),
     db: Session = Depends(get_db),
 ):
     """Download all uploaded files for a student as a ZIP archive."""
@@ -396,7 +429,7 @@ def proxy_student_file(
     request: Request,
     student_id: int,
     url: str = Query(...),
-    _registrar: User = Depends(require_role(UserRole.REGISTRAR)),
+    _registrar: Principal = Depends(require_role(UserRole.REGISTRAR)),
     db: Session = Depends(get_db),
 ):
     """Proxy a student file from Cloudinary with inline Content-Disposition for browser viewing."""
@@ -435,7 +468,7 @@ def proxy_student_file(
 @router.post("/subjects", response_model=SubjectResponse, status_code=status.HTTP_201_CREATED)
 def create_subject(
     data: SubjectCreate,
-    _registrar: User = Depends(require_role(UserRole.REGISTRAR)),
+    _registrar: Principal = Depends(require_role(UserRole.REGISTRAR)),
     db: Session = Depends(get_db),
 ):
     """Create a new subject."""
@@ -462,7 +495,7 @@ def list_subjects(
     semester: str | None = None,
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
-    _registrar: User = Depends(require_role(UserRole.REGISTRAR)),
+    _registrar: Principal = Depends(require_role(UserRole.REGISTRAR)),
     db: Session = Depends(get_db),
 ):
     """List subjects with optional filters and pagination."""
@@ -480,29 +513,18 @@ def list_subjects(
         .subquery()
     )
     rows = (
-        query.add_columns(func.coalesce(enrolled_subquery.c.enrolled_count, 0).label("enrolled_count"))
+        query.with_entities(
+            *SUBJECT_RESPONSE_COLUMNS,
+            func.coalesce(enrolled_subquery.c.enrolled_count, 0).label("enrolled_count"),
+        )
         .outerjoin(enrolled_subquery, Subject.id == enrolled_subquery.c.subject_id)
         .order_by(Subject.subject_code)
         .offset((page - 1) * per_page)
         .limit(per_page)
         .all()
     )
-    subjects_out = []
-    for subject, enrolled_count in rows:
-        subjects_out.append(SubjectResponse(
-            id=subject.id,
-            subject_code=subject.subject_code,
-            subject_name=subject.subject_name,
-            units=subject.units,
-            schedule=subject.schedule,
-            strand=subject.strand,
-            grade_level=subject.grade_level,
-            semester=subject.semester,
-            category=subject.category,
-            max_students=subject.max_students,
-            enrolled_count=enrolled_count,
-            created_at=subject.created_at,
-        ))
+    # Plain column rows validate straight into the schema; no ORM instances to build
+    subjects_out = [SubjectResponse.model_validate(row._mapping) for row in rows]
     return SubjectListResponse(
         subjects=subjects_out,
         total=total,
@@ -515,7 +537,7 @@ def list_subjects(
 def update_subject(
     subject_id: int,
     data: SubjectUpdate,
-    _registrar: User = Depends(require_role(UserRole.REGISTRAR)),
+    _registrar: Principal = Depends(require_role(UserRole.REGISTRAR)),
     db: Session = Depends(get_db),
 ):
     """Update an existing subject."""
@@ -550,7 +572,7 @@ def update_subject(
 @router.delete("/subjects/{subject_id}", response_model=MessageResponse)
 def delete_subject(
     subject_id: int,
-    _registrar: User = Depends(require_role(UserRole.REGISTRAR)),
+    _registrar: Principal = Depends(require_role(UserRole.REGISTRAR)),
     db: Session = Depends(get_db),
 ):
     """Delete a subject and all its enrollments."""
@@ -570,7 +592,7 @@ def delete_subject(
 @router.post("/assign-subject", response_model=MessageResponse, status_code=status.HTTP_201_CREATED)
 def assign_subject(
     data: AssignSubject,
-    _registrar: User = Depends(require_role(UserRole.REGISTRAR)),
+    _registrar: Principal = Depends(require_role(UserRole.REGISTRAR)),
     db: Session = Depends(get_db),
 ):
     """Assign a subject to a student. Validates strand/grade match and capacity."""
@@ -643,17 +665,16 @@ def assign_subject(
     if student.student_number:
         student_label = f"{student_label} ({student.student_number})"
     create_audit_log(db, _registrar, "SUBJECT_ASSIGNED", target_name=student_label, details=subject.subject_code)
-    db.commit()
-    db.refresh(student)
     _upsert_enrollment_record(student, db)
+    message = f"Student assigned to {subject.subject_code}"
     db.commit()
-    return MessageResponse(message=f"Student assigned to {subject.subject_code}")
+    return MessageResponse(message=message)
 
 
 @router.delete("/unassign-subject", response_model=MessageResponse)
 def unassign_subject(
     data: UnassignSubject,
-    _registrar: User = Depends(require_role(UserRole.REGISTRAR)),
+    _registrar: Principal = Depends(require_role(UserRole.REGISTRAR)),
     db: Session = Depends(get_db),
 ):
     """Remove a student from a subject."""
@@ -684,7 +705,7 @@ def unassign_subject(
 @router.get("/students/{student_id}/enrolled-subjects")
 def get_student_enrolled_subjects(
     student_id: int,
-    _registrar: User = Depends(require_role(UserRole.REGISTRAR)),
+    _registrar: Principal = Depends(require_role(UserRole.REGISTRAR)),
     db: Session = Depends(get_db),
 ):
     """Get the list of subject IDs a student is currently enrolled in."""
@@ -699,7 +720,7 @@ def get_student_enrolled_subjects(
 @router.post("/bulk-assign-subjects", response_model=MessageResponse, status_code=status.HTTP_201_CREATED)
 def bulk_assign_subjects(
     data: BulkAssignSubjects,
-    _registrar: User = Depends(require_role(UserRole.REGISTRAR)),
+    _registrar: Principal = Depends(require_role(UserRole.REGISTRAR)),
     db: Session = Depends(get_db),
 ):
     """Assign multiple subjects to a student at once."""
@@ -711,30 +732,40 @@ def bulk_assign_subjects(
     if student.payment_status != "verified":
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Student's payment must be verified before assigning subjects")
 
-    assigned_count = 0
-    for subject_id in data.subject_ids:
-        subject = db.query(Subject).filter(Subject.id == subject_id).first()
-        if not subject:
-            continue
-
-        # Skip if already enrolled
-        existing = db.query(StudentSubject).filter(
+    # Subjects, existing enrollments and current headcounts in three queries
+    subjects = {
+        subject.id: subject
+        for subject in db.query(Subject).filter(Subject.id.in_(data.subject_ids))
+    }
+    taken = {
+        subject_id
+        for (subject_id,) in db.query(StudentSubject.subject_id).filter(
             StudentSubject.student_id == data.student_id,
-            StudentSubject.subject_id == subject_id,
-        ).first()
-        if existing:
-            continue
+            StudentSubject.subject_id.in_(subjects),
+        )
+    }
+    enrolled_counts = dict(
+        db.query(StudentSubject.subject_id, func.count(StudentSubject.id))
+        .filter(StudentSubject.subject_id.in_(subjects))
+        .group_by(StudentSubject.subject_id)
+        .all()
+    )
 
-        # Check capacity
-        enrolled_count = db.query(func.count(StudentSubject.id)).filter(
-            StudentSubject.subject_id == subject_id
-        ).scalar() or 0
-        if enrolled_count >= subject.max_students:
+    new_enrollments = []
+    for subject_id in data.subject_ids:
+        subject = subjects.get(subject_id)
+        # Skip unknown subjects, ones already enrolled (or listed twice) and full ones
+        if not subject or subject_id in taken:
+            continue
+        if enrolled_counts.get(subject_id, 0) >= subject.max_students:
             continue
 
-        enrollment = StudentSubject(student_id=data.student_id, subject_id=subject_id)
-        db.add(enrollment)
-        assigned_count += 1
+        new_enrollments.append({"student_id": data.student_id, "subject_id": subject_id})
+        taken.add(subject_id)
+    assigned_count = len(new_enrollments)
+    if new_enrollments:
+        # One executemany; ORM adds would insert row by row where the driver can't batch RETURNING
+        db.execute(insert(StudentSubject), new_enrollments)
 
     if assigned_count > 0:
         # Notify student once for all subjects
@@ -749,8 +780,6 @@ def bulk_assign_subjects(
     if student.student_number:
         student_label = f"{student_label} ({student.student_number})"
     create_audit_log(db, _registrar, "BULK_SUBJECTS_ASSIGNED", target_name=student_label, details=f"{assigned_count} subject(s)")
-    db.commit()
-    db.refresh(student)
     _upsert_enrollment_record(student, db)
     db.commit()
     return MessageResponse(message=f"{assigned_count} subject(s) assigned successfully")
@@ -760,7 +789,7 @@ def bulk_assign_subjects(
 def update_transferee_credits(
     student_id: int,
     data: TransfereeCreditUpdate,
-    _registrar: User = Depends(require_role(UserRole.REGISTRAR)),
+    _registrar: Principal = Depends(require_role(UserRole.REGISTRAR)),
     db: Session = Depends(get_db),
 ):
     """Update credit statuses for a transferee student's previous school subjects."""
@@ -801,7 +830,7 @@ def update_transferee_credits(
 @router.get("/subjects/{subject_id}/students", response_model=list[StudentResponse])
 def list_subject_students(
     subject_id: int,
-    _registrar: User = Depends(require_role(UserRole.REGISTRAR)),
+    _registrar: Principal = Depends(require_role(UserRole.REGISTRAR)),
     db: Session = Depends(get_db),
 ):
     """List verified students enrolled in a subject, sorted alphabetically by last name."""
@@ -811,6 +840,7 @@ def list_subject_students(
 
     students = (
         db.query(Student)
+        .options(with_student_email)
         .join(StudentSubject, StudentSubject.student_id == Student.id)
         .filter(
             StudentSubject.subject_id == subject_id,
@@ -819,4 +849,4 @@ def list_subject_students(
         .order_by(Student.last_name, Student.first_name)
         .all()
     )
-    return [_student_to_response(s) for s in students]
+    return [student_to_response(s) for s in students]
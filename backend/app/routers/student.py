@@ -3,28 +3,30 @@
 from datetime import date, datetime, timezone
 
 from fastapi import APIRouter, Depends, HTTPException, Request, UploadFile, File, status
-from sqlalchemy.orm import Session
-from slowapi import Limiter
-from slowapi.util import get_remote_address
+from sqlalchemy.orm import Session, selectinload
 
 from app.database import get_db
-from app.auth.dependencies import require_role
+from app.utils.rate_limit import limiter
+from app.auth.dependencies import Principal, require_role
 from app.models.user import User, UserRole
 from app.models.student import Student, StudentStatus, SchoolType
 from app.schemas.student import StudentUpdate, StudentResponse, StudentStatusResponse, EnrollmentRecordResponse
 from app.models.enrollment_record import EnrollmentRecord
+from app.models.student_subject import StudentSubject
 from app.schemas.subject import EnrolledSubjectResponse
 from app.utils.file_upload import save_photo, save_document, save_receipt, save_grades, save_voucher, save_psa_birth_cert, save_transfer_credential, save_good_moral
 from app.models.notification import NotificationType
 from app.utils.notifications import create_notification
 from app.utils.audit_log import create_audit_log
+from app.utils.enrollment_history import set_record_subjects, subjects_snapshot
+from app.utils.http_cache import CACHE_PRIVATE_REVALIDATE, cached_json_response
+from app.utils.serializers import student_to_response
 
 router = APIRouter(prefix="/api/students", tags=["Student"])
-limiter = Limiter(key_func=get_remote_address)
 
 
-def _get_student_or_404(user: User, db: Session) -> Student:
-    student = db.query(Student).filter(Student.user_id == user.id).first()
+def _get_student_or_404(user: User, db: Session, *options) -> Student:
+    student = db.query(Student).options(*options).filter(Student.user_id == user.id).first()
     if not student:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Student profile not found")
     return student
@@ -42,16 +44,6 @@ def _should_archive(student: Student) -> bool:
 
 def _archive_enrollment(student: Student, db: Session) -> None:
     """Snapshot the current enrollment into enrollment_records then reset live state."""
-    snapshot = [
-        {
-            "subject_code": e.subject.subject_code,
-            "subject_name": e.subject.subject_name,
-            "schedule": e.subject.schedule,
-        }
-        for e in student.subjects
-        if e.subject
-    ]
-
     record = EnrollmentRecord(
         student_id=student.id,
         school_year=student.school_year,
@@ -60,9 +52,9 @@ def _archive_enrollment(student: Student, db: Session) -> None:
         strand=student.strand,
         enrollment_type=student.enrollment_type.value if student.enrollment_type else None,
         student_number=student.student_number,
-        subjects_snapshot=snapshot,
     )
     db.add(record)
+    set_record_subjects(db, record, subjects_snapshot(student.subjects))
 
     # Reset live enrollment state for the new cycle
     student.payment_status = "unpaid"
@@ -77,19 +69,10 @@ def _archive_enrollment(student: Student, db: Session) -> None:
         db.delete(enrollment)
 
 
-def _student_to_response(student: Student, email: str) -> StudentResponse:
-    data = {c.name: getattr(student, c.name) for c in student.__table__.columns}
-    data["email"] = email
-    # Ensure documents_path is a list
-    if data.get("documents_path") is None:
-        data["documents_path"] = []
-    return StudentResponse(**data)
-
-
 @router.get("/lookup/{student_number}", response_model=StudentResponse)
 def lookup_student(
     student_number: str,
-    current_user: User = Depends(require_role(UserRole.STUDENT)),
+    current_user: Principal = Depends(require_role(UserRole.STUDENT)),
     db: Session = Depends(get_db),
 ):
     """Look up a student by student number for re-enrollment.
@@ -109,17 +92,20 @@ def lookup_student(
             detail="This student number does not belong to your account",
         )
 
-    return _student_to_response(student, current_user.email)
+    return student_to_response(student, current_user.email)
 
 
 @router.get("/me", response_model=StudentResponse)
 def get_my_profile(
-    current_user: User = Depends(require_role(UserRole.STUDENT)),
+    request: Request,
+    current_user: Principal = Depends(require_role(UserRole.STUDENT)),
     db: Session = Depends(get_db),
 ):
     """Get the current student's complete profile."""
     student = _get_student_or_404(current_user, db)
-    return _student_to_response(student, current_user.email)
+    return cached_json_response(
+        request, student_to_response(student, current_user.email), CACHE_PRIVATE_REVALIDATE
+    )
 
 
 @router.put("/me", response_model=StudentResponse)
@@ -127,11 +113,14 @@ def get_my_profile(
 def update_my_profile(
     request: Request,
     data: StudentUpdate,
-    current_user: User = Depends(require_role(UserRole.STUDENT)),
+    current_user: Principal = Depends(require_role(UserRole.STUDENT)),
     db: Session = Depends(get_db),
 ):
     """Update the current student's profile with form data."""
-    student = _get_student_or_404(current_user, db)
+    # Subjects (with their Subject) are needed to check for and archive a completed cycle
+    student = _get_student_or_404(
+        current_user, db, selectinload(Student.subjects).joinedload(StudentSubject.subject)
+    )
 
     update_data = data.model_dump(exclude_unset=True)
 
@@ -189,7 +178,7 @@ def update_my_profile(
 
     db.commit()
     db.refresh(student)
-    return _student_to_response(student, current_user.email)
+    return student_to_response(student, current_user.email)
 
 
 @router.post("/me/photo", response_model=StudentResponse)
@@ -197,7 +186,7 @@ def update_my_profile(
 async def upload_photo(
     request: Request,
     file: UploadFile = File(...),
-    current_user: User = Depends(require_role(UserRole.STUDENT)),
+    current_user: Principal = Depends(require_role(UserRole.STUDENT)),
     db: Session = Depends(get_db),
 ):
     """Upload a student photo (jpg/png, max 5MB)."""
@@ -207,7 +196,7 @@ async def upload_photo(
     student.updated_at = datetime.now(timezone.utc)
     db.commit()
     db.refresh(student)
-    return _student_to_response(student, current_user.email)
+    return student_to_response(student, current_user.email)
 
 
 @router.post("/me/documents", response_model=StudentResponse)
@@ -215,7 +204,7 @@ async def upload_photo(
 async def upload_documents(
     request: Request,
     files: list[UploadFile] = File(...),
-    current_user: User = Depends(require_role(UserRole.STUDENT)),
+    current_user: Principal = Depends(require_role(UserRole.STUDENT)),
     db: Session = Depends(get_db),
 ):
     """Upload required documents (pdf/jpg/png, max 5MB each). Appends to existing documents."""
@@ -230,7 +219,7 @@ async def upload_documents(
     student.updated_at = datetime.now(timezone.utc)
     db.commit()
     db.refresh(student)
-    return _student_to_response(student, current_user.email)
+    return student_to_response(student, current_user.email)
 
 
 @router.post("/me/grades", response_model=StudentResponse)
@@ -238,7 +227,7 @@ async def upload_documents(
 async def upload_grades(
     request: Request,
     file: UploadFile = File(...),
-    current_user: User = Depends(require_role(UserRole.STUDENT)),
+    current_user: Principal = Depends(require_role(UserRole.STUDENT)),
     db: Session = Depends(get_db),
 ):
     """Upload grades from last school (pdf/jpg/png, max 5MB)."""
@@ -248,7 +237,7 @@ async def upload_grades(
     student.updated_at = datetime.now(timezone.utc)
     db.commit()
     db.refresh(student)
-    return _student_to_response(student, current_user.email)
+    return student_to_response(student, current_user.email)
 
 
 @router.post("/me/voucher", response_model=StudentResponse)
@@ -256,7 +245,7 @@ async def upload_grades(
 async def upload_voucher(
     request: Request,
     file: UploadFile = File(...),
-    current_user: User = Depends(require_role(UserRole.STUDENT)),
+    current_user: Principal = Depends(require_role(UserRole.STUDENT)),
     db: Session = Depends(get_db),
 ):
     """Upload voucher photo (pdf/jpg/png, max 5MB)."""
@@ -266,7 +255,7 @@ async def upload_voucher(
     student.updated_at = datetime.now(timezone.utc)
     db.commit()
     db.refresh(student)
-    return _student_to_response(student, current_user.email)
+    return student_to_response(student, current_user.email)
 
 
 @router.post("/me/psa-birth-cert", response_model=StudentResponse)
@@ -274,7 +263,7 @@ async def upload_voucher(
 async def upload_psa_birth_cert(
     request: Request,
     file: UploadFile = File(...),
-    current_user: User = Depends(require_role(UserRole.STUDENT)),
+    current_user: Principal = Depends(require_role(UserRole.STUDENT)),
     db: Session = Depends(get_db),
 ):
     """Upload PSA birth certificate soft copy (pdf/jpg/png, max 5MB)."""
@@ -284,7 +273,7 @@ async def upload_psa_birth_cert(
     student.updated_at = datetime.now(timezone.utc)
     db.commit()
     db.refresh(student)
-    return _student_to_response(student, current_user.email)
+    return student_to_response(student, current_user.email)
 
 
 @router.post("/me/transfer-credential", response_model=StudentResponse)
@@ -292,7 +281,7 @@ async def upload_psa_birth_cert(
 async def upload_transfer_credential(
     request: Request,
     file: UploadFile = File(...),
-    current_user: User = Depends(require_role(UserRole.STUDENT)),
+    current_user: Principal = Depends(require_role(UserRole.STUDENT)),
     db: Session = Depends(get_db),
 ):
     """Upload transfer credential / Form 137 (pdf/jpg/png, max 5MB)."""
@@ -302,7 +291,7 @@ async def upload_transfer_credential(
     student.updated_at = datetime.now(timezone.utc)
     db.commit()
     db.refresh(student)
-    return _student_to_response(student, current_user.email)
+    return student_to_response(student, current_user.email)
 
 
 @router.post("/me/good-moral", response_model=StudentResponse)
@@ -310,7 +299,7 @@ async def upload_transfer_credential(
 async def upload_good_moral(
     request: Request,
     file: UploadFile = File(...),
-    current_user: User = Depends(require_role(UserRole.STUDENT)),
+    current_user: Principal = Depends(require_role(UserRole.STUDENT)),
     db: Session = Depends(get_db),
 ):
     """Upload good moral certificate (pdf/jpg/png, max 5MB)."""
@@ -320,7 +309,7 @@ async def upload_good_moral(
     student.updated_at = datetime.now(timezone.utc)
     db.commit()
     db.refresh(student)
-    return _student_to_response(student, current_user.email)
+    return student_to_response(student, current_user.email)
 
 
 @router.post("/me/payment-receipt", response_model=StudentResponse)
@@ -328,7 +317,7 @@ async def upload_good_moral(
 async def upload_payment_receipt(
     request: Request,
     file: UploadFile = File(...),
-    current_user: User = Depends(require_role(UserRole.STUDENT)),
+    current_user: Principal = Depends(require_role(UserRole.STUDENT)),
     db: Session = Depends(get_db),
 ):
     """Upload a payment receipt photo (jpg/png, max 5MB). Only approved students can upload."""
@@ -359,14 +348,14 @@ async def upload_payment_receipt(
     create_audit_log(db, current_user, "RECEIPT_UPLOADED", target_name=receipt_label)
     db.commit()
     db.refresh(student)
-    return _student_to_response(student, current_user.email)
+    return student_to_response(student, current_user.email)
 
 
 @router.post("/me/payment-submit", response_model=StudentResponse)
 @limiter.limit("5/minute")
 def submit_payment_without_receipt(
     request: Request,
-    current_user: User = Depends(require_role(UserRole.STUDENT)),
+    current_user: Principal = Depends(require_role(UserRole.STUDENT)),
     db: Session = Depends(get_db),
 ):
     """Submit for payment verification without uploading a receipt. Only approved unpaid students."""
@@ -405,16 +394,18 @@ def submit_payment_without_receipt(
     create_audit_log(db, current_user, "PAYMENT_SUBMITTED_NO_RECEIPT", target_name=receipt_label)
     db.commit()
     db.refresh(student)
-    return _student_to_response(student, current_user.email)
+    return student_to_response(student, current_user.email)
 
 
 @router.get("/me/subjects", response_model=list[EnrolledSubjectResponse])
 def get_my_subjects(
-    current_user: User = Depends(require_role(UserRole.STUDENT)),
+    current_user: Principal = Depends(require_role(UserRole.STUDENT)),
     db: Session = Depends(get_db),
 ):
     """Get subjects the current student is enrolled in."""
-    student = _get_student_or_404(current_user, db)
+    student = _get_student_or_404(
+        current_user, db, selectinload(Student.subjects).joinedload(StudentSubject.subject)
+    )
     results = []
     for enrollment in student.subjects:
         subj = enrollment.subject
@@ -435,7 +426,7 @@ def get_my_subjects(
 
 @router.get("/me/enrollment-history", response_model=list[EnrollmentRecordResponse])
 def get_my_enrollment_history(
-    current_user: User = Depends(require_role(UserRole.STUDENT)),
+    current_user: Principal = Depends(require_role(UserRole.STUDENT)),
     db: Session = Depends(get_db),
 ):
     """Get the current student's archived enrollment history, newest first."""
@@ -445,7 +436,7 @@ def get_my_enrollment_history(
 
 @router.get("/me/status", response_model=StudentStatusResponse)
 def get_my_status(
-    current_user: User = Depends(require_role(UserRole.STUDENT)),
+    current_user: Principal = Depends(require_role(UserRole.STUDENT)),
     db: Session = Depends(get_db),
 ):
     """Check current application status (pending/approved/denied)."""
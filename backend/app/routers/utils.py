@@ -1,12 +1,15 @@
 """Utility endpoints — address lookups and strand listings."""
 
-from datetime import date
+from fastapi import APIRouter, Request
 
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-
-from app.database import get_db
-from app.models.academic_calendar import AcademicCalendar
+from app.utils.enrollment_status import enrollment_status_cache
+from app.utils.http_cache import (
+    CACHE_STATIC,
+    cached_json_response,
+    json_bytes,
+    public_cache_until,
+    weak_etag,
+)
 
 router = APIRouter(prefix="/api/utils", tags=["Utilities"])
 
@@ -76,11 +79,17 @@ STRANDS = [
     {"code": "PROG", "name": "Programming (TVL)"},
 ]
 
+# Static lists: render and tag once at import
+_PROVINCES_BODY = json_bytes({"provinces": sorted(PROVINCES_DATA.keys())})
+_PROVINCES_ETAG = weak_etag(_PROVINCES_BODY)
+_STRANDS_BODY = json_bytes({"strands": STRANDS})
+_STRANDS_ETAG = weak_etag(_STRANDS_BODY)
+
 
 @router.get("/provinces")
-def get_provinces():
+def get_provinces(request: Request):
     """List all available provinces."""
-    return {"provinces": sorted(PROVINCES_DATA.keys())}
+    return cached_json_response(request, _PROVINCES_BODY, CACHE_STATIC, _PROVINCES_ETAG)
 
 
 @router.get("/cities/{province}")
@@ -102,48 +111,13 @@ def get_barangays(city: str):
 
 
 @router.get("/strands")
-def get_strands():
+def get_strands(request: Request):
     """List all available Senior High School strands."""
-    return {"strands": STRANDS}
+    return cached_json_response(request, _STRANDS_BODY, CACHE_STATIC, _STRANDS_ETAG)
 
 
 @router.get("/enrollment-status")
-def get_enrollment_status(db: Session = Depends(get_db)):
+def get_enrollment_status(request: Request):
     """Public endpoint — returns whether enrollment is currently open."""
-    calendar = db.query(AcademicCalendar).first()
-    if not calendar:
-        return {
-            "is_open": False,
-            "school_year": None,
-            "semester": None,
-            "enrollment_start": None,
-            "enrollment_end": None,
-            "message": "Enrollment is currently closed.",
-        }
-
-    today = date.today()
-    # If admin manually toggled is_open, respect it.
-    # Additionally auto-close if today is outside the date range (when dates are set).
-    within_dates = True
-    if calendar.enrollment_start and calendar.enrollment_end:
-        within_dates = calendar.enrollment_start <= today <= calendar.enrollment_end
-
-    is_open = calendar.is_open and within_dates
-
-    if is_open:
-        msg = f"Enrollment is open for S.Y. {calendar.school_year} — {calendar.semester} Semester."
-    elif calendar.enrollment_start and today < calendar.enrollment_start:
-        msg = f"Enrollment opens on {calendar.enrollment_start.strftime('%B %d, %Y')}."
-    elif calendar.enrollment_end and today > calendar.enrollment_end:
-        msg = f"Enrollment closed on {calendar.enrollment_end.strftime('%B %d, %Y')}."
-    else:
-        msg = "Enrollment is currently closed."
-
-    return {
-        "is_open": is_open,
-        "school_year": calendar.school_year,
-        "semester": calendar.semester,
-        "enrollment_start": calendar.enrollment_start,
-        "enrollment_end": calendar.enrollment_end,
-        "message": msg,
-    }
+    status, changes_at = enrollment_status_cache.get()
+    return cached_json_response(request, status.body, public_cache_until(changes_at), status.etag)
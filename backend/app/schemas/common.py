@@ -16,3 +16,28 @@ class DashboardStats(BaseModel):
     by_strand: dict[str, int]
     by_sex: dict[str, int]
     by_enrollment_type: dict[str, int]
+
+
+class EnrollmentTrendCycle(BaseModel):
+    school_year: str
+    semester: str | None
+    closed: bool
+    total: int
+    by_strand: dict[str, int]
+    by_grade_level: dict[str, int]
+    by_subject: dict[str, int]
+
+
+class EnrollmentTrends(BaseModel):
+    cycles: list[EnrollmentTrendCycle]
+
+
+class SubjectTrendCycle(BaseModel):
+    school_year: str
+    semester: str | None
+    students: int
+
+
+class SubjectTrend(BaseModel):
+    subject_code: str
+    cycles: list[SubjectTrendCycle]
@@ -2,6 +2,8 @@
 
 import re
 from datetime import date, datetime
+from typing import Annotated, Literal
+
 from pydantic import BaseModel, Field, field_validator, model_validator
 
 
@@ -233,12 +235,52 @@ class TransfereeCreditUpdate(BaseModel):
 class StudentListResponse(BaseModel):
     """Paginated list of students."""
 
+    view: Literal["full"] = "full"
     students: list[StudentResponse]
     total: int
     page: int
     per_page: int
 
 
+class StudentSummaryResponse(BaseModel):
+    """Slim student row for list grids (`view=summary`)."""
+
+    id: int
+    user_id: int
+    student_number: str | None = None
+    status: str
+    enrollment_type: str | None = None
+    school_year: str | None = None
+    semester: str | None = None
+    grade_level_to_enroll: str | None = None
+    strand: str | None = None
+    student_photo_path: str | None = None
+    last_name: str | None = None
+    first_name: str | None = None
+    middle_name: str | None = None
+    payment_status: str = "unpaid"
+    created_at: datetime
+    updated_at: datetime
+    email: str | None = None
+
+    model_config = {"from_attributes": True}
+
+
+class StudentSummaryListResponse(BaseModel):
+    """Paginated list of student summaries."""
+
+    view: Literal["summary"] = "summary"
+    students: list[StudentSummaryResponse]
+    total: int
+    page: int
+    per_page: int
+
+
+# response_model of listings with a `view` parameter; the tag picks the schema,
+# so a summary page is validated against the slim schema only
+StudentListView = Annotated[StudentListResponse | StudentSummaryListResponse, Field(discriminator="view")]
+
+
 class StudentStatusResponse(BaseModel):
     student_number: str | None = None
     status: str
@@ -1,17 +1,180 @@
-"""Utility for creating audit log entries."""
+"""Utility for creating audit log entries.
 
+Entries are normally handed to a background sink that inserts them in batches
+once the caller's transaction commits, which keeps the extra INSERT off the
+request's critical path. Compliance-critical actions (and any call made while
+the sink is not running, e.g. from seed scripts) are written synchronously
+inside the caller's transaction instead.
+"""
+
+import logging
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+
+from sqlalchemy import event, insert
+
+from app.config import settings
+from app.database import SessionLocal
 from app.models.audit_log import AuditLog
 
+logger = logging.getLogger(__name__)
+
+# Actions that must never be lost — always written in the caller's transaction.
+DURABLE_ACTIONS = {
+    "ACCOUNT_CREATED",
+    "ACCOUNT_DELETED",
+    "PASSWORD_RESET",
+    "STUDENT_DELETED",
+    "PAYMENT_VERIFIED",
+    "PAYMENT_REJECTED",
+}
+
+_PENDING_KEY = "pending_audit_logs"
+
+
+class AuditLogSink:
+    """Bounded in-memory queue drained by a background thread in batches."""
+
+    def __init__(self, max_queue_size: int, batch_size: int, flush_interval: float):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: queue.Queue[dict] = queue.Queue(maxsize=max_queue_size)
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.batches = 0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="audit-log-sink", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Stop the worker after draining whatever is still queued."""
+        if not self.running:
+            return
+        self._stop.set()
+        self._thread.join(timeout)
+        self._thread = None
+
+    def put(self, entry: dict) -> None:
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            logger.error("Audit log queue full — dropped %s entry for %s", entry["action"], entry["user_email"])
+            return
+        with self._lock:
+            self.enqueued += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "running": self.running,
+                "queue_depth": self._queue.qsize(),
+                "queue_capacity": self._queue.maxsize,
+                "enqueued": self.enqueued,
+                "written": self.written,
+                "dropped": self.dropped,
+                "batches": self.batches,
+            }
+
+    def _next_batch(self) -> list[dict]:
+        """Gather up to batch_size entries, waiting at most flush_interval.
+
+        Returns early once the batch is full or the queue stays empty until the
+        deadline, so the batch may be empty; _run checks the stop flag between calls.
+        """
+        batch: list[dict] = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=timeout))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while not (self._stop.is_set() and self._queue.empty()):
+            batch = self._next_batch()
+            if batch:
+                self._write(batch)
+
+    def _write(self, batch: list[dict]) -> None:
+        db = SessionLocal()
+        try:
+            db.execute(insert(AuditLog), batch)
+            db.commit()
+            with self._lock:
+                self.written += len(batch)
+                self.batches += 1
+        except Exception:
+            db.rollback()
+            with self._lock:
+                self.dropped += len(batch)
+            logger.exception("Failed to write batch of %d audit log entries", len(batch))
+        finally:
+            db.close()
+
+
+audit_sink = AuditLogSink(
+    max_queue_size=settings.AUDIT_LOG_QUEUE_SIZE,
+    batch_size=settings.AUDIT_LOG_BATCH_SIZE,
+    flush_interval=settings.AUDIT_LOG_FLUSH_INTERVAL,
+)
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _enqueue_pending_logs(session) -> None:
+    for entry in session.info.pop(_PENDING_KEY, []):
+        audit_sink.put(entry)
+
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _discard_pending_logs(session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+def create_audit_log(
+    db,
+    user,
+    action: str,
+    target_name: str | None = None,
+    details: str | None = None,
+    durable: bool = False,
+) -> None:
+    """Record an audit log entry for the caller's transaction.
 
-def create_audit_log(db, user, action: str, target_name: str | None = None, details: str | None = None) -> None:
-    """Create an audit log entry within the caller's transaction (uses flush, not commit)."""
-    log = AuditLog(
-        user_id=user.id,
-        user_email=user.email,
-        user_role=user.role.value,
-        action=action,
-        target_name=target_name,
-        details=details,
-    )
-    db.add(log)
-    db.flush()
+    Durable entries are added and flushed like any other row; the rest are
+    queued for the background sink once the caller commits (and discarded if
+    it rolls back).
+    """
+    entry = {
+        "user_id": user.id,
+        "user_email": user.email,
+        "user_role": user.role.value,
+        "action": action,
+        "target_name": target_name,
+        "details": details,
+        "created_at": datetime.now(timezone.utc),
+    }
+    if durable or action in DURABLE_ACTIONS or not audit_sink.running:
+        db.add(AuditLog(**entry))
+        db.flush()
+        return
+    db.info.setdefault(_PENDING_KEY, []).append(entry)
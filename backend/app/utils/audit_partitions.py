@@ -0,0 +1,131 @@
+"""Monthly range-partition maintenance for the audit_logs table (PostgreSQL only)."""
+
+import logging
+import re
+from datetime import date
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+logger = logging.getLogger(__name__)
+
+_PARTITION_RE = re.compile(r"^audit_logs_y(\d{4})m(\d{2})$")
+# pg_advisory_xact_lock key serializing partition maintenance across workers
+_MAINTENANCE_LOCK = 7_242_001
+
+
+def _add_months(month: date, n: int) -> date:
+    idx = month.year * 12 + (month.month - 1) + n
+    return date(idx // 12, idx % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"audit_logs_y{month.year:04d}m{month.month:02d}"
+
+
+def list_audit_partitions(conn: Connection) -> list[str]:
+    """Return the names of all partitions currently attached to audit_logs."""
+    rows = conn.execute(text(
+        "SELECT c.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid "
+        "JOIN pg_class p ON p.oid = i.inhparent "
+        "WHERE p.relname = 'audit_logs' ORDER BY c.relname"
+    )).scalars().all()
+    return list(rows)
+
+
+def _month_bounds(month: date) -> tuple[date, date]:
+    start = month.replace(day=1)
+    return start, _add_months(start, 1)
+
+
+def create_month_partition(conn: Connection, month: date) -> str:
+    """Create the partition holding rows for the calendar month of `month` (idempotent).
+
+    PostgreSQL refuses to create a partition while DEFAULT holds rows in its
+    range (e.g. a month that started before maintenance ran). In that case
+    DEFAULT is detached, the partition created, those rows moved into it and
+    DEFAULT reattached, all in the caller's transaction.
+    """
+    start, end = _month_bounds(month)
+    name = partition_name(start)
+    if name in list_audit_partitions(conn):
+        return name
+
+    in_range = f"created_at >= '{start.isoformat()}' AND created_at < '{end.isoformat()}'"
+    has_default = "audit_logs_default" in list_audit_partitions(conn)
+    stranded = has_default and conn.execute(text(
+        f"SELECT EXISTS (SELECT 1 FROM audit_logs_default WHERE {in_range})"
+    )).scalar()
+
+    if stranded:
+        conn.execute(text("ALTER TABLE audit_logs DETACH PARTITION audit_logs_default"))
+    conn.execute(text(
+        f"CREATE TABLE {name} PARTITION OF audit_logs "
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    ))
+    if stranded:
+        moved = conn.execute(text(
+            f"WITH moved AS (DELETE FROM audit_logs_default WHERE {in_range} RETURNING *) "
+            f"INSERT INTO {name} SELECT * FROM moved"
+        )).rowcount
+        conn.execute(text("ALTER TABLE audit_logs ATTACH PARTITION audit_logs_default DEFAULT"))
+        logger.warning("Moved %d audit log rows from DEFAULT into new partition %s", moved, name)
+    return name
+
+
+def ensure_audit_partitions(engine: Engine, months_ahead: int = 3) -> list[str]:
+    """Make sure partitions exist for the current month and the next `months_ahead`.
+
+    Also creates the DEFAULT partition so inserts never fail outright. Each
+    partition is created in its own transaction, under an advisory lock so
+    concurrent workers take turns; a month that fails is logged and skipped
+    without undoing the others, and is retried on the next run. Returns the
+    partitions that are in place. No-op on non-PostgreSQL databases.
+    """
+    if engine.dialect.name != "postgresql":
+        return []
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE IF NOT EXISTS audit_logs_default PARTITION OF audit_logs DEFAULT"))
+
+    this_month = date.today().replace(day=1)
+    ensured = []
+    for n in range(months_ahead + 1):
+        month = _add_months(this_month, n)
+        try:
+            with engine.begin() as conn:
+                conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _MAINTENANCE_LOCK})
+                ensured.append(create_month_partition(conn, month))
+        except Exception:
+            logger.exception("Could not create audit log partition %s", partition_name(month))
+    return ensured
+
+
+def detach_audit_partition(conn: Connection, month: date, drop: bool = False) -> str:
+    """Detach the partition for `month` so it can be archived (or dropped) separately.
+
+    The detached table keeps its name and data; queries against audit_logs
+    stop seeing those rows immediately.
+    """
+    name = partition_name(month.replace(day=1))
+    if name not in list_audit_partitions(conn):
+        raise ValueError(f"Partition {name} is not attached to audit_logs")
+    conn.execute(text(f"ALTER TABLE audit_logs DETACH PARTITION {name}"))
+    if drop:
+        conn.execute(text(f"DROP TABLE {name}"))
+    logger.info("Detached audit log partition %s%s", name, " (dropped)" if drop else "")
+    return name
+
+
+def detach_partitions_before(conn: Connection, cutoff: date, drop: bool = False) -> list[str]:
+    """Detach every monthly partition that ends on or before the month of `cutoff`."""
+    cutoff_month = cutoff.replace(day=1)
+    detached = []
+    for name in list_audit_partitions(conn):
+        m = _PARTITION_RE.match(name)
+        if not m:
+            continue
+        month = date(int(m.group(1)), int(m.group(2)), 1)
+        if month < cutoff_month:
+            detached.append(detach_audit_partition(conn, month, drop=drop))
+    return detached
@@ -0,0 +1,73 @@
+"""In-process snapshot caches for small, read-mostly public data.
+
+A SnapshotCache holds one value built by a loader. The loader also says how
+long the value stays correct (e.g. until an enrollment date is reached), and
+every snapshot is capped at PUBLIC_CACHE_TTL_SECONDS. Writers call
+`invalidate()` after they commit. That takes effect at once in the writing
+process; other workers pick the change up within the TTL cap.
+"""
+
+import threading
+import time
+from datetime import date, datetime, time as dtime
+from typing import Callable, Generic, NamedTuple, TypeVar
+
+from app.config import settings
+from app.utils.http_cache import json_bytes, weak_etag
+
+T = TypeVar("T")
+
+
+def midnight_timestamp(day: date) -> float:
+    """Unix timestamp of local midnight at the start of `day`, for date-based expiry."""
+    return datetime.combine(day, dtime.min).timestamp()
+
+
+class RenderedJSON(NamedTuple):
+    """A response body rendered once, with its ETag, for cached_json_response."""
+
+    body: bytes
+    etag: str
+
+    @classmethod
+    def of(cls, content) -> "RenderedJSON":
+        body = json_bytes(content)
+        return cls(body, weak_etag(body))
+
+
+class SnapshotCache(Generic[T]):
+    """One lazily built value, rebuilt after invalidate() or once it expires.
+
+    `loader` returns `(value, valid_until)`, where valid_until is a Unix
+    timestamp or None. Only one thread rebuilds at a time; concurrent callers
+    wait for that rebuild instead of all hitting the database.
+    """
+
+    def __init__(self, loader: Callable[[], tuple[T, float | None]], max_age: float | None = None):
+        self._loader = loader
+        self._max_age = settings.PUBLIC_CACHE_TTL_SECONDS if max_age is None else max_age
+        self._lock = threading.Lock()
+        self._value: T | None = None
+        self._expires_at = 0.0
+        self._generation = 0
+
+    def get(self) -> T:
+        if time.time() < self._expires_at:
+            return self._value
+        with self._lock:
+            now = time.time()
+            if now < self._expires_at:
+                return self._value
+            generation = self._generation
+            value, valid_until = self._loader()
+            expires_at = now + self._max_age
+            if valid_until is not None:
+                expires_at = min(expires_at, valid_until)
+            # An invalidate() during the load means the value may already be stale
+            if generation == self._generation:
+                self._value, self._expires_at = value, expires_at
+            return value
+
+    def invalidate(self) -> None:
+        self._generation += 1
+        self._expires_at = 0.0
@@ -0,0 +1,53 @@
+"""Subject snapshots for enrollment records, kept as JSON and as rows.
+
+The JSON `subjects_snapshot` is what the history views show; the
+enrollment_record_subjects rows hold the same subjects for queries by subject
+or cycle. Both are always written together through set_record_subjects,
+with plain bulk statements rather than ORM objects.
+"""
+
+from typing import Iterable
+
+from sqlalchemy import delete, insert
+from sqlalchemy.orm import Session
+
+from app.models.enrollment_record import EnrollmentRecord
+from app.models.enrollment_record_subject import EnrollmentRecordSubject
+from app.models.student_subject import StudentSubject
+
+
+def subjects_snapshot(enrollments: Iterable[StudentSubject]) -> list[dict]:
+    """Enrolled subjects as [{subject_code, subject_name, schedule}].
+
+    Load `enrollments` with their `subject` eagerly; otherwise each one costs
+    a query here.
+    """
+    return [
+        {
+            "subject_code": e.subject.subject_code,
+            "subject_name": e.subject.subject_name,
+            "schedule": e.subject.schedule,
+        }
+        for e in enrollments
+        if e.subject
+    ]
+
+
+def set_record_subjects(db: Session, record: EnrollmentRecord, snapshot: list[dict]) -> None:
+    """Store `snapshot` on the record, replacing its subject rows with bulk statements.
+
+    The record must already be in the session; it is flushed so a new one
+    gets its id.
+    """
+    is_new = record.id is None
+    record.subjects_snapshot = snapshot
+    db.flush()
+    if not is_new:
+        db.execute(
+            delete(EnrollmentRecordSubject).where(EnrollmentRecordSubject.enrollment_record_id == record.id)
+        )
+    if snapshot:
+        db.execute(
+            insert(EnrollmentRecordSubject),
+            [{"enrollment_record_id": record.id, **subject} for subject in snapshot],
+        )
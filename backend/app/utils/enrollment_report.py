@@ -0,0 +1,104 @@
+"""Data for the enrollment PDF report, gathered as plain picklable values.
+
+The report is rendered in a separate process (see report_jobs), so everything
+build_enrollment_report needs is collected here up front: counts, breakdowns
+and the enrolled roster as lightweight rows (see report_queries) instead of
+ORM objects.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+from io import BytesIO
+from urllib.parse import urlparse
+
+from reportlab.lib.utils import ImageReader
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.school_settings import SchoolSettings
+from app.utils.cloudinary_utils import download_cloudinary_file
+from app.utils.report_queries import ReportStudent, breakdowns, enrolled_roster_query, status_counts
+
+logger = logging.getLogger(__name__)
+
+_logo_lock = threading.Lock()
+
+
+def enrollment_report_filename(school_year: str | None, semester: str | None) -> str:
+    parts = ["enrollment_report"]
+    if school_year:
+        parts.append(school_year.replace("-", "_"))
+    if semester:
+        parts.append(semester.lower().replace(" ", "_"))
+    return "_".join(parts) + ".pdf"
+
+
+def cached_school_logo(url: str | None) -> str | None:
+    """Local copy of the uploaded school logo, downloaded once and kept under REPORT_DIR.
+
+    Uploads get a new URL, so the URL alone identifies the file. Returns None
+    (use the bundled logo) when there is no upload or it cannot be fetched.
+    """
+    if not url:
+        return None
+    ext = os.path.splitext(urlparse(url).path)[1].lower() or ".img"
+    path = os.path.join(settings.REPORT_DIR, "assets", hashlib.sha256(url.encode()).hexdigest()[:32] + ext)
+    if os.path.exists(path):
+        return path
+    with _logo_lock:
+        if os.path.exists(path):
+            return path
+        data = download_cloudinary_file(url)
+        if not data:
+            return None
+        try:
+            ImageReader(BytesIO(data)).getSize()
+        except Exception:
+            logger.warning("School logo at %s is not a readable image", url)
+            return None
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    return path
+
+
+def school_identity(db: Session) -> tuple[str, str | None]:
+    """School name and local logo path for printed documents."""
+    school_cfg = db.query(SchoolSettings.school_name, SchoolSettings.school_logo_url).filter(
+        SchoolSettings.id == 1
+    ).first()
+    school_name, logo_url = school_cfg if school_cfg else ("", None)
+    return school_name or "", cached_school_logo(logo_url)
+
+
+def collect_enrollment_report(db: Session, school_year: str | None, semester: str | None) -> dict:
+    """Return the keyword arguments for build_enrollment_report. Filters are optional."""
+    counts = status_counts(db, school_year, semester)
+    by = breakdowns(db, school_year, semester)
+    enrolled_students = [
+        ReportStudent(*row) for row in enrolled_roster_query(db, school_year, semester)
+    ]
+
+    school_name, logo_path = school_identity(db)
+
+    return dict(
+        students=enrolled_students,
+        school_year=school_year,
+        semester=semester,
+        school_name=school_name,
+        logo_path=logo_path,
+        total_count=counts.total,
+        pending_count=counts.pending,
+        approved_count=counts.approved,
+        denied_count=counts.denied,
+        enrolled_count=len(enrolled_students),
+        by_strand=by["strand"],
+        by_grade_level=by["grade_level"],
+        by_enrollment_type=by["enrollment_type"],
+        by_sex=by["sex"],
+        by_payment=by["payment_status"],
+    )
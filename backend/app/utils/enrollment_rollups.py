@@ -0,0 +1,196 @@
+"""Enrollment rollups: student counts kept per (cycle, category) combination.
+
+Dashboards, reports and trends read these few hundred rows instead of
+aggregating the whole students table. The counts are maintained in the same
+transaction as the student change: after every flush, each Student that was
+added, deleted or had a key column changed moves one count from its old
+rollup row to its new one. Any change made outside the ORM (raw SQL, manual
+fixes) is not seen; `python manage_enrollment_rollups.py rebuild` recomputes
+the table from students, and `check` reports any drift.
+"""
+
+import enum
+from collections import Counter
+from datetime import datetime, timezone
+
+from sqlalchemy import String, cast, delete, event, func, inspect, select, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.models.enrollment_rollup import EnrollmentRollup
+from app.models.student import Student
+
+# Rollup column -> Student attribute
+ROLLUP_KEYS = {
+    "school_year": "school_year",
+    "semester": "semester",
+    "strand": "strand",
+    "grade_level": "grade_level_to_enroll",
+    "sex": "sex",
+    "enrollment_type": "enrollment_type",
+    "status": "status",
+    "payment_status": "payment_status",
+}
+KEY_COLUMNS = tuple(ROLLUP_KEYS)
+
+RollupKey = tuple[str, ...]
+
+
+def _stored(value) -> str:
+    """A Student value as stored in a rollup key: enum name, '' for missing."""
+    if value is None:
+        return ""
+    if isinstance(value, enum.Enum):
+        return value.name
+    return str(value)
+
+
+def _key(values: dict) -> RollupKey:
+    return tuple(_stored(values[attr]) for attr in ROLLUP_KEYS.values())
+
+
+def _old_and_new_keys(student: Student) -> tuple[RollupKey, RollupKey]:
+    state = inspect(student)
+    old, new = {}, {}
+    for attr in ROLLUP_KEYS.values():
+        history = state.attrs[attr].history
+        new[attr] = history.added[0] if history.added else state.attrs[attr].value
+        if history.deleted:
+            old[attr] = history.deleted[0]
+        elif history.unchanged:
+            old[attr] = history.unchanged[0]
+        else:
+            old[attr] = new[attr]
+    return _key(old), _key(new)
+
+
+def student_deltas(session: Session) -> Counter:
+    """Rollup count changes implied by the Student rows this flush writes."""
+    deltas: Counter = Counter()
+    for obj in session.new:
+        if isinstance(obj, Student):
+            deltas[_key({attr: getattr(obj, attr) for attr in ROLLUP_KEYS.values()})] += 1
+    for obj in session.deleted:
+        if isinstance(obj, Student):
+            deltas[_old_and_new_keys(obj)[0]] -= 1
+    for obj in session.dirty:
+        if isinstance(obj, Student) and session.is_modified(obj, include_collections=False):
+            old, new = _old_and_new_keys(obj)
+            if old != new:
+                deltas[old] -= 1
+                deltas[new] += 1
+    return Counter({key: n for key, n in deltas.items() if n})
+
+
+def _insert_for(conn: Connection):
+    dialect = postgresql if conn.dialect.name == "postgresql" else sqlite
+    return dialect.insert(EnrollmentRollup)
+
+
+def apply_deltas(conn: Connection, deltas: Counter) -> None:
+    """Add `deltas` to the rollup rows, creating rows as needed.
+
+    Keys are applied in sorted order so concurrent writers lock rows in the
+    same order.
+    """
+    now = datetime.now(timezone.utc)
+    stmt = _insert_for(conn)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(KEY_COLUMNS),
+        set_={
+            "student_count": EnrollmentRollup.student_count + stmt.excluded.student_count,
+            "updated_at": stmt.excluded.updated_at,
+        },
+    )
+    for key in sorted(deltas):
+        conn.execute(stmt.values(**dict(zip(KEY_COLUMNS, key)), student_count=deltas[key], updated_at=now))
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def _update_rollups(session, flush_context) -> None:
+    deltas = student_deltas(session)
+    if deltas:
+        apply_deltas(session.connection(), deltas)
+
+
+# ── Rebuild and check ─────────────────────────────────────────────────
+
+def live_counts(conn: Connection) -> Counter:
+    """Counts per rollup key aggregated from the students table."""
+    columns = [
+        func.coalesce(cast(getattr(Student, attr), String), "").label(name)
+        for name, attr in ROLLUP_KEYS.items()
+    ]
+    rows = conn.execute(select(*columns, func.count(Student.id)).group_by(*columns))
+    return Counter({tuple(row[:-1]): row[-1] for row in rows})
+
+
+def stored_counts(conn: Connection) -> Counter:
+    rows = conn.execute(
+        select(*(getattr(EnrollmentRollup, c) for c in KEY_COLUMNS), EnrollmentRollup.student_count)
+        .where(EnrollmentRollup.student_count != 0)
+    )
+    return Counter({tuple(row[:-1]): row[-1] for row in rows})
+
+
+def rebuild_rollups(conn: Connection) -> int:
+    """Recompute every rollup row from students. Returns the number of rows written.
+
+    On PostgreSQL the table is locked for the rebuild, so student changes
+    committed meanwhile wait and then apply on top of the fresh counts.
+    """
+    if conn.dialect.name == "postgresql":
+        conn.execute(text("LOCK TABLE enrollment_rollups IN EXCLUSIVE MODE"))
+    counts = live_counts(conn)
+    conn.execute(delete(EnrollmentRollup))
+    now = datetime.now(timezone.utc)
+    if counts:
+        conn.execute(
+            EnrollmentRollup.__table__.insert(),
+            [dict(zip(KEY_COLUMNS, key), student_count=n, updated_at=now) for key, n in counts.items()],
+        )
+    return len(counts)
+
+
+def rollup_drift(conn: Connection) -> dict[RollupKey, tuple[int, int]]:
+    """Keys whose stored count differs from the live one, as {key: (stored, live)}."""
+    stored, live = stored_counts(conn), live_counts(conn)
+    return {
+        key: (stored.get(key, 0), live.get(key, 0))
+        for key in stored.keys() | live.keys()
+        if stored.get(key, 0) != live.get(key, 0)
+    }
+
+
+# ── Reading ───────────────────────────────────────────────────────────
+
+def rollup_counts(
+    db: Session,
+    dimension: str | None = None,
+    school_year: str | None = None,
+    semester: str | None = None,
+) -> dict[str, int] | int:
+    """Student count per stored value of `dimension`, or the total when None. Filters are optional.
+
+    Missing values ('') are left out of per-value counts, as the live
+    breakdowns skip NULLs.
+    """
+    total = func.sum(EnrollmentRollup.student_count)
+    query = db.query(total)
+    if school_year:
+        query = query.filter(EnrollmentRollup.school_year == school_year)
+    if semester:
+        query = query.filter(EnrollmentRollup.semester == semester)
+    if dimension is None:
+        return query.scalar() or 0
+    column = getattr(EnrollmentRollup, dimension)
+    rows = (
+        query.add_columns(column)
+        .filter(column != "")
+        .group_by(column)
+        .having(total > 0)
+        .all()
+    )
+    return {value: count for count, value in rows}
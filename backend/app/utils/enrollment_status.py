@@ -0,0 +1,80 @@
+"""Public enrollment status, derived from the academic calendar and cached per process."""
+
+from datetime import date, timedelta
+
+from app.database import SessionLocal
+from app.models.academic_calendar import AcademicCalendar
+from app.utils.cache import RenderedJSON, SnapshotCache, midnight_timestamp
+
+CLOSED_STATUS = {
+    "is_open": False,
+    "school_year": None,
+    "semester": None,
+    "enrollment_start": None,
+    "enrollment_end": None,
+    "message": "Enrollment is currently closed.",
+}
+
+
+def build_enrollment_status(calendar: AcademicCalendar | None, today: date) -> dict:
+    """Return the /api/utils/enrollment-status payload for `today`."""
+    if not calendar:
+        return dict(CLOSED_STATUS)
+
+    # If admin manually toggled is_open, respect it.
+    # Additionally auto-close if today is outside the date range (when dates are set).
+    within_dates = True
+    if calendar.enrollment_start and calendar.enrollment_end:
+        within_dates = calendar.enrollment_start <= today <= calendar.enrollment_end
+
+    is_open = calendar.is_open and within_dates
+
+    if is_open:
+        msg = f"Enrollment is open for S.Y. {calendar.school_year} — {calendar.semester} Semester."
+    elif calendar.enrollment_start and today < calendar.enrollment_start:
+        msg = f"Enrollment opens on {calendar.enrollment_start.strftime('%B %d, %Y')}."
+    elif calendar.enrollment_end and today > calendar.enrollment_end:
+        msg = f"Enrollment closed on {calendar.enrollment_end.strftime('%B %d, %Y')}."
+    else:
+        msg = "Enrollment is currently closed."
+
+    return {
+        "is_open": is_open,
+        "school_year": calendar.school_year,
+        "semester": calendar.semester,
+        "enrollment_start": calendar.enrollment_start,
+        "enrollment_end": calendar.enrollment_end,
+        "message": msg,
+    }
+
+
+def _next_change(calendar: AcademicCalendar | None, today: date) -> float | None:
+    """Timestamp of the next local midnight at which the status can flip, if any."""
+    if not calendar:
+        return None
+    boundaries = []
+    if calendar.enrollment_start:
+        boundaries.append(calendar.enrollment_start)
+    if calendar.enrollment_end:
+        boundaries.append(calendar.enrollment_end + timedelta(days=1))
+    upcoming = [d for d in boundaries if d > today]
+    if not upcoming:
+        return None
+    return midnight_timestamp(min(upcoming))
+
+
+def _load_enrollment_status() -> tuple[tuple[RenderedJSON, float | None], float | None]:
+    today = date.today()
+    db = SessionLocal()
+    try:
+        calendar = db.query(AcademicCalendar).first()
+        status = build_enrollment_status(calendar, today)
+        next_change = _next_change(calendar, today)
+        # The change time also goes to clients, to cap how long they reuse the status
+        return (RenderedJSON.of(status), next_change), next_change
+    finally:
+        db.close()
+
+
+# Invalidated by upsert_academic_calendar
+enrollment_status_cache: SnapshotCache[tuple[RenderedJSON, float | None]] = SnapshotCache(_load_enrollment_status)
@@ -0,0 +1,96 @@
+"""Enrollment trends: enrolled students per cycle (school year + semester) from enrollment_records.
+
+Every count is a GROUP BY school_year, semester over enrollment_records (on
+the records' cycle index), so the whole trend takes a fixed number of queries
+however many cycles there are. A cycle is closed once no student is still in
+it, per the enrollment rollups.
+"""
+
+from collections import defaultdict
+
+from sqlalchemy import distinct, func
+from sqlalchemy.orm import Session
+
+from app.models.enrollment_record import EnrollmentRecord
+from app.models.enrollment_record_subject import EnrollmentRecordSubject
+from app.models.enrollment_rollup import EnrollmentRollup
+
+Cycle = tuple[str, str | None]
+
+_CYCLE = (EnrollmentRecord.school_year, EnrollmentRecord.semester)
+_STUDENTS = func.count(distinct(EnrollmentRecord.student_id))
+
+
+def _cycle_order(cycle: Cycle) -> tuple[str, str]:
+    return cycle[0], cycle[1] or ""
+
+
+def open_cycles(db: Session) -> set[Cycle]:
+    """Cycles that students are currently in, from the enrollment rollups."""
+    rows = (
+        db.query(EnrollmentRollup.school_year, EnrollmentRollup.semester)
+        .group_by(EnrollmentRollup.school_year, EnrollmentRollup.semester)
+        .having(func.sum(EnrollmentRollup.student_count) > 0)
+        .all()
+    )
+    return {(sy, sem or None) for sy, sem in rows}
+
+
+def _counts_by(db: Session, column, join_subjects: bool = False) -> dict[Cycle, dict[str, int]]:
+    """Distinct students per value of `column` within each cycle."""
+    query = db.query(*_CYCLE, column, _STUDENTS)
+    if join_subjects:
+        query = query.join(
+            EnrollmentRecordSubject, EnrollmentRecordSubject.enrollment_record_id == EnrollmentRecord.id
+        )
+    rows = (
+        query.filter(EnrollmentRecord.school_year.isnot(None), column.isnot(None))
+        .group_by(*_CYCLE, column)
+        .order_by(column)
+        .all()
+    )
+    counts: dict[Cycle, dict[str, int]] = defaultdict(dict)
+    for school_year, semester, value, students in rows:
+        counts[(school_year, semester)][value] = students
+    return counts
+
+
+def enrollment_trends(db: Session) -> list[dict]:
+    """Distinct enrolled students per cycle, in total and by strand, grade level and subject, oldest first."""
+    totals = dict(
+        ((sy, sem), students)
+        for sy, sem, students in db.query(*_CYCLE, _STUDENTS)
+        .filter(EnrollmentRecord.school_year.isnot(None))
+        .group_by(*_CYCLE)
+    )
+    by_strand = _counts_by(db, EnrollmentRecord.strand)
+    by_grade_level = _counts_by(db, EnrollmentRecord.grade_level)
+    by_subject = _counts_by(db, EnrollmentRecordSubject.subject_code, join_subjects=True)
+    live = open_cycles(db)
+    return [
+        {
+            "school_year": cycle[0],
+            "semester": cycle[1],
+            "closed": cycle not in live,
+            "total": totals[cycle],
+            "by_strand": by_strand.get(cycle, {}),
+            "by_grade_level": by_grade_level.get(cycle, {}),
+            "by_subject": by_subject.get(cycle, {}),
+        }
+        for cycle in sorted(totals, key=_cycle_order)
+    ]
+
+
+def subject_trend(db: Session, subject_code: str) -> list[dict]:
+    """Distinct students who took `subject_code` in each cycle, oldest first."""
+    rows = (
+        db.query(*_CYCLE, _STUDENTS)
+        .join(EnrollmentRecordSubject, EnrollmentRecordSubject.enrollment_record_id == EnrollmentRecord.id)
+        .filter(EnrollmentRecordSubject.subject_code == subject_code, EnrollmentRecord.school_year.isnot(None))
+        .group_by(*_CYCLE)
+        .all()
+    )
+    return [
+        {"school_year": sy, "semester": sem, "students": count}
+        for sy, sem, count in sorted(rows, key=lambda r: _cycle_order((r[0], r[1])))
+    ]
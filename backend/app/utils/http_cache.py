@@ -0,0 +1,76 @@
+"""Conditional GET support: weak ETags, 304 Not Modified and per-endpoint Cache-Control.
+
+Endpoints whose data rarely changes return `cached_json_response(...)` instead
+of a plain value. The body is hashed into a weak ETag; when the browser (or a
+CDN) revalidates with a matching If-None-Match, it gets an empty 304 instead of
+the full payload.
+"""
+
+import hashlib
+import json
+import time
+from typing import Any
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+
+# Fixed reference data: shipped with the code, only changes on deploy
+CACHE_STATIC = "public, max-age=86400"
+# Public data an admin edits occasionally — short freshness, then revalidate
+PUBLIC_SHORT_MAX_AGE = 60
+CACHE_PUBLIC_SHORT = f"public, max-age={PUBLIC_SHORT_MAX_AGE}"
+# Per-user data: never shared, always revalidated (cheap with a 304)
+CACHE_PRIVATE_REVALIDATE = "private, no-cache"
+
+
+def public_cache_until(changes_at: float | None) -> str:
+    """CACHE_PUBLIC_SHORT, with max-age cut so no copy outlives `changes_at` (a Unix timestamp)."""
+    if changes_at is None:
+        return CACHE_PUBLIC_SHORT
+    seconds = min(PUBLIC_SHORT_MAX_AGE, int(changes_at - time.time()))
+    return f"public, max-age={max(seconds, 0)}"
+
+
+def json_bytes(content: Any) -> bytes:
+    """Render content exactly as FastAPI's JSONResponse would."""
+    if isinstance(content, BaseModel):
+        return content.model_dump_json().encode()
+    return json.dumps(
+        jsonable_encoder(content), ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode()
+
+
+def weak_etag(body: bytes) -> str:
+    return f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Weak comparison against If-None-Match, which may list several tags or be `*`."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    opaque = etag.removeprefix("W/")
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == opaque:
+            return True
+    return False
+
+
+def cached_json_response(
+    request: Request,
+    content: Any,
+    cache_control: str,
+    etag: str | None = None,
+) -> Response:
+    """Return content as JSON with an ETag, or a bare 304 if the client already has it.
+
+    `content` may be pre-rendered bytes; pass `etag` as well to skip hashing.
+    """
+    body = content if isinstance(content, bytes) else json_bytes(content)
+    etag = etag or weak_etag(body)
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,100 @@
+"""Lightweight in-process latency metrics, exposed on /api/admin/metrics."""
+
+import asyncio
+import functools
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+
+class LatencyStats:
+    """Rolling latency and concurrency figures for one operation."""
+
+    def __init__(self, window: int = 1000):
+        self._lock = threading.Lock()
+        self._recent: deque[float] = deque(maxlen=window)
+        self.count = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    @contextmanager
+    def track(self):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        start = time.perf_counter()
+        failed = False
+        try:
+            yield
+        except Exception:
+            failed = True
+            raise
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            with self._lock:
+                self.in_flight -= 1
+                self.count += 1
+                self.errors += failed
+                self.total_ms += elapsed
+                self.max_ms = max(self.max_ms, elapsed)
+                self._recent.append(elapsed)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            recent = sorted(self._recent)
+
+            def pct(p: float) -> float | None:
+                return round(recent[min(len(recent) - 1, int(len(recent) * p))], 2) if recent else None
+
+            return {
+                "count": self.count,
+                "errors": self.errors,
+                "avg_ms": round(self.total_ms / self.count, 2) if self.count else None,
+                "p50_ms": pct(0.50),
+                "p95_ms": pct(0.95),
+                "p99_ms": pct(0.99),
+                "max_ms": round(self.max_ms, 2),
+                "in_flight": self.in_flight,
+                "max_in_flight": self.max_in_flight,
+            }
+
+
+_registry: dict[str, LatencyStats] = {}
+_registry_lock = threading.Lock()
+
+
+def latency(name: str) -> LatencyStats:
+    """Return the LatencyStats registered under `name`, creating it on first use."""
+    with _registry_lock:
+        if name not in _registry:
+            _registry[name] = LatencyStats()
+        return _registry[name]
+
+
+def timed(name: str):
+    """Decorator recording the latency of a sync or async endpoint under `name`."""
+    def decorator(func):
+        stats = latency(name)
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with stats.track():
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stats.track():
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def latency_snapshot() -> dict:
+    with _registry_lock:
+        items = list(_registry.items())
+    return {name: stats.snapshot() for name, stats in sorted(items)}
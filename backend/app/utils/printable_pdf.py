@@ -0,0 +1,429 @@
+"""Server-side class lists and enrollment slips, matching PrintableClassList.jsx
+and PrintableEnrollmentForm.jsx. Built on the assets and helpers in report_pdf.
+
+Paragraph text is reportlab markup, so every value from the database goes
+through escape() before it is placed in one."""
+
+from datetime import date
+from functools import lru_cache
+from io import BytesIO
+from typing import NamedTuple
+from xml.sax.saxutils import escape
+
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER, TA_RIGHT
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.lib.units import mm
+from reportlab.platypus import Image, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+from app.utils.report_pdf import PIL_AVAILABLE, LogoAssets, logo_assets, make_watermark
+
+if PIL_AVAILABLE:
+    from PIL import Image as PILImage
+
+DEFAULT_SCHOOL_NAME = "Database Technology College"
+
+# ── Print colours (same as the browser versions) ──────────────────────
+GREEN       = colors.HexColor("#15803d")
+GREEN_LIGHT = colors.HexColor("#16a34a")
+STRIP_BG    = colors.HexColor("#f0fdf4")
+STRIP_LINE  = colors.HexColor("#bbf7d0")
+GRID        = colors.HexColor("#d1d5db")
+MUTED       = colors.HexColor("#666666")
+FAINT       = colors.HexColor("#999999")
+
+FORM_PAGE_SIZE = (194 * mm, 132 * mm)
+# Longest side of the logo on printed pages. Slips are merged by the hundred,
+# so a full-size logo on each one adds up.
+PRINT_LOGO_PX = 320
+FEE_LINES = ["Tuition Fee", "Misc. Fee", "Laboratory Fee", "Other Charges"]
+
+
+class ClassListStudent(NamedTuple):
+    id: int
+    student_number: str | None
+    last_name: str | None
+    first_name: str | None
+    middle_name: str | None
+    sex: str | None
+    lrn: str | None
+    enrollment_type: str | None
+
+
+class FormSubject(NamedTuple):
+    subject_code: str
+    subject_name: str
+    schedule: str
+
+
+class EnrollmentForm(NamedTuple):
+    """What one enrollment slip shows."""
+
+    student_id: int
+    student_number: str | None
+    full_name: str
+    strand: str | None
+    school_year: str | None
+    semester: str | None
+    subjects: tuple[FormSubject, ...]
+
+
+@lru_cache(maxsize=1)
+def _styles() -> dict[str, ParagraphStyle]:
+    base = ParagraphStyle("PrintBase", fontName="Helvetica", fontSize=8, leading=10)
+    return {
+        "label": ParagraphStyle(
+            "PrintLabel", parent=base, fontName="Helvetica-Bold", fontSize=6, leading=8,
+            textColor=GREEN_LIGHT,
+        ),
+        "value": ParagraphStyle("PrintValue", parent=base),
+        "cell": ParagraphStyle("PrintCell", parent=base, fontSize=7, leading=8.5),
+        "school": ParagraphStyle(
+            "PrintSchool", parent=base, fontName="Helvetica-Bold", fontSize=13, leading=16,
+            alignment=TA_CENTER,
+        ),
+        "title": ParagraphStyle(
+            "PrintTitle", parent=base, fontName="Helvetica-Bold", fontSize=10, leading=13,
+            textColor=GREEN, alignment=TA_CENTER,
+        ),
+        "subtitle": ParagraphStyle(
+            "PrintSubtitle", parent=base, fontSize=7.5, leading=10, textColor=MUTED,
+            alignment=TA_CENTER,
+        ),
+        "total": ParagraphStyle("PrintTotal", parent=base, alignment=TA_RIGHT, textColor=MUTED),
+        "sig": ParagraphStyle(
+            "PrintSig", parent=base, fontName="Helvetica-Bold", fontSize=7, leading=9,
+            alignment=TA_CENTER,
+        ),
+        "sig_sub": ParagraphStyle(
+            "PrintSigSub", parent=base, fontSize=6.5, leading=8, textColor=MUTED,
+            alignment=TA_CENTER,
+        ),
+        "printed": ParagraphStyle(
+            "PrintDate", parent=base, fontSize=7, textColor=FAINT, alignment=TA_CENTER,
+        ),
+    }
+
+
+def _long_date(day: date) -> str:
+    return day.strftime("%B %d, %Y").replace(" 0", " ")
+
+
+@lru_cache(maxsize=4)
+def _shrink_logo(assets: LogoAssets) -> LogoAssets:
+    try:
+        img = PILImage.open(BytesIO(assets.logo_bytes))
+        if max(img.size) <= PRINT_LOGO_PX:
+            return assets
+        img.thumbnail((PRINT_LOGO_PX, PRINT_LOGO_PX))
+        buf = BytesIO()
+        img.save(buf, format="PNG", optimize=True)
+    except Exception:
+        return assets
+    logo_bytes = buf.getvalue()
+    return LogoAssets(logo_bytes, make_watermark(logo_bytes))
+
+
+def _print_assets(logo_path: str | None) -> LogoAssets | None:
+    assets = logo_assets(logo_path)
+    if assets is None or not PIL_AVAILABLE:
+        return assets
+    return _shrink_logo(assets)
+
+
+def _watermark_painter(logo_path: str | None, size: float):
+    assets = _print_assets(logo_path)
+    watermark = assets.watermark if assets else None
+
+    def _on_page(canvas, doc):
+        if watermark is None:
+            return
+        page_w, page_h = doc.pagesize
+        canvas.saveState()
+        canvas.drawImage(
+            watermark, (page_w - size) / 2, (page_h - size) / 2,
+            width=size, height=size, preserveAspectRatio=True, mask="auto",
+        )
+        canvas.restoreState()
+
+    return _on_page
+
+
+def _logo(logo_path: str | None, size: float):
+    assets = _print_assets(logo_path)
+    if assets is None:
+        return Spacer(size, size)
+    return Image(BytesIO(assets.logo_bytes), width=size, height=size)
+
+
+def _info_strip(cells: list[tuple[str, str]], col_widths: list[float]) -> Table:
+    styles = _styles()
+    row = [
+        [Paragraph(escape(label.upper()), styles["label"]), Paragraph(escape(value or "—"), styles["value"])]
+        for label, value in cells
+    ]
+    strip = Table([row], colWidths=col_widths)
+    strip.setStyle(TableStyle([
+        ("BACKGROUND", (0, 0), (-1, -1), STRIP_BG),
+        ("BOX",        (0, 0), (-1, -1), 0.75, STRIP_LINE),
+        ("VALIGN",     (0, 0), (-1, -1), "TOP"),
+        ("TOPPADDING", (0, 0), (-1, -1), 3),
+        ("BOTTOMPADDING", (0, 0), (-1, -1), 3),
+    ]))
+    return strip
+
+
+def _signature_lines(items: list[tuple[str, str]], width: float, line_height: float) -> Table:
+    styles = _styles()
+    col_w = width / len(items)
+    cells = []
+    for label, sub in items:
+        # Blank space to sign in, the line, then the caption
+        sig = Table(
+            [[""], [Paragraph(escape(label), styles["sig"])], [Paragraph(escape(sub), styles["sig_sub"]) if sub else ""]],
+            colWidths=[col_w - 24], rowHeights=[line_height, None, None],
+        )
+        sig.setStyle(TableStyle([
+            ("LINEBELOW",     (0, 0), (0, 0),   0.75, colors.HexColor("#333333")),
+            ("TOPPADDING",    (0, 0), (-1, -1), 1),
+            ("BOTTOMPADDING", (0, 0), (-1, -1), 1),
+        ]))
+        cells.append(sig)
+    table = Table([cells], colWidths=[col_w] * len(items))
+    table.setStyle(TableStyle([("LEFTPADDING", (0, 0), (-1, -1), 12), ("RIGHTPADDING", (0, 0), (-1, -1), 12)]))
+    return table
+
+
+def _line_table(rows: list[list], col_widths: list[float], align_center: tuple[int, ...]) -> Table:
+    """Header + body rows in the green print style, with alternating row shading."""
+    table = Table(rows, colWidths=col_widths, repeatRows=1)
+    style = [
+        ("BACKGROUND",    (0, 0), (-1, 0),  GREEN),
+        ("TEXTCOLOR",     (0, 0), (-1, 0),  colors.white),
+        ("FONTNAME",      (0, 0), (-1, 0),  "Helvetica-Bold"),
+        ("GRID",          (0, 0), (-1, 0),  0.5, GREEN),
+        ("GRID",          (0, 1), (-1, -1), 0.5, GRID),
+        ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, STRIP_BG]),
+        ("VALIGN",        (0, 0), (-1, -1), "MIDDLE"),
+        ("TOPPADDING",    (0, 0), (-1, -1), 3),
+        ("BOTTOMPADDING", (0, 0), (-1, -1), 3),
+    ]
+    for col in align_center:
+        style.append(("ALIGN", (col, 0), (col, -1), "CENTER"))
+    table.setStyle(TableStyle(style))
+    return table
+
+
+# ── Class list (A4 portrait) ──────────────────────────────────────────
+
+def build_class_list(
+    students: list[ClassListStudent],
+    strand: str | None,
+    grade_level: str | None,
+    semester: str | None,
+    school_year: str,
+    school_name: str = "",
+    logo_path: str | None = None,
+    printed_on: date | None = None,
+    output=None,
+) -> bytes | None:
+    """Render a section's class list. Written to `output` when given, otherwise returned as bytes."""
+    buffer = BytesIO() if output is None else output
+    styles = _styles()
+    printed_on = printed_on or date.today()
+    doc = SimpleDocTemplate(
+        buffer, pagesize=A4,
+        leftMargin=15 * mm, rightMargin=15 * mm, topMargin=12 * mm, bottomMargin=12 * mm,
+    )
+    width = doc.width
+
+    header = Table(
+        [[
+            _logo(logo_path, 14 * mm),
+            [
+                Paragraph(escape((school_name or DEFAULT_SCHOOL_NAME).upper()), styles["school"]),
+                Paragraph("CLASS LIST", styles["title"]),
+                Paragraph(
+                    escape(f"S.Y. {school_year}" + (f"  |  {semester}" if semester else "")), styles["subtitle"]
+                ),
+            ],
+            "",
+        ]],
+        colWidths=[18 * mm, width - 36 * mm, 18 * mm],
+    )
+    header.setStyle(TableStyle([
+        ("VALIGN",    (0, 0), (-1, -1), "MIDDLE"),
+        ("LINEBELOW", (0, 0), (-1, 0),  2.5, GREEN),
+        ("BOTTOMPADDING", (0, 0), (-1, -1), 6),
+    ]))
+
+    section = " — ".join(filter(None, [strand, grade_level]))
+    strip = _info_strip(
+        [("Section / Strand", section), ("Grade Level", grade_level or ""), ("Semester", semester or "")],
+        [width / 3] * 3,
+    )
+
+    cell = styles["cell"]
+    rows = [["#", "Student No.", "Last Name", "First Name", "Middle Name", "Sex", "LRN", "Type"]]
+    for idx, s in enumerate(students, start=1):
+        rows.append([
+            str(idx),
+            s.student_number or "—",
+            Paragraph(escape(s.last_name or "—"), cell),
+            Paragraph(escape(s.first_name or "—"), cell),
+            Paragraph(escape(s.middle_name or "—"), cell),
+            s.sex or "—",
+            s.lrn or "—",
+            (s.enrollment_type or "—").replace("_", " "),
+        ])
+    fixed = [8 * mm, 26 * mm, 12 * mm, 26 * mm, 27 * mm]
+    name_w = (width - sum(fixed)) / 3
+    col_widths = [fixed[0], fixed[1], name_w, name_w, name_w, fixed[2], fixed[3], fixed[4]]
+    if students:
+        roster = _line_table(rows, col_widths, align_center=(0, 5))
+        roster.setStyle(TableStyle([("FONTSIZE", (0, 0), (-1, -1), 8)]))
+    else:
+        roster = _line_table(
+            rows + [["No enrolled students found for this section"] + [""] * 7],
+            col_widths, align_center=(0, 5),
+        )
+        roster.setStyle(TableStyle([
+            ("SPAN",      (0, 1), (-1, 1)),
+            ("ALIGN",     (0, 1), (-1, 1), "CENTER"),
+            ("TEXTCOLOR", (0, 1), (-1, 1), FAINT),
+            ("FONTNAME",  (0, 1), (-1, 1), "Helvetica-Oblique"),
+        ]))
+
+    story = [
+        header,
+        Spacer(1, 8),
+        strip,
+        Spacer(1, 10),
+        roster,
+        Spacer(1, 5),
+        Paragraph(f'Total Enrolled: <font color="#15803d"><b>{len(students)}</b></font>', styles["total"]),
+        Spacer(1, 30),
+        _signature_lines([("PREPARED BY", "Registrar"), ("NOTED BY", "School Director / Principal")], width, 22),
+        Spacer(1, 14),
+        Paragraph(f"Date Printed: {_long_date(printed_on)}", styles["printed"]),
+    ]
+    paint = _watermark_painter(logo_path, 120 * mm)
+    doc.build(story, onFirstPage=paint, onLaterPages=paint)
+    if output is None:
+        return buffer.getvalue()
+    return None
+
+
+# ── Enrollment slip (one page per student) ────────────────────────────
+
+def build_enrollment_form(
+    form: EnrollmentForm,
+    school_name: str = "",
+    logo_path: str | None = None,
+    issued_on: date | None = None,
+    output=None,
+) -> bytes | None:
+    """Render one student's enrollment slip. Written to `output` when given, otherwise returned as bytes."""
+    buffer = BytesIO() if output is None else output
+    styles = _styles()
+    issued_on = issued_on or date.today()
+    doc = SimpleDocTemplate(
+        buffer, pagesize=FORM_PAGE_SIZE,
+        leftMargin=8 * mm, rightMargin=8 * mm, topMargin=6 * mm, bottomMargin=6 * mm,
+    )
+    width = doc.width
+    school = ParagraphStyle("FormSchool", parent=styles["school"], fontSize=11, leading=13, alignment=0)
+    tagline = ParagraphStyle("FormTagline", parent=styles["subtitle"], fontSize=8, alignment=0)
+    issued = ParagraphStyle("FormIssued", parent=styles["subtitle"], fontSize=8.5, alignment=TA_RIGHT)
+
+    header = Table(
+        [[
+            _logo(logo_path, 8.5 * mm),
+            [
+                Paragraph(escape((school_name or DEFAULT_SCHOOL_NAME).upper()), school),
+                Paragraph("Student Registration System — Enrollment Slip", tagline),
+            ],
+            Paragraph(f"Issued: {_long_date(issued_on)}", issued),
+        ]],
+        colWidths=[11 * mm, width - 56 * mm, 45 * mm],
+    )
+    header.setStyle(TableStyle([
+        ("VALIGN",    (0, 0), (-1, -1), "MIDDLE"),
+        ("LINEBELOW", (0, 0), (-1, 0),  2.5, GREEN),
+        ("LEFTPADDING", (0, 0), (0, 0), 0),
+        ("BOTTOMPADDING", (0, 0), (-1, -1), 4),
+    ]))
+
+    unit = width / 6
+    strip = _info_strip(
+        [
+            ("Student Name", form.full_name),
+            ("ID Number", form.student_number or ""),
+            ("Strand", form.strand or ""),
+            ("School Year", form.school_year or ""),
+            ("Semester", form.semester or ""),
+        ],
+        [2 * unit, unit, unit, unit, unit],
+    )
+
+    fees_w = 62 * mm
+    subjects_w = width - fees_w - 4 * mm
+    cell = styles["cell"]
+    rows = [["#", "Subject Code", "Subject Name", "Schedule"]] + [
+        [str(idx), s.subject_code, Paragraph(escape(s.subject_name), cell), Paragraph(escape(s.schedule), cell)]
+        for idx, s in enumerate(form.subjects, start=1)
+    ]
+    subjects = _line_table(rows, [6 * mm, 22 * mm, subjects_w - 53 * mm, 25 * mm], align_center=(0,))
+    subjects.setStyle(TableStyle([
+        ("FONTSIZE",  (0, 0), (-1, -1), 7),
+        ("FONTNAME",  (1, 1), (1, -1),  "Helvetica-Bold"),
+        ("TEXTCOLOR", (1, 1), (1, -1),  GREEN),
+        ("TEXTCOLOR", (0, 1), (0, -1),  FAINT),
+    ]))
+
+    blank = "PHP ___________"
+    fees = Table(
+        [["ASSESSMENT OF FEES", ""]] + [[fee, blank] for fee in FEE_LINES] + [["TOTAL", blank]],
+        colWidths=[fees_w / 2, fees_w / 2],
+    )
+    fees.setStyle(TableStyle([
+        ("SPAN",       (0, 0), (-1, 0)),
+        ("FONTNAME",   (0, 0), (-1, 0),  "Helvetica-Bold"),
+        ("TEXTCOLOR",  (0, 0), (-1, 0),  GREEN),
+        ("LINEBELOW",  (0, 0), (-1, 0),  1, STRIP_LINE),
+        ("FONTSIZE",   (0, 0), (-1, -1), 7),
+        ("ALIGN",      (1, 1), (1, -1),  "RIGHT"),
+        ("TEXTCOLOR",  (1, 1), (1, -1),  colors.HexColor("#bbbbbb")),
+        ("LINEBELOW",  (0, 1), (-1, -3), 0.5, GRID, 1, (1, 2)),
+        ("LINEABOVE",  (0, -1), (-1, -1), 1.5, GREEN),
+        ("FONTNAME",   (0, -1), (0, -1), "Helvetica-Bold"),
+        ("TOPPADDING", (0, 1), (-1, -2), 6),
+        ("BOTTOMPADDING", (0, 1), (-1, -2), 6),
+        ("LEFTPADDING", (0, 0), (-1, -1), 2),
+        ("RIGHTPADDING", (0, 0), (-1, -1), 2),
+    ]))
+
+    body = Table([[subjects, fees]], colWidths=[width - fees_w, fees_w])
+    body.setStyle(TableStyle([
+        ("VALIGN",      (0, 0), (-1, -1), "TOP"),
+        ("LEFTPADDING", (0, 0), (-1, -1), 0),
+        ("RIGHTPADDING", (0, 0), (-1, -1), 0),
+        ("LINEBEFORE",  (1, 0), (1, 0),  1, colors.HexColor("#d1fae5")),
+        ("LEFTPADDING", (1, 0), (1, 0),  4 * mm),
+    ]))
+
+    story = [
+        header,
+        Spacer(1, 4),
+        strip,
+        Spacer(1, 4),
+        body,
+        Spacer(1, 6),
+        _signature_lines([("Student's Signature", form.full_name), ("Registrar's Signature", "")], width, 16),
+    ]
+    paint = _watermark_painter(logo_path, 55 * mm)
+    doc.build(story, onFirstPage=paint, onLaterPages=paint)
+    if output is None:
+        return buffer.getvalue()
+    return None
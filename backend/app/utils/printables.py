@@ -0,0 +1,227 @@
+"""Registrar printouts rendered on the server: section class lists and
+enrollment slips for a whole filter set in one PDF.
+
+Rendering runs in the report process pool (see report_jobs). Each student's
+slip is cached on disk like a report (see report_cache), keyed by exactly what
+it shows, so reprinting a section after one change renders a single slip; the
+rest are merged from cache. Printed dates are part of the keys, so cached
+pages never show a stale date.
+"""
+
+import hashlib
+import json
+from datetime import date
+from functools import partial
+from typing import NamedTuple
+
+from pypdf import PdfWriter
+from sqlalchemy.orm import Query, Session
+
+from app.models.student import Student, StudentStatus
+from app.models.student_subject import StudentSubject
+from app.models.subject import Subject
+from app.utils.enrollment_report import school_identity
+from app.utils.metrics import latency
+from app.utils.printable_pdf import (
+    ClassListStudent, EnrollmentForm, FormSubject, build_class_list, build_enrollment_form,
+)
+from app.utils.report_cache import cached_report, store_report
+from app.utils.report_jobs import get_render_pool
+
+# Bump when either printable layout changes so cached pages stop matching
+PRINT_LAYOUT_VERSION = 1
+# Slips handed to a render worker at a time
+FORM_CHUNK_SIZE = 16
+
+
+def _content_key(*parts) -> str:
+    return hashlib.sha256(json.dumps(parts, default=str).encode()).hexdigest()
+
+
+def _enum_value(value) -> str | None:
+    return value.value if hasattr(value, "value") else value
+
+
+def class_list_query(db: Session, strand: str, grade_level: str, semester: str | None) -> Query:
+    """Officially enrolled students of a strand/grade, sorted A-Z by last name."""
+    query = db.query(Student).filter(
+        Student.status == StudentStatus.APPROVED,
+        Student.payment_status == "verified",
+        Student.strand == strand,
+        Student.grade_level_to_enroll == grade_level,
+    )
+    if semester:
+        query = query.filter(Student.semester == semester)
+    return query.order_by(Student.last_name, Student.first_name)
+
+
+def prepare_class_list(
+    db: Session, strand: str, grade_level: str, semester: str | None
+) -> tuple[str, dict]:
+    """Return `(cache_key, build_class_list kwargs)` for a section's class list."""
+    rows = class_list_query(db, strand, grade_level, semester).with_entities(
+        *(getattr(Student, name) for name in ClassListStudent._fields), Student.school_year
+    ).all()
+    students = [
+        ClassListStudent(*row[:-1])._replace(
+            sex=_enum_value(row.sex), enrollment_type=_enum_value(row.enrollment_type)
+        )
+        for row in rows
+    ]
+    today = date.today()
+    school_year = next(
+        (row.school_year for row in rows if row.school_year), f"{today.year}-{today.year + 1}"
+    )
+    school_name, logo_path = school_identity(db)
+    kwargs = dict(
+        students=students,
+        strand=strand,
+        grade_level=grade_level,
+        semester=semester,
+        school_year=school_year,
+        school_name=school_name,
+        logo_path=logo_path,
+        printed_on=today,
+    )
+    return _content_key("class_list", PRINT_LAYOUT_VERSION, kwargs), kwargs
+
+
+def render_class_list(key: str, kwargs: dict) -> str:
+    """Path of the class list PDF, rendered in the process pool unless cached."""
+    path = cached_report(key)
+    if path is not None:
+        return path
+
+    def write(tmp_path: str) -> None:
+        get_render_pool().submit(build_class_list, output=tmp_path, **kwargs).result()
+
+    with latency("reports.print").track():
+        return store_report(key, write)
+
+
+class FormBatch(NamedTuple):
+    """Enrollment slips for one print request, with the cache key of each page."""
+
+    key: str
+    forms: list[EnrollmentForm]
+    page_keys: list[str]
+    school_name: str
+    logo_path: str | None
+    issued_on: date
+
+
+def prepare_enrollment_forms(
+    db: Session,
+    school_year: str | None = None,
+    semester: str | None = None,
+    grade_level: str | None = None,
+    strand: str | None = None,
+) -> FormBatch:
+    """Slips for fully enrolled students (payment verified, subjects assigned). Filters are optional."""
+    enrolled = db.query(Student).filter(
+        Student.payment_status == "verified",
+        db.query(StudentSubject).filter(StudentSubject.student_id == Student.id).exists(),
+    )
+    if school_year:
+        enrolled = enrolled.filter(Student.school_year == school_year)
+    if semester:
+        enrolled = enrolled.filter(Student.semester == semester)
+    if grade_level:
+        enrolled = enrolled.filter(Student.grade_level_to_enroll == grade_level)
+    if strand:
+        enrolled = enrolled.filter(Student.strand == strand)
+
+    subject_rows = (
+        db.query(StudentSubject.student_id, Subject.subject_code, Subject.subject_name, Subject.schedule)
+        .join(Subject, Subject.id == StudentSubject.subject_id)
+        .filter(StudentSubject.student_id.in_(enrolled.with_entities(Student.id)))
+        .order_by(StudentSubject.student_id, StudentSubject.id)
+    )
+    subjects: dict[int, list[FormSubject]] = {}
+    for student_id, *subject in subject_rows:
+        subjects.setdefault(student_id, []).append(FormSubject(*subject))
+
+    student_rows = enrolled.with_entities(
+        Student.id, Student.student_number, Student.last_name, Student.first_name,
+        Student.middle_name, Student.suffix, Student.strand, Student.school_year, Student.semester,
+    ).order_by(Student.last_name, Student.first_name, Student.id)
+    forms = [
+        EnrollmentForm(
+            student_id=row.id,
+            student_number=row.student_number,
+            full_name=" ".join(filter(None, [row.last_name, row.first_name, row.middle_name, row.suffix])),
+            strand=row.strand,
+            school_year=row.school_year,
+            semester=row.semester,
+            subjects=tuple(subjects.get(row.id, ())),
+        )
+        for row in student_rows
+    ]
+
+    school_name, logo_path = school_identity(db)
+    issued_on = date.today()
+    page_keys = [
+        _content_key("enrollment_form", PRINT_LAYOUT_VERSION, form, school_name, logo_path, issued_on)
+        for form in forms
+    ]
+    return FormBatch(
+        key=_content_key("enrollment_forms", page_keys),
+        forms=forms,
+        page_keys=page_keys,
+        school_name=school_name,
+        logo_path=logo_path,
+        issued_on=issued_on,
+    )
+
+
+def render_form_pages(
+    items: list[tuple[str, EnrollmentForm]], school_name: str, logo_path: str | None, issued_on: date
+) -> list[str]:
+    """Render and cache a chunk of slips. Runs in a render worker."""
+    return [
+        store_report(key, partial(_write_form, form, school_name, logo_path, issued_on))
+        for key, form in items
+    ]
+
+
+def _write_form(form: EnrollmentForm, school_name: str, logo_path: str | None, issued_on: date,
+                tmp_path: str) -> None:
+    build_enrollment_form(form, school_name, logo_path, issued_on, output=tmp_path)
+
+
+def _merge_pages(paths: list[str], output: str) -> None:
+    writer = PdfWriter()
+    for path in paths:
+        writer.append(path)
+    # Every slip embeds the same logo, watermark and fonts; keep one copy of each.
+    # The second pass catches images that only differed by their (now merged) masks.
+    for _ in range(2):
+        writer.compress_identical_objects()
+    writer.write(output)
+
+
+def render_enrollment_forms(batch: FormBatch) -> str:
+    """Path of one PDF holding every slip in `batch`.
+
+    Slips missing from the cache are rendered in parallel across the process
+    pool, in chunks of FORM_CHUNK_SIZE, then all pages are merged in order.
+    """
+    path = cached_report(batch.key)
+    if path is not None:
+        return path
+
+    with latency("reports.print").track():
+        pages = {key: cached_report(key) for key in batch.page_keys}
+        missing = {key: form for key, form in zip(batch.page_keys, batch.forms) if pages[key] is None}
+        items = list(missing.items())
+        chunks = [items[i:i + FORM_CHUNK_SIZE] for i in range(0, len(items), FORM_CHUNK_SIZE)]
+        pool = get_render_pool()
+        futures = [
+            pool.submit(render_form_pages, chunk, batch.school_name, batch.logo_path, batch.issued_on)
+            for chunk in chunks
+        ]
+        for chunk, future in zip(chunks, futures):
+            for (key, _form), page_path in zip(chunk, future.result()):
+                pages[key] = page_path
+
+        return store_report(batch.key, partial(_merge_pages, [pages[key] for key in batch.page_keys]))
@@ -0,0 +1,184 @@
+"""Shared rate limiter used by every router.
+
+One Limiter instance with a pluggable storage backend, chosen by
+RATE_LIMIT_STORAGE_URI:
+
+    memory://                 per-process counters (single worker / development)
+    redis://host:6379/0       shared across workers and hosts (any Redis-compatible server)
+    database://               shared counters in the rate_limit_counters table of DATABASE_URL
+
+Counters use the sliding-window-counter strategy. Authenticated requests are
+keyed by user id so students behind one school NAT don't share a budget;
+anonymous requests fall back to the client IP.
+"""
+
+import threading
+import time
+from math import floor
+
+from limits.storage.base import SlidingWindowCounterSupport, Storage, TimestampedSlidingWindow
+from slowapi import Limiter
+from slowapi.util import get_remote_address
+from sqlalchemy import case, delete, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from starlette.requests import Request
+
+from app.auth.jwt_handler import decode_access_token
+from app.config import settings
+from app.database import engine
+from app.models.rate_limit import RateLimitCounter
+
+PURGE_INTERVAL_SECONDS = 60
+
+
+class DatabaseStorage(Storage, SlidingWindowCounterSupport, TimestampedSlidingWindow):
+    """limits storage backed by the rate_limit_counters table.
+
+    Works on PostgreSQL in production and on SQLite as a local stand-in; both
+    support INSERT ... ON CONFLICT DO UPDATE ... RETURNING.
+    """
+
+    STORAGE_SCHEME = ["database"]
+
+    def __init__(self, uri: str | None = None, wrap_exceptions: bool = False, **options):
+        self._engine = engine
+        if self._engine.dialect.name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        self._insert = insert
+        self._purge_lock = threading.Lock()
+        self._last_purge = 0.0
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+
+    @property
+    def base_exceptions(self):
+        return SQLAlchemyError
+
+    def _purge_expired(self, now: float) -> None:
+        if now - self._last_purge < PURGE_INTERVAL_SECONDS or not self._purge_lock.acquire(blocking=False):
+            return
+        try:
+            self._last_purge = now
+            with self._engine.begin() as conn:
+                conn.execute(delete(RateLimitCounter).where(RateLimitCounter.expires_at <= now))
+        finally:
+            self._purge_lock.release()
+
+    def incr(self, key: str, expiry: float, amount: int = 1) -> int:
+        now = time.time()
+        self._purge_expired(now)
+        table = RateLimitCounter.__table__
+        expired = table.c.expires_at <= now
+        stmt = self._insert(table).values(key=key, count=amount, expires_at=now + expiry)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.key],
+            set_={
+                "count": case((expired, amount), else_=table.c.count + amount),
+                "expires_at": case((expired, now + expiry), else_=table.c.expires_at),
+            },
+        ).returning(table.c.count)
+        with self._engine.begin() as conn:
+            return conn.execute(stmt).scalar_one()
+
+    def decr(self, key: str, amount: int = 1) -> int:
+        remaining = RateLimitCounter.count - amount
+        with self._engine.begin() as conn:
+            count = conn.execute(
+                update(RateLimitCounter)
+                .where(RateLimitCounter.key == key, RateLimitCounter.expires_at > time.time())
+                .values(count=case((remaining < 0, 0), else_=remaining))
+                .returning(RateLimitCounter.count)
+            ).scalar()
+        return count or 0
+
+    def get(self, key: str) -> int:
+        with self._engine.connect() as conn:
+            count = conn.execute(
+                select(RateLimitCounter.count)
+                .where(RateLimitCounter.key == key, RateLimitCounter.expires_at > time.time())
+            ).scalar()
+        return count or 0
+
+    def get_expiry(self, key: str) -> float:
+        now = time.time()
+        with self._engine.connect() as conn:
+            expires_at = conn.execute(
+                select(RateLimitCounter.expires_at)
+                .where(RateLimitCounter.key == key, RateLimitCounter.expires_at > now)
+            ).scalar()
+        return expires_at or now
+
+    def check(self) -> bool:
+        try:
+            with self._engine.connect() as conn:
+                conn.execute(select(1))
+            return True
+        except SQLAlchemyError:
+            return False
+
+    def reset(self) -> int | None:
+        with self._engine.begin() as conn:
+            return conn.execute(delete(RateLimitCounter)).rowcount
+
+    def clear(self, key: str) -> None:
+        with self._engine.begin() as conn:
+            conn.execute(delete(RateLimitCounter).where(RateLimitCounter.key == key))
+
+    # Sliding window counter: same weighting as limits' MemoryStorage, over two
+    # timestamped fixed-window keys.
+
+    def _sliding_window_info(self, previous_key: str, current_key: str, expiry: int, now: float):
+        previous_count = self.get(previous_key)
+        current_count = self.get(current_key)
+        previous_ttl = 0.0 if previous_count == 0 else (1 - (((now - expiry) / expiry) % 1)) * expiry
+        current_ttl = (1 - ((now / expiry) % 1)) * expiry + expiry
+        return previous_count, previous_ttl, current_count, current_ttl
+
+    def acquire_sliding_window_entry(self, key: str, limit: int, expiry: int, amount: int = 1) -> bool:
+        if amount > limit:
+            return False
+        now = time.time()
+        previous_key, current_key = self.sliding_window_keys(key, expiry, now)
+        previous_count, previous_ttl, current_count, _ = self._sliding_window_info(
+            previous_key, current_key, expiry, now
+        )
+        weighted = previous_count * previous_ttl / expiry
+        if floor(weighted + current_count) + amount > limit:
+            return False
+        current_count = self.incr(current_key, 2 * expiry, amount=amount)
+        if floor(weighted + current_count) > limit:
+            # Lost a race with another worker — give the slot back
+            self.decr(current_key, amount)
+            return False
+        return True
+
+    def get_sliding_window(self, key: str, expiry: int) -> tuple[int, float, int, float]:
+        now = time.time()
+        previous_key, current_key = self.sliding_window_keys(key, expiry, now)
+        return self._sliding_window_info(previous_key, current_key, expiry, now)
+
+    def clear_sliding_window(self, key: str, expiry: int) -> None:
+        previous_key, current_key = self.sliding_window_keys(key, expiry, time.time())
+        self.clear(previous_key)
+        self.clear(current_key)
+
+
+def rate_limit_key(request: Request) -> str:
+    """Key authenticated requests by user id, everything else by client IP."""
+    auth = request.headers.get("authorization", "")
+    if auth[:7].lower() == "bearer ":
+        payload = decode_access_token(auth[7:])
+        if payload and payload.get("user_id") is not None:
+            return f"user:{payload['user_id']}"
+    return f"ip:{get_remote_address(request)}"
+
+
+limiter = Limiter(
+    key_func=rate_limit_key,
+    storage_uri=settings.RATE_LIMIT_STORAGE_URI,
+    strategy="sliding-window-counter",
+    key_prefix="srs",
+    # If Redis/the database is unreachable, keep limiting per process rather than failing requests
+    in_memory_fallback_enabled=not settings.RATE_LIMIT_STORAGE_URI.startswith("memory://"),
+)
@@ -0,0 +1,109 @@
+"""On-disk cache of rendered reports, keyed by their filters and a data version stamp.
+
+The stamp summarises everything a report is drawn from, so an unchanged
+report is served straight from disk (and revalidated with an ETag) instead of
+being queried and rendered again. Bump REPORT_LAYOUT_VERSION whenever the
+PDF layout changes so old files stop matching.
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import time
+import uuid
+from typing import Callable
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.school_settings import SchoolSettings
+from app.models.student import Student
+from app.models.student_subject import StudentSubject
+
+REPORT_LAYOUT_VERSION = 2
+
+
+def _cache_dir() -> str:
+    return os.path.join(settings.REPORT_DIR, "cache")
+
+
+def enrollment_report_cache_key(db: Session, school_year: str | None, semester: str | None) -> str:
+    """Hash of the filters plus the current data version of the matching students.
+
+    Student edits bump students.updated_at, deletions change the count, subject
+    assignments change the student_subjects count/max id, and school name or
+    logo changes bump school_settings.updated_at.
+    """
+    students = db.query(func.count(Student.id), func.max(Student.updated_at))
+    subjects = db.query(func.count(StudentSubject.id), func.max(StudentSubject.id)).join(
+        Student, Student.id == StudentSubject.student_id
+    )
+    if school_year:
+        students = students.filter(Student.school_year == school_year)
+        subjects = subjects.filter(Student.school_year == school_year)
+    if semester:
+        students = students.filter(Student.semester == semester)
+        subjects = subjects.filter(Student.semester == semester)
+    student_count, students_updated = students.one()
+    subject_count, last_subject_id = subjects.one()
+    settings_updated = db.query(SchoolSettings.updated_at).filter(SchoolSettings.id == 1).scalar()
+
+    stamp = [
+        "enrollment_report", REPORT_LAYOUT_VERSION, school_year, semester,
+        student_count, str(students_updated), subject_count, last_subject_id, str(settings_updated),
+    ]
+    return hashlib.sha256(json.dumps(stamp).encode()).hexdigest()
+
+
+def report_etag(key: str) -> str:
+    return f'"{key[:32]}"'
+
+
+def cached_report(key: str) -> str | None:
+    """Path of the cached PDF for `key`, or None. A hit refreshes the file's retention clock."""
+    path = os.path.join(_cache_dir(), f"{key}.pdf")
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        return None
+    return path
+
+
+def store_report(key: str, write: Callable[[str], None]) -> str:
+    """Have `write(tmp_path)` render the report to disk, then publish it under `key`.
+
+    The PDF goes straight to a temporary file next to its final path, so large
+    reports never sit in memory as one bytes object, and readers only ever see
+    a complete file.
+    """
+    os.makedirs(_cache_dir(), exist_ok=True)
+    path = os.path.join(_cache_dir(), f"{key}.pdf")
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(tmp_path)
+        raise
+    return path
+
+
+def purge_report_cache(max_age_seconds: float) -> int:
+    """Delete cached reports not used for `max_age_seconds`. Returns how many were removed."""
+    removed = 0
+    cutoff = time.time() - max_age_seconds
+    try:
+        entries = list(os.scandir(_cache_dir()))
+    except FileNotFoundError:
+        return 0
+    for entry in entries:
+        try:
+            if entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+                removed += 1
+        except FileNotFoundError:
+            pass
+    return removed
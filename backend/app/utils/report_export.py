@@ -0,0 +1,182 @@
+"""Enrollment report data as CSV, XLSX, Parquet or Arrow for analysts.
+
+Two datasets are available: the enrolled roster (one row per student) and a
+summary in long form (breakdown, category, count) covering the same counts as
+the PDF. Roster rows come from report_queries in batches over a server-side
+cursor and are written out batch by batch:
+
+- csv, parquet and arrow (IPC stream) are generated chunk by chunk, so the
+  response starts before the query finishes and memory stays flat;
+- xlsx uses openpyxl's write-only mode, which spools rows to disk, and holds
+  both datasets as sheets.
+
+pyarrow is imported on first use; it is only needed for parquet and arrow.
+"""
+
+import csv
+import io
+import os
+import tempfile
+from typing import Iterable, Iterator
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.utils.report_queries import (
+    ReportStudent, breakdowns, enrolled_roster_query, iter_enrolled_roster, status_counts,
+)
+
+# format -> (media type, file extension)
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "xlsx": ("application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", "xlsx"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows"),
+}
+ROSTER_COLUMNS = ReportStudent._fields
+SUMMARY_COLUMNS = ("breakdown", "category", "count")
+
+
+def summary_rows(db: Session, school_year: str | None, semester: str | None) -> list[tuple[str, str, int]]:
+    counts = status_counts(db, school_year, semester)
+    enrolled = enrolled_roster_query(db, school_year, semester).order_by(None).count()
+    rows = [
+        ("status", "Total", counts.total),
+        ("status", "Pending", counts.pending),
+        ("status", "Approved", counts.approved),
+        ("status", "Denied", counts.denied),
+        ("status", "Fully Enrolled", enrolled),
+    ]
+    for name, values in breakdowns(db, school_year, semester).items():
+        rows.extend((name, category, count) for category, count in values.items())
+    return rows
+
+
+def _dataset(
+    db: Session, dataset: str, school_year: str | None, semester: str | None
+) -> tuple[tuple[str, ...], Iterable[list[tuple]]]:
+    """Column names and row batches for `dataset` ("roster" or "summary")."""
+    if dataset == "summary":
+        return SUMMARY_COLUMNS, [summary_rows(db, school_year, semester)]
+    return ROSTER_COLUMNS, iter_enrolled_roster(db, school_year, semester)
+
+
+# ── Streaming formats ─────────────────────────────────────────────────
+
+class _ChunkSink(io.RawIOBase):
+    """A write-only file that hands back what was written since the last drain()."""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data, self._chunks = b"".join(self._chunks), []
+        return data
+
+
+def _csv_chunks(columns: tuple[str, ...], batches: Iterable[list[tuple]]) -> Iterator[bytes]:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(columns)
+    for batch in batches:
+        writer.writerows(batch)
+        yield buf.getvalue().encode()
+        buf.seek(0)
+        buf.truncate()
+    yield buf.getvalue().encode()
+
+
+def _arrow_schema(columns: tuple[str, ...]):
+    import pyarrow as pa
+
+    return pa.schema([(name, pa.int64() if name in ("id", "count") else pa.string()) for name in columns])
+
+
+def _record_batch(schema, batch: list[tuple]):
+    import pyarrow as pa
+
+    columns = list(zip(*batch))
+    return pa.record_batch(
+        [pa.array(values, type=field.type) for field, values in zip(schema, columns)], schema=schema
+    )
+
+
+def _columnar_chunks(fmt: str, columns: tuple[str, ...], batches: Iterable[list[tuple]]) -> Iterator[bytes]:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = _arrow_schema(columns)
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema) if fmt == "parquet" else pa.ipc.new_stream(sink, schema)
+    try:
+        for batch in batches:
+            if batch:
+                writer.write_batch(_record_batch(schema, batch))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def iter_export(fmt: str, dataset: str, school_year: str | None, semester: str | None) -> Iterator[bytes]:
+    """Yield a csv, parquet or arrow export chunk by chunk.
+
+    Uses its own session so the stream outlives the request-scoped one.
+    """
+    db = SessionLocal()
+    try:
+        columns, batches = _dataset(db, dataset, school_year, semester)
+        if fmt == "csv":
+            yield from _csv_chunks(columns, batches)
+        else:
+            yield from _columnar_chunks(fmt, columns, batches)
+    finally:
+        db.close()
+
+
+# ── XLSX ──────────────────────────────────────────────────────────────
+
+def write_xlsx(db: Session, school_year: str | None, semester: str | None) -> str:
+    """Write a workbook with Summary and Enrolled Students sheets to a temp file; the caller removes it."""
+    wb = Workbook(write_only=True)
+    bold = Font(bold=True)
+
+    def header(ws, columns):
+        cells = []
+        for name in columns:
+            cell = WriteOnlyCell(ws, value=name)
+            cell.font = bold
+            cells.append(cell)
+        ws.append(cells)
+
+    for title, dataset in (("Summary", "summary"), ("Enrolled Students", "roster")):
+        ws = wb.create_sheet(title)
+        columns, batches = _dataset(db, dataset, school_year, semester)
+        header(ws, columns)
+        for batch in batches:
+            for row in batch:
+                ws.append(row)
+
+    fd, path = tempfile.mkstemp(prefix="enrollment_export_", suffix=".xlsx")
+    os.close(fd)
+    try:
+        wb.save(path)
+    except BaseException:
+        os.remove(path)
+        raise
+    return path
@@ -0,0 +1,294 @@
+"""Background report jobs.
+
+A request creates a ReportJob row and returns its id at once. The job's
+database queries run on a small thread pool, and the reportlab rendering —
+pure CPU for seconds on large rosters — runs in a process pool so it never
+holds the GIL against API threads. Finished PDFs land in the report cache
+under REPORT_DIR (see report_cache), so a job for unchanged data reuses the
+file an earlier job or request already rendered.
+
+Job state lives in the database, so any worker can answer status and download
+requests; REPORT_DIR must be shared between workers (same host or volume).
+An identical request made within REPORT_JOB_DEDUP_SECONDS of an earlier one
+reuses that job instead of rendering again.
+
+Each process refreshes `heartbeat_at` on the jobs it holds every
+HEARTBEAT_INTERVAL_SECONDS. A queued or running job whose heartbeat is older
+than REPORT_JOB_STALE_SECONDS belongs to a process that died or shut down: it
+is never reused, and reap_stale_jobs (run at startup and periodically) marks
+it failed.
+"""
+
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.report_job import JOB_FAILED, JOB_QUEUED, JOB_RUNNING, JOB_SUCCEEDED, ReportJob
+from app.utils.enrollment_report import collect_enrollment_report, enrollment_report_filename
+from app.utils.metrics import latency
+from app.utils.report_cache import cached_report, enrollment_report_cache_key, purge_report_cache, store_report
+from app.utils.report_pdf import build_enrollment_report
+
+logger = logging.getLogger(__name__)
+
+ENROLLMENT_REPORT = "enrollment_report"
+PURGE_INTERVAL_SECONDS = 600
+HEARTBEAT_INTERVAL_SECONDS = 30
+STALE_JOB_ERROR = "The server stopped working on this report. Please generate it again."
+
+_pool_lock = threading.Lock()
+_render_pool: ProcessPoolExecutor | None = None
+_job_runner: ThreadPoolExecutor | None = None
+_last_purge = 0.0
+
+# Jobs this process has accepted and not finished, kept alive by the heartbeat thread
+_held_jobs: set[str] = set()
+_heartbeat_stop: threading.Event | None = None
+
+
+def get_render_pool() -> ProcessPoolExecutor:
+    """The shared process pool for CPU-bound PDF rendering."""
+    global _render_pool
+    with _pool_lock:
+        if _render_pool is None:
+            _render_pool = ProcessPoolExecutor(
+                max_workers=settings.REPORT_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _render_pool
+
+
+def _get_job_runner() -> ThreadPoolExecutor:
+    global _job_runner
+    with _pool_lock:
+        if _job_runner is None:
+            _job_runner = ThreadPoolExecutor(
+                max_workers=settings.REPORT_WORKERS, thread_name_prefix="report-job"
+            )
+        return _job_runner
+
+
+def shutdown_report_pools() -> None:
+    global _render_pool, _job_runner, _heartbeat_stop
+    with _pool_lock:
+        # Jobs still held stop heartbeating and are reaped by another process or the next start
+        if _heartbeat_stop is not None:
+            _heartbeat_stop.set()
+            _heartbeat_stop = None
+        _held_jobs.clear()
+        if _job_runner is not None:
+            _job_runner.shutdown(wait=False, cancel_futures=True)
+            _job_runner = None
+        if _render_pool is not None:
+            _render_pool.shutdown(wait=False, cancel_futures=True)
+            _render_pool = None
+
+
+def render_enrollment_report(key: str, report_kwargs: dict) -> str:
+    """Render into the report cache under `key` and return the file's path.
+
+    build_enrollment_report runs in the render process pool and writes the PDF
+    to disk itself, so only the path crosses back between processes.
+    """
+    def write(tmp_path: str) -> None:
+        get_render_pool().submit(build_enrollment_report, output=tmp_path, **report_kwargs).result()
+
+    with latency("reports.render").track():
+        return store_report(key, write)
+
+
+def _dedup_key(kind: str, params: dict) -> str:
+    return hashlib.sha256(f"{kind}:{json.dumps(params, sort_keys=True)}".encode()).hexdigest()
+
+
+def _stale_cutoff() -> datetime:
+    return datetime.now(timezone.utc) - timedelta(seconds=settings.REPORT_JOB_STALE_SECONDS)
+
+
+def _find_reusable_job(db: Session, dedup_key: str) -> ReportJob | None:
+    since = datetime.now(timezone.utc) - timedelta(seconds=settings.REPORT_JOB_DEDUP_SECONDS)
+    candidates = (
+        db.query(ReportJob)
+        .filter(
+            ReportJob.dedup_key == dedup_key,
+            ReportJob.created_at >= since,
+            or_(ReportJob.status == JOB_SUCCEEDED, ReportJob.heartbeat_at >= _stale_cutoff()),
+        )
+        .order_by(ReportJob.created_at.desc())
+        .all()
+    )
+    for job in candidates:
+        if job.status != JOB_SUCCEEDED or (job.file_path and os.path.exists(job.file_path)):
+            return job
+    return None
+
+
+def submit_enrollment_report(
+    db: Session, school_year: str | None, semester: str | None, requested_by: int | None
+) -> tuple[ReportJob, bool]:
+    """Queue an enrollment report, or reuse a recent identical one.
+
+    Returns `(job, created)`; the caller commits, then calls start_job(job.id)
+    when `created` is True.
+    """
+    _purge_expired_jobs()
+    params = {"school_year": school_year, "semester": semester}
+    dedup_key = _dedup_key(ENROLLMENT_REPORT, params)
+    existing = _find_reusable_job(db, dedup_key)
+    if existing is not None:
+        return existing, False
+    job = ReportJob(
+        id=uuid.uuid4().hex,
+        kind=ENROLLMENT_REPORT,
+        params=params,
+        dedup_key=dedup_key,
+        status=JOB_QUEUED,
+        filename=enrollment_report_filename(school_year, semester),
+        requested_by=requested_by,
+        heartbeat_at=datetime.now(timezone.utc),
+    )
+    db.add(job)
+    db.flush()
+    return job, True
+
+
+def start_job(job_id: str) -> None:
+    """Hand a committed job to the background runner."""
+    with _pool_lock:
+        _held_jobs.add(job_id)
+    _start_heartbeat()
+    _get_job_runner().submit(_run_job, job_id)
+
+
+def _start_heartbeat() -> None:
+    global _heartbeat_stop
+    with _pool_lock:
+        if _heartbeat_stop is None:
+            _heartbeat_stop = threading.Event()
+            threading.Thread(
+                target=_heartbeat, args=(_heartbeat_stop,), name="report-job-heartbeat", daemon=True
+            ).start()
+
+
+def _heartbeat(stop: threading.Event) -> None:
+    while not stop.wait(HEARTBEAT_INTERVAL_SECONDS):
+        with _pool_lock:
+            job_ids = list(_held_jobs)
+        if not job_ids:
+            continue
+        db = SessionLocal()
+        try:
+            db.query(ReportJob).filter(
+                ReportJob.id.in_(job_ids), ReportJob.status.in_((JOB_QUEUED, JOB_RUNNING))
+            ).update({ReportJob.heartbeat_at: datetime.now(timezone.utc)}, synchronize_session=False)
+            db.commit()
+        except Exception:
+            db.rollback()
+            logger.warning("Could not refresh report job heartbeats", exc_info=True)
+        finally:
+            db.close()
+
+
+def _set_status(job_id: str, from_status: str, **values) -> bool:
+    """Move the job on from `from_status`. False if it has left that status (e.g. reaped as stale)."""
+    db = SessionLocal()
+    try:
+        updated = (
+            db.query(ReportJob)
+            .filter(ReportJob.id == job_id, ReportJob.status == from_status)
+            .update(values, synchronize_session=False)
+        )
+        db.commit()
+        return bool(updated)
+    finally:
+        db.close()
+
+
+def _run_job(job_id: str) -> None:
+    try:
+        _execute_job(job_id)
+    finally:
+        with _pool_lock:
+            _held_jobs.discard(job_id)
+
+
+def _execute_job(job_id: str) -> None:
+    if not _set_status(job_id, JOB_QUEUED, status=JOB_RUNNING, started_at=datetime.now(timezone.utc)):
+        return
+    try:
+        db = SessionLocal()
+        try:
+            params = db.get(ReportJob, job_id).params
+            key = enrollment_report_cache_key(db, params["school_year"], params["semester"])
+            path = cached_report(key)
+            if path is None:
+                report_kwargs = collect_enrollment_report(db, params["school_year"], params["semester"])
+        finally:
+            db.close()
+        if path is None:
+            path = render_enrollment_report(key, report_kwargs)
+    except Exception as exc:
+        logger.exception("Report job %s failed", job_id)
+        _set_status(job_id, JOB_RUNNING, status=JOB_FAILED, error=str(exc) or exc.__class__.__name__,
+                    finished_at=datetime.now(timezone.utc))
+        return
+    _set_status(job_id, JOB_RUNNING, status=JOB_SUCCEEDED, file_path=path, finished_at=datetime.now(timezone.utc))
+
+
+def reap_stale_jobs() -> int:
+    """Fail queued/running jobs whose heartbeat stopped. Returns the number failed."""
+    db = SessionLocal()
+    try:
+        reaped = (
+            db.query(ReportJob)
+            .filter(
+                ReportJob.status.in_((JOB_QUEUED, JOB_RUNNING)),
+                or_(ReportJob.heartbeat_at.is_(None), ReportJob.heartbeat_at < _stale_cutoff()),
+            )
+            .update(
+                {
+                    ReportJob.status: JOB_FAILED,
+                    ReportJob.error: STALE_JOB_ERROR,
+                    ReportJob.finished_at: datetime.now(timezone.utc),
+                },
+                synchronize_session=False,
+            )
+        )
+        db.commit()
+    finally:
+        db.close()
+    if reaped:
+        logger.warning("Marked %d stale report job(s) as failed", reaped)
+    return reaped
+
+
+def _purge_expired_jobs() -> None:
+    """Drop jobs, and cached reports unused for REPORT_JOB_RETENTION_HOURS, at most every few minutes."""
+    global _last_purge
+    now = time.time()
+    if now - _last_purge < PURGE_INTERVAL_SECONDS:
+        return
+    _last_purge = now
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=settings.REPORT_JOB_RETENTION_HOURS)
+    db = SessionLocal()
+    try:
+        db.query(ReportJob).filter(ReportJob.created_at < cutoff).delete(synchronize_session=False)
+        db.commit()
+        purge_report_cache(settings.REPORT_JOB_RETENTION_HOURS * 3600)
+    except Exception:
+        db.rollback()
+        logger.warning("Could not purge expired report jobs", exc_info=True)
+    finally:
+        db.close()
@@ -3,21 +3,25 @@
 import logging
 from io import BytesIO
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
+from typing import NamedTuple
+from xml.sax.saxutils import escape
 
 try:
     from PIL import Image as PILImage
-    _PIL_AVAILABLE = True
+    PIL_AVAILABLE = True
 except ImportError:
-    _PIL_AVAILABLE = False
+    PIL_AVAILABLE = False
 
+from reportlab import rl_config
 from reportlab.lib.pagesizes import letter
 from reportlab.lib import colors
 from reportlab.lib.units import inch
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.enums import TA_CENTER
 from reportlab.platypus import (
-    SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, HRFlowable, PageBreak, Image,
+    SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, HRFlowable, PageBreak, Image, Flowable,
 )
 from reportlab.lib.utils import ImageReader
 from reportlab.graphics.shapes import Drawing, String, Rect, Group
@@ -27,6 +31,13 @@ from reportlab.graphics.charts.legends import Legend
 
 logger = logging.getLogger(__name__)
 
+# Embed images as binary streams. ASCII85 only helps 7-bit transports, and
+# without the optional C accelerator reportlab encodes it in pure Python —
+# the bulk of a report's fixed cost for the logo and watermark.
+rl_config.useA85 = 0
+
+BUNDLED_LOGO_PATH = Path(__file__).parent.parent / "static" / "logo.png"
+
 # ── Brand colours ─────────────────────────────────────────────────────
 HEADER_BG  = colors.HexColor("#065f46")
 HEADER_FG  = colors.white
@@ -277,6 +288,180 @@ def _make_hbar(data_dict: dict, w: float, h: float, title: str,
     return _card(drawing, w, h, title, description)
 
 
+# ── Roster table (laid out one page at a time) ────────────────────────
+
+ROSTER_HEADER = ["#", "Student No.", "Full Name", "Grade", "Strand", "Semester", "School Year"]
+ROSTER_COL_WIDTHS = [0.35*inch, 1.0*inch, 2.0*inch, 0.7*inch, 0.85*inch, 1.05*inch, 1.05*inch]
+ROSTER_STYLE = TableStyle([
+    ("BACKGROUND",    (0, 0), (-1, 0),  HEADER_BG),
+    ("TEXTCOLOR",     (0, 0), (-1, 0),  HEADER_FG),
+    ("FONTNAME",      (0, 0), (-1, 0),  "Helvetica-Bold"),
+    ("FONTSIZE",      (0, 0), (-1, 0),  9),
+    ("ALIGN",         (0, 0), (-1, 0),  "CENTER"),
+    ("FONTNAME",      (0, 1), (-1, -1), "Helvetica"),
+    ("FONTSIZE",      (0, 1), (-1, -1), 8),
+    ("ALIGN",         (0, 1), (0, -1),  "CENTER"),
+    ("ALIGN",         (1, 1), (1, -1),  "CENTER"),
+    ("ALIGN",         (3, 1), (6, -1),  "CENTER"),
+    ("ROWBACKGROUND", (0, 1), (-1, -1), [colors.white, ROW_ALT]),
+    ("GRID",          (0, 0), (-1, -1), 0.5, BORDER),
+    ("VALIGN",        (0, 0), (-1, -1), "MIDDLE"),
+    ("TOPPADDING",    (0, 0), (-1, -1), 5),
+    ("BOTTOMPADDING", (0, 0), (-1, -1), 5),
+    ("LEFTPADDING",   (0, 0), (-1, -1), 4),
+])
+
+
+def _roster_row(idx: int, s) -> list[str]:
+    parts = [s.last_name or "", s.first_name or "", s.middle_name or ""]
+    full_name = ", ".join(p for p in parts if p).strip(", ") or f"Student ID {s.id}"
+    return [
+        str(idx),
+        s.student_number or "—",
+        full_name,
+        s.grade_level_to_enroll or "—",
+        s.strand or "—",
+        s.semester or "—",
+        s.school_year or "—",
+    ]
+
+
+class RosterTable(Flowable):
+    """The enrolled-students table, built one page-sized Table at a time.
+
+    A single Table holding every row is split again and again as pages fill,
+    which is quadratic in the roster size, and all of its cells stay in memory
+    until the document is finished. This flowable only materialises the rows
+    that fit in the space on offer; the rest stay as plain student tuples
+    until their page comes up. Each page's chunk repeats the header row.
+    """
+
+    def __init__(self, students, start: int = 0, row_heights: tuple[float, float] | None = None):
+        super().__init__()
+        self.students = students
+        self.start = start
+        self._row_heights = row_heights
+        self._table: Table | None = None
+
+    def _chunk(self, end: int) -> Table:
+        rows = [ROSTER_HEADER] + [
+            _roster_row(idx + 1, self.students[idx]) for idx in range(self.start, end)
+        ]
+        table = Table(rows, colWidths=ROSTER_COL_WIDTHS)
+        table.setStyle(ROSTER_STYLE)
+        return table
+
+    def _measure(self, avail_width: float) -> tuple[float, float]:
+        """Header and body row heights; every body row is one line of the same font."""
+        if self._row_heights is None:
+            probe = self._chunk(min(self.start + 1, len(self.students)))
+            probe.wrap(avail_width, 0)
+            self._row_heights = probe._rowHeights[0], probe._rowHeights[-1]
+        return self._row_heights
+
+    def wrap(self, avail_width, avail_height):
+        header_h, row_h = self._measure(avail_width)
+        remaining = len(self.students) - self.start
+        if header_h + remaining * row_h <= avail_height:
+            self._table = self._chunk(len(self.students))
+            return self._table.wrap(avail_width, avail_height)
+        # Too tall for this frame: report so, and let split() hand back one page
+        return avail_width, header_h + remaining * row_h
+
+    def split(self, avail_width, avail_height):
+        header_h, row_h = self._measure(avail_width)
+        count = int((avail_height - header_h) // row_h)
+        if count <= 0:
+            return []
+        end = min(self.start + count, len(self.students))
+        table = self._chunk(end)
+        if end == len(self.students):
+            return [table]
+        return [table, RosterTable(self.students, end, self._row_heights)]
+
+    def draw(self):
+        self._table.drawOn(self.canv, 0, 0)
+
+
+# ── Shared assets (prepared once per process) ─────────────────────────
+
+class LogoAssets(NamedTuple):
+    """A school logo and its faded watermark, shared by every PDF builder."""
+
+    logo_bytes: bytes
+    watermark: ImageReader | None
+
+
+def make_watermark(logo_bytes: bytes) -> ImageReader | None:
+    """The logo at 7 % opacity for page backgrounds, or None without Pillow or for an unreadable image."""
+    if not PIL_AVAILABLE:
+        return None
+    try:
+        wm = PILImage.open(BytesIO(logo_bytes)).convert("RGBA")
+        r, g, b, a = wm.split()
+        a = a.point(lambda x: int(x * 0.07))   # 7 % opacity
+        wm = PILImage.merge("RGBA", (r, g, b, a))
+        buf = BytesIO()
+        wm.save(buf, format="PNG")
+        buf.seek(0)
+        return ImageReader(buf)
+    except Exception:
+        logger.warning("Could not build watermark image", exc_info=True)
+        return None
+
+
+@lru_cache(maxsize=4)
+def _load_logo_assets(path: str, mtime: float) -> LogoAssets:
+    logo_bytes = Path(path).read_bytes()
+    return LogoAssets(logo_bytes, make_watermark(logo_bytes))
+
+
+def logo_assets(logo_path: str | None) -> LogoAssets | None:
+    """Logo bytes and processed watermark for `logo_path` (default: the bundled logo).
+
+    Cached per file and modification time, so a replaced file is picked up.
+    """
+    for path in filter(None, (logo_path, BUNDLED_LOGO_PATH)):
+        try:
+            mtime = Path(path).stat().st_mtime
+        except OSError:
+            logger.warning("School logo not found at %s", path)
+            continue
+        return _load_logo_assets(str(path), mtime)
+    return None
+
+
+@lru_cache(maxsize=1)
+def _report_styles() -> dict[str, ParagraphStyle]:
+    styles = getSampleStyleSheet()
+    return {
+        "title": ParagraphStyle(
+            "Title2", parent=styles["Title"],
+            fontSize=16, leading=20, textColor=HEADER_BG,
+            alignment=TA_CENTER, spaceAfter=2,
+        ),
+        "section": ParagraphStyle(
+            "Section", parent=styles["Heading2"],
+            fontSize=11, textColor=HEADER_BG,
+            spaceBefore=8, spaceAfter=4,
+        ),
+        "body": ParagraphStyle(
+            "Body2", parent=styles["Normal"],
+            fontSize=10, textColor=TEXT_DARK, leading=14,
+        ),
+        "school_name": ParagraphStyle(
+            "SchoolName", parent=styles["Normal"],
+            fontSize=11, fontName="Helvetica-Bold",
+            textColor=HEADER_BG, alignment=TA_CENTER, leading=14,
+        ),
+        "report_title": ParagraphStyle(
+            "ReportTitle2", parent=styles["Normal"],
+            fontSize=8, fontName="Helvetica",
+            textColor=TEXT_MUTED, alignment=TA_CENTER,
+        ),
+    }
+
+
 # ── Main builder ───────────────────────────────────────────────────────
 
 def build_enrollment_report(
@@ -294,8 +479,15 @@ def build_enrollment_report(
     by_sex: dict | None = None,
     by_payment: dict | None = None,
     school_name: str = "",
-) -> bytes:
-    buffer = BytesIO()
+    logo_path: str | None = None,
+    output=None,
+) -> bytes | None:
+    """Render the enrollment report.
+
+    Written to `output` (a path or binary file object) when given, otherwise
+    returned as bytes.
+    """
+    buffer = BytesIO() if output is None else output
 
     now_str  = datetime.now().strftime("%B %d, %Y  %I:%M %p")
 
@@ -304,13 +496,12 @@ def build_enrollment_report(
         canvas.saveState()
 
         # Watermark — centred on the page
-        if _watermark_buf is not None:
+        if _watermark is not None:
             try:
-                _watermark_buf.seek(0)
                 page_w, page_h = letter
                 wm_size = 4.5 * inch
                 canvas.drawImage(
-                    ImageReader(_watermark_buf),
+                    _watermark,
                     (page_w - wm_size) / 2,
                     (page_h - wm_size) / 2,
                     width=wm_size,
@@ -340,21 +531,10 @@ def build_enrollment_report(
         bottomMargin=0.75 * inch,
     )
 
-    styles = getSampleStyleSheet()
-    title_style = ParagraphStyle(
-        "Title2", parent=styles["Title"],
-        fontSize=16, leading=20, textColor=HEADER_BG,
-        alignment=TA_CENTER, spaceAfter=2,
-    )
-    section_style = ParagraphStyle(
-        "Section", parent=styles["Heading2"],
-        fontSize=11, textColor=HEADER_BG,
-        spaceBefore=8, spaceAfter=4,
-    )
-    body_style = ParagraphStyle(
-        "Body2", parent=styles["Normal"],
-        fontSize=10, textColor=TEXT_DARK, leading=14,
-    )
+    styles = _report_styles()
+    title_style = styles["title"]
+    section_style = styles["section"]
+    body_style = styles["body"]
 
     story  = []
     PAGE_W = 7.0 * inch
@@ -367,26 +547,10 @@ def build_enrollment_report(
 
     # ── Reusable blocks ───────────────────────────────────────────────
 
-    # Load the bundled school logo (logo.png next to this file's static folder)
-    _logo_path = Path(__file__).parent.parent / "static" / "logo.png"
-    _logo_img_data: BytesIO | None = None
-    if _logo_path.exists():
-        _logo_img_data = BytesIO(_logo_path.read_bytes())
-    else:
-        logger.warning("School logo not found at %s", _logo_path)
-
-    # ── Watermark image (pre-processed once, reused every page) ──────
-    _watermark_buf: BytesIO | None = None
-    if _PIL_AVAILABLE and _logo_path.exists():
-        try:
-            wm = PILImage.open(_logo_path).convert("RGBA")
-            r, g, b, a = wm.split()
-            a = a.point(lambda x: int(x * 0.07))   # 7 % opacity
-            wm = PILImage.merge("RGBA", (r, g, b, a))
-            _watermark_buf = BytesIO()
-            wm.save(_watermark_buf, format="PNG")
-        except Exception:
-            logger.warning("Could not build watermark image", exc_info=True)
+    # School logo and its watermark (pre-processed once per process, reused every page)
+    _assets = logo_assets(logo_path)
+    _logo_img_data = BytesIO(_assets.logo_bytes) if _assets else None
+    _watermark = _assets.watermark if _assets else None
 
     LOGO_SIZE = 0.55 * inch   # square logo
 
@@ -400,18 +564,10 @@ def build_enrollment_report(
             logo_cell = Image(_logo_img_data, width=LOGO_SIZE, height=LOGO_SIZE) \
                 if _logo_img_data else Spacer(LOGO_SIZE, LOGO_SIZE)
 
-            school_name_style = ParagraphStyle(
-                "SchoolName", parent=styles["Normal"],
-                fontSize=11, fontName="Helvetica-Bold",
-                textColor=HEADER_BG, alignment=TA_CENTER, leading=14,
-            )
-            report_title_style = ParagraphStyle(
-                "ReportTitle2", parent=styles["Normal"],
-                fontSize=8, fontName="Helvetica",
-                textColor=TEXT_MUTED, alignment=TA_CENTER,
-            )
+            school_name_style = styles["school_name"]
+            report_title_style = styles["report_title"]
             name_block = [
-                Paragraph(school_name, school_name_style) if school_name else Spacer(1, 14),
+                Paragraph(escape(school_name), school_name_style) if school_name else Spacer(1, 14),
                 Paragraph("STUDENT ENROLLMENT REPORT", report_title_style),
             ]
             identity_table = Table(
@@ -652,45 +808,9 @@ def build_enrollment_report(
             "No fully enrolled students found for the selected filters.", body_style
         ))
     else:
-        enrolled_data = [[
-            "#", "Student No.", "Full Name", "Grade", "Strand", "Semester", "School Year",
-        ]]
-        for idx, s in enumerate(students, start=1):
-            parts = [s.last_name or "", s.first_name or "", s.middle_name or ""]
-            full_name = ", ".join(p for p in parts if p).strip(", ") or f"Student ID {s.id}"
-            enrolled_data.append([
-                str(idx),
-                s.student_number or "—",
-                full_name,
-                s.grade_level_to_enroll or "—",
-                s.strand or "—",
-                s.semester or "—",
-                s.school_year or "—",
-            ])
-
-        col_widths = [0.35*inch, 1.0*inch, 2.0*inch, 0.7*inch, 0.85*inch, 1.05*inch, 1.05*inch]
-        enrolled_table = Table(enrolled_data, colWidths=col_widths, repeatRows=1)
-        enrolled_table.setStyle(TableStyle([
-            ("BACKGROUND",    (0, 0), (-1, 0),  HEADER_BG),
-            ("TEXTCOLOR",     (0, 0), (-1, 0),  HEADER_FG),
-            ("FONTNAME",      (0, 0), (-1, 0),  "Helvetica-Bold"),
-            ("FONTSIZE",      (0, 0), (-1, 0),  9),
-            ("ALIGN",         (0, 0), (-1, 0),  "CENTER"),
-            ("FONTNAME",      (0, 1), (-1, -1), "Helvetica"),
-            ("FONTSIZE",      (0, 1), (-1, -1), 8),
-            ("ALIGN",         (0, 1), (0, -1),  "CENTER"),
-            ("ALIGN",         (1, 1), (1, -1),  "CENTER"),
-            ("ALIGN",         (3, 1), (6, -1),  "CENTER"),
-            ("ROWBACKGROUND", (0, 1), (-1, -1), [colors.white, ROW_ALT]),
-            ("GRID",          (0, 0), (-1, -1), 0.5, BORDER),
-            ("VALIGN",        (0, 0), (-1, -1), "MIDDLE"),
-            ("TOPPADDING",    (0, 0), (-1, -1), 5),
-            ("BOTTOMPADDING", (0, 0), (-1, -1), 5),
-            ("LEFTPADDING",   (0, 0), (-1, -1), 4),
-        ]))
-        story.append(enrolled_table)
-
+        story.append(RosterTable(students))
 
     doc.build(story, onFirstPage=_on_page, onLaterPages=_on_page)
-    buffer.seek(0)
-    return buffer.read()
+    if output is None:
+        return buffer.getvalue()
+    return None
@@ -0,0 +1,114 @@
+"""Queries behind the enrollment report, shared by the PDF and the data exports.
+
+Everything here selects plain columns and returns counts, dicts or row
+tuples; no Student objects are loaded. Counts come from the enrollment
+rollups (see enrollment_rollups), the roster from students. Filters are
+optional throughout.
+"""
+
+from typing import Iterator, NamedTuple
+
+from sqlalchemy.orm import Query, Session
+
+from app.models.student import EnrollmentType, Sex, Student, StudentStatus
+from app.models.student_subject import StudentSubject
+from app.utils.enrollment_rollups import rollup_counts
+
+ROSTER_BATCH = 1000
+
+
+class ReportStudent(NamedTuple):
+    """The roster columns used by the report table and the exports."""
+
+    id: int
+    student_number: str | None
+    last_name: str | None
+    first_name: str | None
+    middle_name: str | None
+    grade_level_to_enroll: str | None
+    strand: str | None
+    semester: str | None
+    school_year: str | None
+
+
+class StatusCounts(NamedTuple):
+    total: int
+    pending: int
+    approved: int
+    denied: int
+
+
+def _label(value, title: bool = True) -> str:
+    text = value.value if hasattr(value, "value") else str(value)
+    return text.replace("_", " ").title() if title else text
+
+
+def filter_students(query: Query, school_year: str | None, semester: str | None) -> Query:
+    if school_year:
+        query = query.filter(Student.school_year == school_year)
+    if semester:
+        query = query.filter(Student.semester == semester)
+    return query
+
+
+def status_counts(db: Session, school_year: str | None, semester: str | None) -> StatusCounts:
+    by_status = rollup_counts(db, "status", school_year, semester)
+    return StatusCounts(
+        total=sum(by_status.values()),
+        pending=by_status.get(StudentStatus.PENDING.name, 0),
+        approved=by_status.get(StudentStatus.APPROVED.name, 0),
+        denied=by_status.get(StudentStatus.DENIED.name, 0),
+    )
+
+
+# Breakdown name -> (enum stored by name in the rollup, whether labels are title-cased for display)
+BREAKDOWNS = {
+    "strand": (None, False),
+    "grade_level": (None, False),
+    "enrollment_type": (EnrollmentType, True),
+    "sex": (Sex, True),
+    "payment_status": (None, True),
+}
+
+
+def breakdowns(db: Session, school_year: str | None, semester: str | None) -> dict[str, dict[str, int]]:
+    """Student counts per value of each BREAKDOWNS dimension, labelled as the report shows them.
+
+    Read from the enrollment rollups rather than the students table.
+    """
+    result = {}
+    for name, (enum_type, title) in BREAKDOWNS.items():
+        counts = rollup_counts(db, name, school_year, semester)
+        result[name] = {
+            _label(enum_type[value] if enum_type else value, title) if title else value: count
+            for value, count in counts.items()
+        }
+    return result
+
+
+def enrolled_roster_query(db: Session, school_year: str | None, semester: str | None) -> Query:
+    """Fully enrolled students (payment verified, at least one subject) as ReportStudent columns."""
+    query = db.query(*(getattr(Student, name) for name in ReportStudent._fields)).filter(
+        Student.payment_status == "verified",
+        db.query(StudentSubject).filter(StudentSubject.student_id == Student.id).exists(),
+    )
+    return filter_students(query, school_year, semester).order_by(Student.last_name, Student.first_name)
+
+
+def iter_enrolled_roster(
+    db: Session, school_year: str | None, semester: str | None, batch_size: int = ROSTER_BATCH
+) -> Iterator[list[ReportStudent]]:
+    """The enrolled roster in batches, read with a server-side cursor."""
+    rows = (
+        enrolled_roster_query(db, school_year, semester)
+        .execution_options(stream_results=True)
+        .yield_per(batch_size)
+    )
+    batch = []
+    for row in rows:
+        batch.append(ReportStudent(*row))
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
@@ -0,0 +1,58 @@
+"""Shared ORM-to-schema serializers used by the admin, registrar and student routers."""
+
+from sqlalchemy.orm import Query, joinedload
+
+from app.models.student import Student
+from app.models.user import User
+from app.schemas.student import (
+    StudentListResponse,
+    StudentResponse,
+    StudentSummaryListResponse,
+    StudentSummaryResponse,
+)
+
+_STUDENT_COLUMNS = tuple(c.name for c in Student.__table__.columns)
+
+# Add to any query whose rows go through student_to_response, so the account
+# email comes back in the same SELECT instead of one lazy users query per row.
+with_student_email = joinedload(Student.user).load_only(User.email)
+
+# Only what the list grids display; selected directly instead of loading full rows
+STUDENT_SUMMARY_COLUMNS = tuple(
+    getattr(Student, name) for name in StudentSummaryResponse.model_fields if name != "email"
+) + (User.email.label("email"),)
+
+
+def student_to_response(student: Student, email: str | None = None) -> StudentResponse:
+    """Serialize a Student. Pass `email` when the caller already has it."""
+    # Loaded column values sit in the instance __dict__; reading them there skips
+    # the instrumented attribute lookup, which costs more than validating the row.
+    # Expired or deferred columns are missing from it and go through getattr.
+    state = student.__dict__
+    data = {name: state[name] if name in state else getattr(student, name) for name in _STUDENT_COLUMNS}
+    if email is None and student.user:
+        email = student.user.email
+    data["email"] = email
+    # Ensure documents_path is a list
+    if data.get("documents_path") is None:
+        data["documents_path"] = []
+    return StudentResponse.model_validate(data)
+
+
+def student_page(query: Query, view: str, order_by: tuple, page: int, per_page: int) -> list:
+    """Fetch one page of a Student query as full responses or, for view="summary", slim ones."""
+    if view == "summary":
+        query = query.outerjoin(User, User.id == Student.user_id).with_entities(*STUDENT_SUMMARY_COLUMNS)
+    else:
+        query = query.options(with_student_email)
+    rows = query.order_by(*order_by).offset((page - 1) * per_page).limit(per_page).all()
+    if view == "summary":
+        return [StudentSummaryResponse.model_validate(row._mapping) for row in rows]
+    return [student_to_response(s) for s in rows]
+
+
+def student_list_response(students: list, view: str, total: int, page: int, per_page: int):
+    """Wrap a page from student_page in the list schema matching its view."""
+    if view == "summary":
+        return StudentSummaryListResponse(students=students, total=total, page=page, per_page=per_page)
+    return StudentListResponse(students=students, total=total, page=page, per_page=per_page)
@@ -0,0 +1,72 @@
+"""Cloudflare Turnstile verification over a pooled keep-alive HTTP client."""
+
+import logging
+import time
+from collections import OrderedDict
+
+import httpx
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Turnstile tokens are valid for 300s and are single-use
+TOKEN_TTL_SECONDS = 300
+MAX_TRACKED_TOKENS = 50_000
+
+
+class TurnstileVerifier:
+    """Async siteverify client that also refuses tokens it has already seen.
+
+    The seen-token cache is per process, so it complements (not replaces)
+    Cloudflare's own single-use check when running several workers.
+    """
+
+    def __init__(self, verify_url: str, secret_key: str):
+        self.verify_url = verify_url
+        self.secret_key = secret_key
+        self._client: httpx.AsyncClient | None = None
+        self._seen: OrderedDict[str, float] = OrderedDict()
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(5.0, connect=2.0),
+                limits=httpx.Limits(max_connections=50, max_keepalive_connections=20, keepalive_expiry=60),
+            )
+        return self._client
+
+    def _claim(self, token: str) -> bool:
+        """Record the token as used. Returns False if it was already used."""
+        now = time.monotonic()
+        # Entries are inserted in expiry order, so expired ones are at the front
+        while self._seen and (next(iter(self._seen.values())) <= now or len(self._seen) >= MAX_TRACKED_TOKENS):
+            self._seen.popitem(last=False)
+        if token in self._seen:
+            return False
+        self._seen[token] = now + TOKEN_TTL_SECONDS
+        return True
+
+    async def verify(self, token: str, remote_ip: str | None = None) -> bool:
+        """Verify a Turnstile token. Returns True if valid."""
+        if not self.secret_key:
+            return True  # Skip verification if not configured
+        if not token or not self._claim(token):
+            return False
+        data = {"secret": self.secret_key, "response": token}
+        if remote_ip:
+            data["remoteip"] = remote_ip
+        try:
+            resp = await self._get_client().post(self.verify_url, data=data)
+            return resp.json().get("success", False)
+        except (httpx.HTTPError, ValueError):
+            logger.warning("Turnstile verification request failed", exc_info=True)
+            return False
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+turnstile_verifier = TurnstileVerifier(settings.TURNSTILE_VERIFY_URL, settings.TURNSTILE_SECRET_KEY)
@@ -0,0 +1,125 @@
+"""Local stand-ins for third-party auth services, for offline testing and benchmarks.
+
+Usage:
+    python local_stubs.py [--port 8765] [--client-id <GOOGLE_CLIENT_ID>]
+
+Then start the API with:
+    GOOGLE_CERTS_URL=http://127.0.0.1:8765/google/certs
+    TURNSTILE_VERIFY_URL=http://127.0.0.1:8765/turnstile/siteverify
+
+Endpoints:
+    GET  /google/certs                      JWKS for the stub's signing key
+    GET  /google/token?email=a@b.com&sub=1  mint an ID token the API will accept
+    POST /turnstile/siteverify              accepts any token not starting with "fail",
+                                            once (reuse fails like Cloudflare's)
+"""
+
+import argparse
+import json
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwk, jwt
+
+from app.config import settings
+
+KEY_ID = f"local-{uuid.uuid4().hex[:8]}"
+_private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+PRIVATE_PEM = _private_key.private_bytes(
+    serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+).decode()
+PUBLIC_PEM = _private_key.public_key().public_bytes(
+    serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+).decode()
+JWKS = {"keys": [{**jwk.construct(PUBLIC_PEM, "RS256").to_dict(), "kid": KEY_ID, "use": "sig"}]}
+
+
+def mint_google_token(client_id: str, email: str, sub: str, lifetime: int = 3600) -> str:
+    now = int(time.time())
+    claims = {
+        "iss": "https://accounts.google.com",
+        "aud": client_id,
+        "sub": sub,
+        "email": email,
+        "email_verified": True,
+        "iat": now,
+        "exp": now + lifetime,
+    }
+    return jwt.encode(claims, PRIVATE_PEM, algorithm="RS256", headers={"kid": KEY_ID})
+
+
+def make_handler(client_id: str):
+    used_turnstile_tokens: set[str] = set()
+    lock = threading.Lock()
+
+    class StubHandler(BaseHTTPRequestHandler):
+        def _send_json(self, body: dict, status: int = 200, headers: dict | None = None):
+            payload = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            query = {k: v[0] for k, v in parse_qs(url.query).items()}
+            if url.path == "/google/certs":
+                self._send_json(JWKS, headers={"Cache-Control": "public, max-age=3600"})
+            elif url.path == "/google/token":
+                email = query.get("email", "student@example.com")
+                token = mint_google_token(client_id, email, query.get("sub", email))
+                self._send_json({"credential": token})
+            else:
+                self._send_json({"detail": "Not found"}, status=404)
+
+        def do_POST(self):
+            url = urlparse(self.path)
+            length = int(self.headers.get("Content-Length") or 0)
+            form = {k: v[0] for k, v in parse_qs(self.rfile.read(length).decode()).items()}
+            if url.path == "/turnstile/siteverify":
+                token = form.get("response", "")
+                with lock:
+                    duplicate = token in used_turnstile_tokens
+                    used_turnstile_tokens.add(token)
+                if not form.get("secret"):
+                    self._send_json({"success": False, "error-codes": ["missing-input-secret"]})
+                elif duplicate:
+                    self._send_json({"success": False, "error-codes": ["timeout-or-duplicate"]})
+                elif not token or token.startswith("fail"):
+                    self._send_json({"success": False, "error-codes": ["invalid-input-response"]})
+                else:
+                    self._send_json({"success": True, "hostname": "localhost", "error-codes": []})
+            else:
+                self._send_json({"detail": "Not found"}, status=404)
+
+        def log_message(self, format, *args):
+            pass
+
+    return StubHandler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--client-id", default=settings.GOOGLE_CLIENT_ID or "local-client-id")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(args.client_id))
+    print(f"Stubs listening on http://{args.host}:{args.port} (client id {args.client_id})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Audit log partition maintenance — list, pre-create, or detach monthly partitions.
+
+Usage:
+    python manage_audit_partitions.py list
+    python manage_audit_partitions.py ensure [--months-ahead 3]
+    python manage_audit_partitions.py detach 2025-06 [--drop]
+    python manage_audit_partitions.py detach-before 2025-06 [--drop]
+
+`ensure` moves any rows already sitting in DEFAULT for a month it creates into
+that month's partition. The API runs it on startup and every
+AUDIT_LOG_PARTITION_CHECK_HOURS.
+
+Detached partitions remain as ordinary tables (e.g. audit_logs_y2025m05) so they
+can be dumped with pg_dump and archived before being dropped.
+"""
+
+import argparse
+from datetime import date, datetime
+
+from app.config import settings
+from app.database import engine
+from app.utils.audit_partitions import (
+    detach_audit_partition,
+    detach_partitions_before,
+    ensure_audit_partitions,
+    list_audit_partitions,
+)
+
+
+def _month(value: str) -> date:
+    return datetime.strptime(value, "%Y-%m").date()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("list", help="List attached partitions")
+
+    ensure = sub.add_parser("ensure", help="Create partitions for this month and the next N months")
+    ensure.add_argument("--months-ahead", type=int, default=settings.AUDIT_LOG_PARTITION_MONTHS_AHEAD)
+
+    detach = sub.add_parser("detach", help="Detach one month (YYYY-MM)")
+    detach.add_argument("month", type=_month)
+    detach.add_argument("--drop", action="store_true", help="Drop the table after detaching")
+
+    before = sub.add_parser("detach-before", help="Detach every month before YYYY-MM")
+    before.add_argument("month", type=_month)
+    before.add_argument("--drop", action="store_true", help="Drop the tables after detaching")
+
+    args = parser.parse_args()
+
+    if args.command == "ensure":
+        # One transaction per partition; failures are logged and skipped
+        for name in ensure_audit_partitions(engine, args.months_ahead):
+            print(f"ok  {name}")
+        return
+
+    with engine.begin() as conn:
+        if args.command == "list":
+            for name in list_audit_partitions(conn):
+                print(name)
+        elif args.command == "detach":
+            print(f"detached  {detach_audit_partition(conn, args.month, drop=args.drop)}")
+        elif args.command == "detach-before":
+            for name in detach_partitions_before(conn, args.month, drop=args.drop):
+                print(f"detached  {name}")
+
+
+if __name__ == "__main__":
+    main()
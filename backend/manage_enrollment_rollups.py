@@ -0,0 +1,42 @@
+"""Enrollment rollup maintenance — rebuild the counts from students, or check them.
+
+Usage:
+    python manage_enrollment_rollups.py rebuild
+    python manage_enrollment_rollups.py check
+
+The rollups are kept up to date by the application; a rebuild is only needed
+after students were changed outside it (raw SQL, restores, manual fixes).
+`check` exits with status 1 when any count has drifted.
+"""
+
+import argparse
+import sys
+
+from app.database import engine
+from app.utils.enrollment_rollups import KEY_COLUMNS, rebuild_rollups, rollup_drift
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("rebuild", help="Recompute every rollup row from the students table")
+    sub.add_parser("check", help="Compare the rollups with a live count of students")
+
+    args = parser.parse_args()
+
+    with engine.begin() as conn:
+        if args.command == "rebuild":
+            print(f"rebuilt  {rebuild_rollups(conn)} rows")
+        elif args.command == "check":
+            drift = rollup_drift(conn)
+            for key, (stored, live) in sorted(drift.items()):
+                labels = ", ".join(f"{col}={value!r}" for col, value in zip(KEY_COLUMNS, key) if value)
+                print(f"drift  {labels}: stored {stored}, live {live}")
+            print("ok" if not drift else f"{len(drift)} rows differ")
+            if drift:
+                sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
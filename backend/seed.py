@@ -8,6 +8,7 @@ from app.models.user import User, UserRole
 from app.models.student import Student, StudentStatus, SchoolType, Sex
 from app.models.subject import Subject
 from app.models.notification import Notification  # noqa: F401 — ensure table is created
+import app.utils.enrollment_rollups  # noqa: F401 — count seeded students in the rollups
 
 
 def seed():
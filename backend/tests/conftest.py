@@ -0,0 +1,173 @@
+"""Test fixtures: the app on a throwaway SQLite database, auth headers, a query counter and a timer.
+
+Run from backend/ with `python -m pytest`; the timing benchmarks (marked
+`benchmark`) run with `python -m pytest -m benchmark -s`.
+"""
+
+import os
+import tempfile
+import time
+import uuid
+
+# Settings are read at import time, so point them at the test database first
+_db_dir = tempfile.mkdtemp(prefix="srs-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'test.db')}"
+os.environ["AUDIT_LOG_ASYNC"] = "false"
+os.environ["REPORT_DIR"] = os.path.join(_db_dir, "reports")
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event, text
+
+import app.models  # noqa: F401 — registers every table on Base.metadata
+from app.auth.jwt_handler import create_access_token
+from app.auth.session_store import session_store
+from app.database import Base, SessionLocal, engine
+from app.main import app as fastapi_app
+from app.models.student import Student, StudentStatus
+from app.models.subject import Subject
+from app.models.user import User, UserRole
+
+# audit_logs is partitioned with a composite primary key on PostgreSQL, which
+# SQLite cannot autoincrement, so the tests create a plain version of it.
+_AUDIT_LOGS_DDL = (
+    "CREATE TABLE audit_logs (id INTEGER PRIMARY KEY AUTOINCREMENT, user_id INTEGER, user_email VARCHAR, "
+    "user_role VARCHAR, action VARCHAR, target_name VARCHAR, details TEXT, created_at DATETIME NOT NULL)"
+)
+_TABLES = [t for t in Base.metadata.sorted_tables if t.name != "audit_logs"]
+
+
+@pytest.fixture(autouse=True)
+def database():
+    Base.metadata.create_all(bind=engine, tables=_TABLES)
+    with engine.begin() as conn:
+        conn.execute(text(_AUDIT_LOGS_DDL))
+    yield
+    with engine.begin() as conn:
+        conn.execute(text("DROP TABLE audit_logs"))
+    Base.metadata.drop_all(bind=engine, tables=_TABLES)
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def client():
+    return TestClient(fastapi_app)
+
+
+def auth_headers(user: User) -> dict:
+    """Bearer headers for `user`; admins and registrars also get the session started, as login does."""
+    token_id = uuid.uuid4().hex
+    if user.role in (UserRole.ADMIN, UserRole.REGISTRAR):
+        with SessionLocal() as db:
+            session_store.set_active_session(db, user.id, token_id)
+            db.commit()
+    token = create_access_token({"user_id": user.id, "role": user.role.value, "email": user.email, "jti": token_id})
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def admin_headers(db):
+    user = User(email="admin@test.local", role=UserRole.ADMIN)
+    db.add(user)
+    db.commit()
+    return auth_headers(user)
+
+
+@pytest.fixture
+def registrar_headers(db):
+    user = User(email="registrar@test.local", role=UserRole.REGISTRAR)
+    db.add(user)
+    db.commit()
+    return auth_headers(user)
+
+
+def add_students(db, count: int, **fields) -> list[Student]:
+    """Add `count` students (each with its own account) in the PROG Grade 11 first semester."""
+    values = {
+        "status": StudentStatus.APPROVED,
+        "payment_status": "verified",
+        "school_year": "2025-2026",
+        "semester": "1st Semester",
+        "strand": "PROG",
+        "grade_level_to_enroll": "Grade 11",
+        **fields,
+    }
+    start = db.query(Student).count()
+    students = []
+    for n in range(start, start + count):
+        user = User(email=f"student{n}@test.local", role=UserRole.STUDENT)
+        db.add(user)
+        db.flush()
+        student = Student(user_id=user.id, first_name=f"First{n}", last_name=f"Last{n}", **values)
+        db.add(student)
+        students.append(student)
+    db.commit()
+    return students
+
+
+def add_subjects(db, count: int) -> list[Subject]:
+    start = db.query(Subject).count()
+    subjects = [
+        Subject(
+            subject_code=f"SUB{n}", subject_name=f"Subject {n}", units=3, schedule="MWF 8:00",
+            strand="PROG", grade_level="Grade 11", semester="1st Semester",
+        )
+        for n in range(start, start + count)
+    ]
+    db.add_all(subjects)
+    db.commit()
+    return subjects
+
+
+class QueryCounter:
+    """Counts statements and commits sent to the database while active."""
+
+    def __init__(self):
+        self.queries = 0
+        self.commits = 0
+        self.active = False
+
+    def __enter__(self):
+        self.queries = 0
+        self.commits = 0
+        self.active = True
+        return self
+
+    def __exit__(self, *exc):
+        self.active = False
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if self.active:
+            self.queries += 1
+
+    def _on_commit(self, conn):
+        if self.active:
+            self.commits += 1
+
+
+@pytest.fixture
+def query_counter():
+    counter = QueryCounter()
+    event.listen(engine, "before_cursor_execute", counter._on_execute)
+    event.listen(engine, "commit", counter._on_commit)
+    yield counter
+    event.remove(engine, "before_cursor_execute", counter._on_execute)
+    event.remove(engine, "commit", counter._on_commit)
+
+
+def best_of(fn, number: int, repeat: int = 5) -> float:
+    """Seconds per call of `fn`: the best average over `repeat` runs of `number` calls."""
+    fn()  # warm caches and lazy imports outside the timing
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
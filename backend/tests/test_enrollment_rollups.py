@@ -0,0 +1,65 @@
+"""The after_flush listener keeps enrollment_rollups in step with students."""
+
+from app.database import engine
+from app.models.student import EnrollmentType, Sex, Student, StudentStatus
+from app.models.user import User, UserRole
+from app.utils.enrollment_rollups import live_counts, rollup_drift, stored_counts
+
+from conftest import add_students
+
+
+def _assert_in_step():
+    with engine.connect() as conn:
+        assert rollup_drift(conn) == {}
+        assert stored_counts(conn) == live_counts(conn)
+
+
+def test_inserts(db):
+    add_students(db, 3)
+    add_students(db, 2, status=StudentStatus.PENDING, sex=Sex.FEMALE, enrollment_type=EnrollmentType.TRANSFEREE)
+    with engine.connect() as conn:
+        assert sum(stored_counts(conn).values()) == 5
+    _assert_in_step()
+
+
+def test_key_column_edits(db):
+    first, second, third = add_students(db, 3)
+    first.status = StudentStatus.DENIED
+    second.strand = "ABM"
+    second.sex = Sex.MALE
+    third.school_year, third.semester = "2026-2027", None
+    third.first_name = "Renamed"  # not a key column
+    db.commit()
+    _assert_in_step()
+
+    # Several flushes in one transaction, ending back where it started
+    first.status = StudentStatus.APPROVED
+    db.flush()
+    first.status = StudentStatus.DENIED
+    db.flush()
+    db.commit()
+    _assert_in_step()
+
+
+def test_rollback(db):
+    (student,) = add_students(db, 1)
+    student.payment_status = "pending_verification"
+    db.flush()
+    user = User(email="extra@test.local", role=UserRole.STUDENT)
+    db.add(user)
+    db.flush()
+    db.add(Student(user_id=user.id, first_name="Extra", last_name="Row", school_year="2025-2026"))
+    db.flush()
+    db.rollback()
+    _assert_in_step()
+
+
+def test_delete(db):
+    keep, gone = add_students(db, 2)
+    gone.grade_level_to_enroll = "Grade 12"
+    db.flush()
+    db.delete(gone)
+    db.commit()
+    _assert_in_step()
+    with engine.connect() as conn:
+        assert sum(stored_counts(conn).values()) == 1
@@ -0,0 +1,34 @@
+"""The public enrollment status is never cached by clients past its next change."""
+
+import time
+from datetime import date, timedelta
+
+from app.models.academic_calendar import AcademicCalendar
+from app.utils.cache import midnight_timestamp
+from app.utils.enrollment_status import enrollment_status_cache
+
+STATUS_URL = "/api/utils/enrollment-status"
+
+
+def _set_calendar(db, **fields):
+    db.add(AcademicCalendar(school_year="2025-2026", semester="1st", is_open=True, **fields))
+    db.commit()
+    enrollment_status_cache.invalidate()
+
+
+def test_max_age_stops_at_next_change(client, db, monkeypatch):
+    tomorrow = date.today() + timedelta(days=1)
+    _set_calendar(db, enrollment_start=tomorrow, enrollment_end=tomorrow + timedelta(days=30))
+    monkeypatch.setattr(time, "time", lambda: midnight_timestamp(tomorrow) - 15)
+
+    response = client.get(STATUS_URL)
+    assert response.json()["is_open"] is False
+    assert response.headers["cache-control"] == "public, max-age=15"
+
+
+def test_max_age_without_upcoming_change(client, db):
+    _set_calendar(db)
+
+    response = client.get(STATUS_URL)
+    assert response.json()["is_open"] is True
+    assert response.headers["cache-control"] == "public, max-age=60"
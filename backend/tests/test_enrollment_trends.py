@@ -0,0 +1,56 @@
+"""Enrollment trends take a fixed number of queries and always reflect the current records."""
+
+from app.models.enrollment_record import EnrollmentRecord
+from app.models.student import Student
+from app.utils.enrollment_history import set_record_subjects
+
+from conftest import add_students
+
+TRENDS_URL = "/api/admin/reports/enrollment/trends"
+
+
+def _add_cycle(db, student_ids, school_year, semester):
+    for student_id in student_ids:
+        record = EnrollmentRecord(
+            student_id=student_id, school_year=school_year, semester=semester,
+            grade_level="Grade 11", strand="PROG",
+        )
+        db.add(record)
+        set_record_subjects(db, record, [
+            {"subject_code": "MATH1", "subject_name": "Math", "schedule": "MWF 8:00"},
+            {"subject_code": f"ENG{student_id % 2}", "subject_name": "English", "schedule": "TTh 9:00"},
+        ])
+    db.commit()
+
+
+def test_trends_query_count_is_constant(client, db, query_counter, admin_headers):
+    student_ids = [s.id for s in add_students(db, 3)]
+    counts = []
+    for school_years in (["2020-2021"], ["2021-2022", "2022-2023", "2023-2024"]):
+        for school_year in school_years:
+            for semester in ("1st Semester", "2nd Semester"):
+                _add_cycle(db, student_ids, school_year, semester)
+        with query_counter:
+            response = client.get(TRENDS_URL, headers=admin_headers)
+        assert response.status_code == 200, response.text
+        counts.append(query_counter.queries)
+    assert len(response.json()["cycles"]) == 8
+    assert counts[0] == counts[1]
+
+
+def test_trends_follow_deleted_students(client, db, admin_headers):
+    student_ids = [s.id for s in add_students(db, 3)]
+    _add_cycle(db, student_ids, "2020-2021", "1st Semester")
+
+    (cycle,) = client.get(TRENDS_URL, headers=admin_headers).json()["cycles"]
+    assert cycle["closed"] is True
+    assert cycle["total"] == 3
+    assert cycle["by_subject"]["MATH1"] == 3
+
+    db.delete(db.get(Student, student_ids[0]))  # cascades to the student's records
+    db.commit()
+
+    (cycle,) = client.get(TRENDS_URL, headers=admin_headers).json()["cycles"]
+    assert cycle["total"] == 2
+    assert cycle["by_strand"] == {"PROG": 2}
+    assert cycle["by_subject"]["MATH1"] == 2
@@ -0,0 +1,32 @@
+"""Printable PDFs render database text as text, not as reportlab markup."""
+
+from datetime import date
+
+from app.utils.printable_pdf import (
+    ClassListStudent,
+    EnrollmentForm,
+    FormSubject,
+    build_class_list,
+    build_enrollment_form,
+)
+
+MARKUP = "n & <b>"
+
+
+def test_enrollment_form_escapes_markup():
+    form = EnrollmentForm(
+        student_id=1, student_number="DBTC-1-25", full_name=f"Cruz, {MARKUP}", strand=MARKUP,
+        school_year="2025-2026", semester="1st Semester",
+        subjects=(FormSubject("SUB1", MARKUP, MARKUP),),
+    )
+    pdf = build_enrollment_form(form, school_name=MARKUP, issued_on=date(2026, 1, 5))
+    assert pdf.startswith(b"%PDF")
+
+
+def test_class_list_escapes_markup():
+    students = [ClassListStudent(1, "DBTC-1-25", MARKUP, MARKUP, MARKUP, "Male", None, "new_student")]
+    pdf = build_class_list(
+        students, strand=MARKUP, grade_level="Grade 11", semester=MARKUP, school_year="2025-2026",
+        school_name=MARKUP, printed_on=date(2026, 1, 5),
+    )
+    assert pdf.startswith(b"%PDF")
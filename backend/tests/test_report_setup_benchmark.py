@@ -0,0 +1,60 @@
+"""Fixed setup cost of the enrollment report: logo, watermark and styles.
+
+They are prepared once per process (lru_cache). The benchmark times preparing
+them from cold against the cached lookup, and a whole 10-student report with
+and without the caches warm. Timings are printed; the assertion only checks
+that the cached path stays far cheaper than the cold one.
+"""
+
+import pytest
+
+from app.utils.report_pdf import _load_logo_assets, _report_styles, build_enrollment_report, logo_assets
+from app.utils.report_queries import ReportStudent
+
+from conftest import best_of
+
+pytestmark = pytest.mark.benchmark
+
+STUDENTS = [
+    ReportStudent(n, f"DBTC-{n}-25", f"Last{n}", f"First{n}", None, "Grade 11", "PROG", "1st Semester", "2025-2026")
+    for n in range(1, 11)
+]
+
+
+def _clear_caches():
+    _load_logo_assets.cache_clear()
+    _report_styles.cache_clear()
+
+
+def _setup():
+    assert logo_assets(None) is not None
+    _report_styles()
+
+
+def _cold_setup():
+    _clear_caches()
+    _setup()
+
+
+def _report():
+    build_enrollment_report(
+        STUDENTS, "2025-2026", "1st Semester",
+        total_count=12, pending_count=1, approved_count=1, denied_count=0, enrolled_count=10,
+        by_strand={"PROG": 10}, by_grade_level={"Grade 11": 10}, by_sex={"Male": 6, "Female": 4},
+        school_name="Database Technology College",
+    )
+
+
+def _cold_report():
+    _clear_caches()
+    _report()
+
+
+def test_report_setup_cost():
+    cold = best_of(_cold_setup, number=5)
+    cached = best_of(_setup, number=1000)
+    cold_report = best_of(_cold_report, number=3)
+    cached_report = best_of(_report, number=3)
+    print(f"\nlogo + watermark + styles: cold {cold * 1000:.2f} ms, cached {cached * 1000:.4f} ms"
+          f"\n10-student report: cold {cold_report * 1000:.0f} ms, cached {cached_report * 1000:.0f} ms")
+    assert cached * 100 < cold
@@ -0,0 +1,61 @@
+"""Per-request overhead of authorization on two polled endpoints.
+
+Compares the token-claims principal with loading the full User row on every
+request, as get_current_user did before. Timings are printed; the assertions
+only cover query counts.
+"""
+
+import pytest
+from fastapi import Depends
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy.orm import Session
+
+from app.auth.dependencies import get_current_principal, security
+from app.database import get_db
+from app.main import app as fastapi_app
+from app.models.user import User
+
+from conftest import add_students, auth_headers, best_of
+
+pytestmark = pytest.mark.benchmark
+
+ENDPOINTS = ["/api/notifications/unread-count", "/api/students/me/status"]
+
+
+@pytest.fixture
+def student_headers(db):
+    (student,) = add_students(db, 1)
+    return auth_headers(db.get(User, student.user_id))
+
+
+def _full_user_principal(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db),
+):
+    principal = get_current_principal(credentials, db)
+    principal.user  # noqa: B018 — load the row, as the old dependency did
+    return principal
+
+
+@pytest.mark.parametrize("url", ENDPOINTS)
+def test_request_overhead(client, query_counter, student_headers, url):
+    def request():
+        assert client.get(url, headers=student_headers).status_code == 200
+
+    with query_counter:
+        request()
+    lazy_queries = query_counter.queries
+    lazy = best_of(request, number=100)
+
+    fastapi_app.dependency_overrides[get_current_principal] = _full_user_principal
+    try:
+        with query_counter:
+            request()
+        full_queries = query_counter.queries
+        full = best_of(request, number=100)
+    finally:
+        fastapi_app.dependency_overrides.clear()
+
+    print(f"\n{url}: token principal {lazy * 1000:.2f} ms ({lazy_queries} queries), "
+          f"full user row {full * 1000:.2f} ms ({full_queries} queries)")
+    assert lazy_queries == full_queries - 1
@@ -0,0 +1,87 @@
+"""Per-row serialization cost of the large list endpoints.
+
+student_to_response reads loaded columns from the instance __dict__ instead of
+through SQLAlchemy's instrumented attributes. The unmarked test checks that it
+still returns what attribute reads would; the benchmarks time it against
+attribute reads and print the per-row cost of each listing.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.models.audit_log import AuditLog
+from app.models.student import Student
+from app.schemas.student import StudentResponse
+from app.utils.serializers import _STUDENT_COLUMNS, student_to_response, with_student_email
+
+from conftest import add_students, add_subjects, best_of
+
+LISTINGS = {
+    "list_students": "/api/admin/students",
+    "list_subjects": "/api/registrar/subjects",
+    "list_audit_logs": "/api/admin/audit-logs",
+}
+
+
+def _attribute_response(student: Student) -> StudentResponse:
+    """student_to_response as it was: every column read through getattr."""
+    data = {name: getattr(student, name) for name in _STUDENT_COLUMNS}
+    data["email"] = student.user.email if student.user else None
+    if data.get("documents_path") is None:
+        data["documents_path"] = []
+    return StudentResponse(**data)
+
+
+def _load_students(db, count: int) -> list[Student]:
+    add_students(db, count)
+    db.expunge_all()
+    return db.query(Student).options(with_student_email).order_by(Student.id).all()
+
+
+def _add_audit_logs(db, count: int) -> None:
+    now = datetime.now(timezone.utc)
+    db.execute(AuditLog.__table__.insert(), [
+        {
+            "user_email": "admin@test.local", "user_role": "admin", "action": "APPROVE_STUDENT",
+            "target_name": f"Student {n}", "details": "Approved", "created_at": now - timedelta(seconds=n),
+        }
+        for n in range(count)
+    ])
+    db.commit()
+
+
+def test_student_to_response_matches_attribute_reads(db):
+    students = _load_students(db, 3)
+    for student in students:
+        assert student_to_response(student) == _attribute_response(student)
+    # Expired instances have nothing in __dict__ and must fall back to getattr
+    db.expire(students[0])
+    assert student_to_response(students[0]) == _attribute_response(students[0])
+
+
+@pytest.mark.benchmark
+def test_student_row_serialization(db):
+    students = _load_students(db, 100)
+    state_reads = best_of(lambda: [student_to_response(s) for s in students], number=20)
+    attribute_reads = best_of(lambda: [_attribute_response(s) for s in students], number=20)
+    print(f"\nstudent_to_response: {state_reads / 100 * 1e6:.1f} us/row from __dict__, "
+          f"{attribute_reads / 100 * 1e6:.1f} us/row through attributes")
+    assert state_reads < attribute_reads
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("name", LISTINGS)
+def test_listing_row_cost(client, db, admin_headers, registrar_headers, name):
+    headers = registrar_headers if name == "list_subjects" else admin_headers
+    add = {"list_students": add_students, "list_subjects": add_subjects, "list_audit_logs": _add_audit_logs}[name]
+
+    def request(per_page):
+        response = client.get(f"{LISTINGS[name]}?per_page={per_page}", headers=headers)
+        assert response.status_code == 200, response.text
+
+    add(db, 100)
+    small = best_of(lambda: request(10), number=20)
+    large = best_of(lambda: request(100), number=20)
+    print(f"\n{name}: {small * 1000:.2f} ms for 10 rows, {large * 1000:.2f} ms for 100 rows, "
+          f"{(large - small) / 90 * 1e6:.1f} us per extra row")
@@ -0,0 +1,55 @@
+"""Admin and registrar accounts hold one session at a time, however they sign in."""
+
+import pytest
+
+from app.auth.jwt_handler import create_access_token
+from app.config import settings
+from app.models.user import User, UserRole
+from app.routers import auth
+
+from conftest import auth_headers
+
+SUBJECTS_URL = "/api/registrar/subjects"
+
+
+@pytest.fixture
+def registrar(db):
+    user = User(email="registrar@test.local", role=UserRole.REGISTRAR, google_id="google-registrar")
+    db.add(user)
+    db.commit()
+    return user
+
+
+@pytest.fixture
+def google_sign_in(client, monkeypatch):
+    monkeypatch.setattr(settings, "GOOGLE_CLIENT_ID", "test-client")
+    monkeypatch.setattr(
+        auth, "verify_google_id_token",
+        lambda credential, client_id: {"sub": "google-registrar", "email": "registrar@test.local"},
+    )
+
+    def sign_in(force: bool = False):
+        return client.post("/api/auth/google", json={"credential": "id-token", "force": force})
+    return sign_in
+
+
+def test_token_without_session_is_refused(client, registrar):
+    token = create_access_token({"user_id": registrar.id, "role": "registrar", "email": registrar.email})
+    response = client.get(SUBJECTS_URL, headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 401
+
+
+def test_google_sign_in_respects_active_session(client, registrar, google_sign_in):
+    password_session = auth_headers(registrar)
+
+    assert google_sign_in().status_code == 409
+    assert client.get(SUBJECTS_URL, headers=password_session).status_code == 200
+
+    response = google_sign_in(force=True)
+    assert response.status_code == 200
+    google_session = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    assert client.get(SUBJECTS_URL, headers=google_session).status_code == 200
+    assert client.get(SUBJECTS_URL, headers=password_session).status_code == 401
+
+    # A second Google sign-in is held to the same rule
+    assert google_sign_in().status_code == 409
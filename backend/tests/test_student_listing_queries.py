@@ -0,0 +1,59 @@
+"""Student listings issue the same number of queries whatever the page size."""
+
+import pytest
+
+from app.models.student import StudentStatus
+from app.models.student_subject import StudentSubject
+
+from conftest import add_students, add_subjects
+
+ADMIN_LISTINGS = [
+    "/api/admin/students?per_page=100",
+    "/api/admin/students?per_page=100&view=summary",
+    "/api/admin/students/pending?per_page=100",
+    "/api/admin/students/pending?per_page=100&view=summary",
+]
+REGISTRAR_LISTINGS = [
+    "/api/registrar/students/approved?per_page=100",
+    "/api/registrar/students/approved?per_page=100&view=summary",
+    "/api/registrar/students/pending-payments?per_page=100",
+    "/api/registrar/students/pending-payments?per_page=100&view=summary",
+    "/api/registrar/class-list?strand=PROG&grade_level=Grade%2011",
+    "/api/registrar/subjects/{subject_id}/students",
+]
+
+
+def _add_listed_students(db, subject, count):
+    """Students that every listing above includes, split across the statuses they filter on."""
+    students = add_students(db, count)
+    students += add_students(db, count, status=StudentStatus.PENDING)
+    students += add_students(db, count, payment_status="pending_verification")
+    db.add_all(StudentSubject(student_id=s.id, subject_id=subject.id) for s in students)
+    db.commit()
+
+
+def _query_counts(client, db, query_counter, headers, url):
+    subject = add_subjects(db, 1)[0]
+    subject.max_students = 1000
+    db.commit()
+    url = url.format(subject_id=subject.id)
+    counts = []
+    for batch in (2, 20):
+        _add_listed_students(db, subject, batch)
+        with query_counter:
+            response = client.get(url, headers=headers)
+        assert response.status_code == 200, response.text
+        counts.append(query_counter.queries)
+    return counts
+
+
+@pytest.mark.parametrize("url", ADMIN_LISTINGS)
+def test_admin_listing_query_count_is_constant(client, db, query_counter, admin_headers, url):
+    small, large = _query_counts(client, db, query_counter, admin_headers, url)
+    assert large == small
+
+
+@pytest.mark.parametrize("url", REGISTRAR_LISTINGS)
+def test_registrar_listing_query_count_is_constant(client, db, query_counter, registrar_headers, url):
+    small, large = _query_counts(client, db, query_counter, registrar_headers, url)
+    assert large == small
@@ -0,0 +1,55 @@
+"""Subject assignment runs a fixed number of queries and commits once, however many subjects are involved."""
+
+from conftest import add_students, add_subjects
+
+
+# Helpers take ids, not instances: reading attributes of a committed instance
+# would reload it and add queries to the count.
+def _bulk_assign(client, headers, student_id, subject_ids):
+    return client.post(
+        "/api/registrar/bulk-assign-subjects",
+        headers=headers,
+        json={"student_id": student_id, "subject_ids": subject_ids},
+    )
+
+
+def _assign(client, headers, student_id, subject_id):
+    return client.post(
+        "/api/registrar/assign-subject",
+        headers=headers,
+        json={"student_id": student_id, "subject_id": subject_id},
+    )
+
+
+def test_assign_subject_query_count_is_constant(client, db, query_counter, registrar_headers):
+    few, many = (s.id for s in add_students(db, 2))
+    subjects = [s.id for s in add_subjects(db, 10)]
+    # Existing enrollments (and their enrollment record) that the snapshot has to carry over
+    assert _bulk_assign(client, registrar_headers, few, subjects[:2]).status_code == 201
+    assert _bulk_assign(client, registrar_headers, many, subjects[:9]).status_code == 201
+
+    counts = []
+    for student in (few, many):
+        with query_counter:
+            response = _assign(client, registrar_headers, student, subjects[9])
+        assert response.status_code == 201, response.text
+        assert query_counter.commits == 1
+        counts.append(query_counter.queries)
+    assert counts[0] == counts[1]
+
+
+def test_bulk_assign_query_count_is_constant(client, db, query_counter, registrar_headers):
+    few, many = (s.id for s in add_students(db, 2))
+    subjects = [s.id for s in add_subjects(db, 10)]
+    assert _assign(client, registrar_headers, few, subjects[0]).status_code == 201
+    assert _assign(client, registrar_headers, many, subjects[0]).status_code == 201
+
+    counts = []
+    for student, batch in ((few, subjects[1:3]), (many, subjects[1:10])):
+        with query_counter:
+            response = _bulk_assign(client, registrar_headers, student, batch)
+        assert response.status_code == 201, response.text
+        assert response.json()["message"] == f"{len(batch)} subject(s) assigned successfully"
+        assert query_counter.commits == 1
+        counts.append(query_counter.queries)
+    assert counts[0] == counts[1]
@@ -34,13 +34,18 @@ export default function Login() {
   const handleGoogleSuccess = async (response) => {
     setGoogleLoading(true);
     setLoginError('');
+    setActiveSessionData(null);
     try {
       const res = await googleAuth(response.credential);
       const { access_token, role } = res.data;
       loginUser(access_token, { role });
       toast.success('Signed in with Google');
     } catch (err) {
-      setLoginError(getErrorMessage(err));
+      if (err.response?.status === 409 && err.response?.data?.detail === 'active_session') {
+        setActiveSessionData({ credential: response.credential });
+      } else {
+        setLoginError(getErrorMessage(err));
+      }
       setGoogleLoading(false);
     }
   };
@@ -69,7 +74,9 @@ export default function Login() {
     setSubmitting(true);
     setActiveSessionData(null);
     try {
-      const res = await login({ ...activeSessionData, force: true });
+      const res = activeSessionData.credential
+        ? await googleAuth(activeSessionData.credential, true)
+        : await login({ ...activeSessionData, force: true });
       const { access_token, role } = res.data;
       loginUser(access_token, { email: activeSessionData.email, role });
       toast.success('Login successful');
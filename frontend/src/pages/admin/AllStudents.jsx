@@ -6,7 +6,7 @@ import toast from 'react-hot-toast';
 import DashboardLayout from '../../components/DashboardLayout';
 import { SkeletonRow } from '../../components/SkeletonLoader';
 import ConfirmModal from '../../components/ConfirmModal';
-import { getAdminStudents, deleteStudent, generateEnrollmentReport } from '../../services/api';
+import { getAdminStudents, deleteStudent, generateEnrollmentReport, exportEnrollmentReport } from '../../services/api';
 import { statusColor, formatDate, getErrorMessage } from '../../utils/helpers';
 
 export default function AllStudents() {
@@ -121,6 +121,31 @@ export default function AllStudents() {
     }
   };
 
+  const handleExport = async (format) => {
+    setReportGenerating(true);
+    try {
+      const params = { format };
+      if (reportSchoolYear.trim()) params.school_year = reportSchoolYear.trim();
+      if (reportSemester) params.semester = reportSemester;
+      const res = await exportEnrollmentReport(params);
+      const disposition = res.headers['content-disposition'] || '';
+      const match = disposition.match(/filename="?([^"]+)"?/);
+      const url = window.URL.createObjectURL(new Blob([res.data]));
+      const link = document.createElement('a');
+      link.href = url;
+      link.download = match ? match[1] : `enrollment_report.${format}`;
+      document.body.appendChild(link);
+      link.click();
+      link.remove();
+      window.URL.revokeObjectURL(url);
+      toast.success('Data exported!');
+    } catch {
+      toast.error('Failed to export data. Please try again.');
+    } finally {
+      setReportGenerating(false);
+    }
+  };
+
   const handleDownloadFromPreview = () => {
     if (!previewUrl) return;
     const link = document.createElement('a');
@@ -351,6 +376,22 @@ export default function AllStudents() {
                     <option value="2nd Semester">2nd Semester</option>
                   </select>
                 </div>
+                <div>
+                  <label className="block text-sm font-semibold text-gray-700 mb-1">Export data</label>
+                  <div className="flex gap-2">
+                    {[['xlsx', 'Excel'], ['csv', 'CSV'], ['parquet', 'Parquet']].map(([format, label]) => (
+                      <button
+                        key={format}
+                        onClick={() => handleExport(format)}
+                        disabled={reportGenerating}
+                        className="flex-1 flex items-center justify-center gap-1.5 px-3 py-2 text-sm font-medium border border-gray-200 text-gray-700 rounded-lg hover:bg-gray-100 transition disabled:opacity-50"
+                      >
+                        <Download size={14} />
+                        {label}
+                      </button>
+                    ))}
+                  </div>
+                </div>
               </div>
               <div className="flex items-center justify-end gap-3 px-6 py-4 border-t bg-gray-50">
                 <button
@@ -1,12 +1,12 @@
 import { useEffect, useRef, useState } from 'react';
-import { Plus, Trash2, Loader2, Search, User, CheckCircle, ListChecks, Printer, X, BookMarked, AlertCircle, History, ChevronDown, ChevronUp } from 'lucide-react';
+import { Plus, Trash2, Loader2, Search, User, CheckCircle, ListChecks, Printer, X, BookMarked, AlertCircle, History, ChevronDown, ChevronUp, Download } from 'lucide-react';
 import { useReactToPrint } from 'react-to-print';
 import toast from 'react-hot-toast';
 import DashboardLayout from '../../components/DashboardLayout';
 import { SkeletonListItem } from '../../components/SkeletonLoader';
 import ConfirmModal from '../../components/ConfirmModal';
 import PrintableClassList from '../../components/PrintableClassList';
-import { getApprovedStudents, getSubjects, assignSubject, unassignSubject, getStudentCompleteInfo, getStudentEnrolledSubjects, bulkAssignSubjects, getClassList, updateTransfereeCreditStatus, getRegistrarStudentEnrollmentHistory } from '../../services/api';
+import { getApprovedStudents, getSubjects, assignSubject, unassignSubject, getStudentCompleteInfo, getStudentEnrolledSubjects, bulkAssignSubjects, getClassList, downloadClassListPdf, downloadEnrollmentFormsPdf, updateTransfereeCreditStatus, getRegistrarStudentEnrollmentHistory } from '../../services/api';
 import { getErrorMessage } from '../../utils/helpers';
 
 const enrollmentTypeBadge = (type) => {
@@ -77,6 +77,36 @@ export default function AssignSubjects() {
     }
   };
 
+  // Server-rendered PDFs for the whole section
+  const [downloadingPdf, setDownloadingPdf] = useState(null);
+
+  const handleDownloadSectionPdf = async (kind) => {
+    setDownloadingPdf(kind);
+    try {
+      const params = { strand: clStrand, grade_level: clGrade };
+      if (clSemester) params.semester = clSemester;
+      const res = kind === 'forms'
+        ? await downloadEnrollmentFormsPdf(params)
+        : await downloadClassListPdf(params);
+      const disposition = res.headers['content-disposition'] || '';
+      const match = disposition.match(/filename="?([^"]+)"?/);
+      const url = window.URL.createObjectURL(new Blob([res.data], { type: 'application/pdf' }));
+      const link = document.createElement('a');
+      link.href = url;
+      link.download = match ? match[1] : `${kind}.pdf`;
+      document.body.appendChild(link);
+      link.click();
+      link.remove();
+      window.URL.revokeObjectURL(url);
+    } catch (err) {
+      toast.error(err.response?.status === 404
+        ? 'No fully enrolled students in this section'
+        : 'Failed to download PDF');
+    } finally {
+      setDownloadingPdf(null);
+    }
+  };
+
   const fetchStudents = () => {
     setLoading(true);
     const params = { per_page: 100, payment_status: 'verified' };
@@ -755,6 +785,22 @@ export default function AssignSubjects() {
                   <Printer size={14} />
                   Print / Save as PDF
                 </button>
+                <button
+                  onClick={() => handleDownloadSectionPdf('class-list')}
+                  disabled={downloadingPdf !== null}
+                  className="flex items-center gap-2 bg-gray-700 hover:bg-gray-600 disabled:opacity-50 text-white text-sm font-medium px-4 py-1.5 rounded-lg transition"
+                >
+                  {downloadingPdf === 'class-list' ? <Loader2 size={14} className="animate-spin" /> : <Download size={14} />}
+                  Class List PDF
+                </button>
+                <button
+                  onClick={() => handleDownloadSectionPdf('forms')}
+                  disabled={downloadingPdf !== null}
+                  className="flex items-center gap-2 bg-gray-700 hover:bg-gray-600 disabled:opacity-50 text-white text-sm font-medium px-4 py-1.5 rounded-lg transition"
+                >
+                  {downloadingPdf === 'forms' ? <Loader2 size={14} className="animate-spin" /> : <Download size={14} />}
+                  Enrollment Forms PDF
+                </button>
                 <button
                   onClick={() => setShowClassList(false)}
                   className="p-1.5 hover:bg-gray-700 rounded-lg transition"
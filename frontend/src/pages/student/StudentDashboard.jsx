@@ -154,6 +154,9 @@ function WelcomeModal({ onComplete }) {
 }
 
 // ── Announcement Carousel ────────────────────────────────────────────────────
+// Slides the carousel cycles through; only this many are fetched
+const CAROUSEL_ANNOUNCEMENTS = 10;
+
 function AnnouncementCarousel({ announcements }) {
   const [current, setCurrent] = useState(0);
   const [direction, setDirection] = useState('right');
@@ -533,7 +536,7 @@ export default function StudentDashboard() {
           getMySubjects(),
           getMyEnrollmentHistory(),
           getEnrollmentStatus().catch(() => ({ data: null })),
-          getAnnouncements().catch(() => ({ data: [] })),
+          getAnnouncements(CAROUSEL_ANNOUNCEMENTS).catch(() => ({ data: [] })),
         ]);
         setProfile(profileRes.data);
         setSubjects(subjectsRes.data);
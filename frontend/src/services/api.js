@@ -40,7 +40,7 @@ api.interceptors.response.use(
 // --- Auth ---
 export const login = (data) => api.post('/auth/login', data);
 export const registerStudent = (data) => api.post('/auth/register', data);
-export const googleAuth = (credential) => api.post('/auth/google', { credential });
+export const googleAuth = (credential, force = false) => api.post('/auth/google', { credential, force });
 export const getMe = () => api.get('/auth/me');
 export const logoutApi = () => api.post('/auth/logout');
 
@@ -87,8 +87,8 @@ export const submitPaymentWithoutReceipt = () =>
   api.post('/students/me/payment-submit');
 
 // --- Admin ---
-export const getAdminStudents = (params) => api.get('/admin/students', { params });
-export const getPendingStudents = (params) => api.get('/admin/students/pending', { params });
+export const getAdminStudents = (params) => api.get('/admin/students', { params: { view: 'summary', ...params } });
+export const getPendingStudents = (params) => api.get('/admin/students/pending', { params: { view: 'summary', ...params } });
 export const getStudentById = (id) => api.get(`/admin/students/${id}`);
 export const getAdminStudentEnrollmentHistory = (id) => api.get(`/admin/students/${id}/enrollment-history`);
 export const approveStudent = (id, data = {}) => api.put(`/admin/students/${id}/approve`, data);
@@ -97,17 +97,21 @@ export const deleteStudent = (id) => api.delete(`/admin/students/${id}`);
 export const downloadStudentFiles = (id) => api.get(`/admin/students/${id}/download-files`, { responseType: 'blob' });
 export const proxyStudentFile = (id, url) => api.get(`/admin/students/${id}/files/proxy`, { params: { url }, responseType: 'blob' });
 export const getDashboardStats = () => api.get('/admin/dashboard/stats');
+export const getEnrollmentTrends = () => api.get('/admin/reports/enrollment/trends');
+export const getSubjectTrend = (code) => api.get(`/admin/reports/enrollment/trends/subjects/${encodeURIComponent(code)}`);
 export const getAccounts = (params) => api.get('/admin/accounts', { params });
 export const createAccount = (data) => api.post('/admin/accounts', data);
 export const deleteAccount = (id) => api.delete(`/admin/accounts/${id}`);
 export const resetAccountPassword = (id, data) => api.put(`/admin/accounts/${id}/reset-password`, data);
-export const getAnnouncements = () => api.get('/admin/announcements');
+export const getAnnouncements = (limit) => api.get('/admin/announcements', { params: { limit } });
 export const createAnnouncement = (data) => api.post('/admin/announcements', data);
 export const deleteAnnouncement = (id) => api.delete(`/admin/announcements/${id}`);
 
 // --- Registrar ---
-export const getApprovedStudents = (params) => api.get('/registrar/students/approved', { params });
+export const getApprovedStudents = (params) => api.get('/registrar/students/approved', { params: { view: 'summary', ...params } });
 export const getClassList = (params) => api.get('/registrar/class-list', { params });
+export const downloadClassListPdf = (params) => api.get('/registrar/class-list/pdf', { params, responseType: 'blob' });
+export const downloadEnrollmentFormsPdf = (params) => api.get('/registrar/enrollment-forms/pdf', { params, responseType: 'blob' });
 export const getStudentCompleteInfo = (id) => api.get(`/registrar/students/${id}/complete-info`);
 export const getRegistrarStudentEnrollmentHistory = (id) => api.get(`/registrar/students/${id}/enrollment-history`);
 export const getSubjects = (params) => api.get('/registrar/subjects', { params });
@@ -119,7 +123,7 @@ export const unassignSubject = (data) => api.delete('/registrar/unassign-subject
 export const getSubjectStudents = (id) => api.get(`/registrar/subjects/${id}/students`);
 export const getStudentEnrolledSubjects = (id) => api.get(`/registrar/students/${id}/enrolled-subjects`);
 export const bulkAssignSubjects = (data) => api.post('/registrar/bulk-assign-subjects', data);
-export const getPendingPayments = (params) => api.get('/registrar/students/pending-payments', { params });
+export const getPendingPayments = (params) => api.get('/registrar/students/pending-payments', { params: { view: 'summary', ...params } });
 export const verifyPayment = (id) => api.put(`/registrar/students/${id}/verify-payment`);
 export const rejectPayment = (id, reason) => api.put(`/registrar/students/${id}/reject-payment`, { reason: reason || null });
 export const updateTransfereeCreditStatus = (id, data) => api.put(`/registrar/students/${id}/transferee-credits`, data);
@@ -136,8 +140,20 @@ export const markAllAsRead = () => api.put('/notifications/read-all');
 export const getAuditLogs = (params) => api.get('/admin/audit-logs', { params });
 
 // --- Reports ---
-export const generateEnrollmentReport = (params) =>
-  api.get('/admin/reports/enrollment', { params, responseType: 'blob' });
+// Rendered as a background job: submit, poll until finished (up to REPORT_POLL_TIMEOUT_MS), then fetch the PDF
+const REPORT_POLL_TIMEOUT_MS = 5 * 60 * 1000;
+export const generateEnrollmentReport = async (params) => {
+  let { data: job } = await api.post('/admin/reports/enrollment/jobs', null, { params });
+  const deadline = Date.now() + REPORT_POLL_TIMEOUT_MS;
+  while (job.status === 'queued' || job.status === 'running') {
+    if (Date.now() >= deadline) throw new Error('Report generation is taking too long. Please try again later.');
+    await new Promise((resolve) => setTimeout(resolve, 1000));
+    ({ data: job } = await api.get(`/admin/reports/jobs/${job.id}`));
+  }
+  if (job.status !== 'succeeded') throw new Error(job.error || 'Report generation failed');
+  return api.get(`/admin/reports/jobs/${job.id}/download`, { responseType: 'blob' });
+};
+export const exportEnrollmentReport = (params) => api.get('/admin/reports/enrollment/export', { params, responseType: 'blob' });
 
 // --- Academic Calendar ---
 export const getAcademicCalendar = () => api.get('/admin/academic-calendar');